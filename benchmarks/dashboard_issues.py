@@ -0,0 +1,131 @@
+"""
+Compare building dashboard issues from `jira.resources.Issue` objects and from the raw-JSON `IssueRecord` fast path.
+
+The benchmark uses synthetic search results, so it does not need access to Jira. Run it from the project's root
+directory with the same environment variables as the tests, e.g.:
+
+    python benchmarks/dashboard_issues.py --issues 5000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from jira.resources import (  # noqa: E402
+    Issue,
+    User,
+)
+
+from sprints.dashboard.libs.jira import (  # noqa: E402
+    IssueRecord,
+    _get_record_fields_class,
+)
+from sprints.dashboard.models import DashboardIssue  # noqa: E402
+
+OPTIONS = {'server': 'https://jira.example.com', 'rest_path': 'api', 'rest_api_version': '2', 'agile_rest_path': ''}
+ISSUE_FIELDS = {field: f'customfield_{i}' for i, field in enumerate(settings.JIRA_REQUIRED_FIELDS)}
+CELL_KEY = 'BB'
+MEMBERS = [f'user{i}' for i in range(10)]
+
+
+def get_raw_user(i: int) -> dict:
+    return {
+        'self': f'{OPTIONS["server"]}/rest/api/2/user?username=user{i}',
+        'name': f'user{i}',
+        'key': f'user{i}',
+        'displayName': f'User {i}',
+        'emailAddress': f'user{i}@example.com',
+        'active': True,
+        'timeZone': 'UTC',
+        'avatarUrls': {size: f'{OPTIONS["server"]}/avatar/{i}?s={size}' for size in ('16x16', '24x24', '48x48')},
+    }
+
+
+def get_raw_issue(i: int) -> dict:
+    """Generate a search result similar to the one returned by Jira for the dashboard."""
+    fields = {
+        'Assignee': get_raw_user(i % len(MEMBERS)),
+        'Summary': f'Issue {i}',
+        'Description': f'Description of the issue {i}.\n[~crafty]: plan 2h 30m per sprint for this task.',
+        'Issue Type': {'self': f'{OPTIONS["server"]}/issuetype/1', 'id': '1', 'name': 'Story', 'subtask': False},
+        'Status': {
+            'self': f'{OPTIONS["server"]}/status/1',
+            'id': '1',
+            'name': 'In progress',
+            'statusCategory': {'self': f'{OPTIONS["server"]}/statuscategory/4', 'id': 4, 'key': 'indeterminate'},
+        },
+        'Time Spent': 3600,
+        'Remaining Estimate': 7200,
+        'Sprint': [f'com.atlassian.greenhopper.service.sprint.Sprint@1[id={i % 3},name=BB.{i % 3}]'],
+        'Story Points': 3.0,
+        'Reviewer 1': get_raw_user((i + 1) % len(MEMBERS)),
+        'Account': {'id': 1, 'key': 'ACCOUNT', 'name': 'Account'},
+        'Epic Link': 'BB-1',
+        'Flagged': [{'self': f'{OPTIONS["server"]}/customFieldOption/1', 'value': 'Impediment', 'id': '1'}],
+    }
+    return {
+        'expand': 'operations,versionedRepresentations,editmeta,changelog,renderedFields',
+        'id': str(i),
+        'self': f'{OPTIONS["server"]}/rest/api/2/issue/{i}',
+        'key': f'{CELL_KEY}-{i}',
+        'fields': {ISSUE_FIELDS[name]: value for name, value in fields.items()},
+    }
+
+
+def build_dashboard_issues(issues: list) -> list[DashboardIssue]:
+    unassigned_user = User(OPTIONS, None, raw={'name': 'Unassigned', 'displayName': 'Unassigned'})
+    other_cell = User(OPTIONS, None, raw={'name': 'Other Cell', 'displayName': 'Other Cell'})
+    return [
+        DashboardIssue(issue, {1}, MEMBERS, unassigned_user, other_cell, ISSUE_FIELDS, CELL_KEY) for issue in issues
+    ]
+
+
+def resources_path(raw_issues: list[dict]) -> list[DashboardIssue]:
+    return build_dashboard_issues([Issue(OPTIONS, None, raw_issue) for raw_issue in raw_issues])
+
+
+def records_path(raw_issues: list[dict]) -> list[DashboardIssue]:
+    fields_class = _get_record_fields_class(tuple(ISSUE_FIELDS.values()))
+    return build_dashboard_issues([IssueRecord(raw_issue, fields_class) for raw_issue in raw_issues])
+
+
+def measure(name: str, func: Callable, raw_issues: list[dict], repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(raw_issues)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func(raw_issues)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"{name:<12} best: {min(timings) * 1000:9.1f} ms   peak memory: {peak / 1024 / 1024:8.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=5000, help="Number of issues on the dashboard.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs for each path.")
+    args = parser.parse_args()
+
+    raw_issues = [get_raw_issue(i) for i in range(args.issues)]
+    print(f"Building {args.issues} dashboard issues:")
+    measure('resources', resources_path, raw_issues, args.repeat)
+    measure('records', records_path, raw_issues, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
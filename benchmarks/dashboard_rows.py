@@ -0,0 +1,140 @@
+"""
+Compare aggregating the dashboard rows by updating `DashboardRow` objects for each issue and by summing the totals in
+columns (`Dashboard._aggregate_rows`).
+
+The benchmark uses synthetic dashboard issues, so it does not need access to Jira. The time properties of the issues are
+computed before the measurements, so only the aggregation is timed. Run it from the project's root directory with the
+same environment variables as the tests, e.g.:
+
+    python benchmarks/dashboard_rows.py --issues 50000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import (
+    Callable,
+    Dict,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from sprints.dashboard.models import (  # noqa: E402
+    Dashboard,
+    DashboardRow,
+)
+
+USERS = 50
+STATUSES = [
+    settings.SPRINT_STATUS_IN_PROGRESS,
+    settings.SPRINT_STATUS_REVIEW,
+    settings.SPRINT_STATUS_EXTERNAL_REVIEW,
+    settings.SPRINT_STATUS_RECURRING,
+]
+
+
+class SyntheticIssue:
+    """The attributes of `DashboardIssue` used for aggregating the rows, with precomputed time properties."""
+
+    def __init__(self, i: int) -> None:
+        self.key = f'BB-{i}'
+        self.assignee = f'user{i % USERS}'
+        self.reviewer_1 = f'user{(i * 7 + 1) % USERS}'
+        self.is_epic = i % 50 == 0
+        self.status = STATUSES[i % len(STATUSES)]
+        self.time_estimate = 0 if i % 10 == 0 else 7200
+        self.current_sprint = i % 2 == 0
+        self.is_flagged = i % 5 == 0
+        self.assignee_time = 7200
+        self.review_time = 1800
+        self.recurring_time = 3600
+        self.epic_management_time = 3600
+
+
+def objects_path(issues: list) -> Dict[str, DashboardRow]:
+    """The previous implementation, which updates the attributes of the rows for each issue."""
+    dashboard: Dict[str, DashboardRow] = {}
+    for issue in issues:
+        assignee = dashboard.setdefault(issue.assignee, DashboardRow(issue.assignee))
+        reviewer_1 = dashboard.setdefault(issue.reviewer_1, DashboardRow(issue.reviewer_1))
+
+        if issue.is_epic:
+            assignee.future_epic_management_time += issue.epic_management_time
+            continue
+
+        if issue.status == settings.SPRINT_STATUS_RECURRING:
+            assignee.future_assignee_time += issue.recurring_time
+            reviewer_1.future_review_time += issue.review_time
+            continue
+
+        if issue.time_estimate == 0:
+            assignee.add_unestimated_issue(issue)
+
+        if issue.current_sprint:
+            if issue.status == settings.SPRINT_STATUS_EXTERNAL_REVIEW:
+                assignee.current_remaining_upstream_time += issue.assignee_time
+            else:
+                reviewer_1.current_remaining_review_time += issue.review_time
+                assignee.current_remaining_assignee_time += issue.assignee_time
+        else:
+            assignee.future_assignee_time += issue.assignee_time
+            reviewer_1.future_review_time += issue.review_time
+
+            if issue.is_flagged:
+                assignee.flagged_time += issue.assignee_time
+                reviewer_1.flagged_time += issue.review_time
+    return dashboard
+
+
+def columns_path(issues: list) -> Dict[str, DashboardRow]:
+    # The aggregation does not use the state of the dashboard, so it does not need to be retrieved from Jira.
+    # noinspection PyTypeChecker
+    return Dashboard._aggregate_rows(None, issues)
+
+
+def measure(name: str, func: Callable, issues: list, repeat: int) -> Dict[str, DashboardRow]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(issues)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func(issues)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<12} best: {min(timings) * 1000:9.1f} ms   peak memory: {peak / 1024 / 1024:8.1f} MiB")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=50000, help="Number of issues on the dashboard.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs for each path.")
+    args = parser.parse_args()
+
+    issues = [SyntheticIssue(i) for i in range(args.issues)]
+    print(f"Aggregating {args.issues} dashboard issues into {USERS} rows:")
+    expected = measure('objects', objects_path, issues, args.repeat)
+    result = measure('columns', columns_path, issues, args.repeat)
+
+    # Both paths need to produce the same rows.
+    for user, row in expected.items():
+        assert [getattr(row, column) for column in row.TIME_COLUMNS] == [
+            getattr(result[user], column) for column in row.TIME_COLUMNS
+        ], user
+        assert row.current_unestimated == result[user].current_unestimated
+        assert row.future_unestimated == result[user].future_unestimated
+
+
+if __name__ == '__main__':
+    main()
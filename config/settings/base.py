@@ -165,6 +165,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "sprints.dashboard.libs.metrics.JiraCallerMiddleware",
+    "sprints.dashboard.libs.scope.MemoizationScopeMiddleware",
 ]
 
 # STATIC
@@ -328,6 +330,14 @@ CELERY_BEAT_SCHEDULE = {
             "force_regenerate": True,
         },
     },
+    "Refresh the user directory every hour.": {
+        "task": "sprints.dashboard.tasks.refresh_user_directory_task",
+        "schedule": crontab(minute=0),
+    },
+    "Refresh the cells' topology every 15 minutes.": {
+        "task": "sprints.dashboard.tasks.refresh_topology_task",
+        "schedule": crontab(minute='*/15'),
+    },
     "Send budget email alerts once per week.": {
         "task": "sprints.sustainability.tasks.send_email_alerts",
         "schedule": crontab(
@@ -394,6 +404,57 @@ JIRA_SERVER = env.str("JIRA_SERVER")
 JIRA_USERNAME = env.str("JIRA_USERNAME")
 # Password of the user used for accessing Jira API.
 JIRA_PASSWORD = env.str("JIRA_PASSWORD")
+# Number of idle Jira connections kept alive by each process.
+JIRA_CONNECTION_POOL_SIZE = env.int("JIRA_CONNECTION_POOL_SIZE", 4)
+# Idle Jira connections unused for this many seconds are verified before being reused.
+JIRA_CONNECTION_HEALTH_CHECK_SECONDS = env.int("JIRA_CONNECTION_HEALTH_CHECK_SECONDS", 60)
+# Maximum number of concurrent requests sent by `AsyncCustomJira`.
+JIRA_ASYNC_MAX_CONCURRENCY = env.int("JIRA_ASYNC_MAX_CONCURRENCY", 16)
+# Number of issues retrieved with each request by `CustomJira.search_issues_iter`.
+JIRA_SEARCH_PAGE_SIZE = env.int("JIRA_SEARCH_PAGE_SIZE", 100)
+# Number of comments retrieved with each request by `CustomJira.comments_since`.
+JIRA_COMMENTS_PAGE_SIZE = env.int("JIRA_COMMENTS_PAGE_SIZE", 20)
+# Number of issues retrieved with each request when only their keys are needed (Jira can limit it further).
+JIRA_SEARCH_KEYS_PAGE_SIZE = env.int("JIRA_SEARCH_KEYS_PAGE_SIZE", 1000)
+# Maximum length of the JQL clauses split with `libs.jql.in_chunks`, to avoid exceeding the limits of the URL length.
+JIRA_MAX_JQL_LENGTH = env.int("JIRA_MAX_JQL_LENGTH", 2000)
+# Replace long, frequently used JQL queries with saved Jira filters (see `libs.jql.saved_filter`).
+JIRA_SAVED_FILTERS = env.bool("JIRA_SAVED_FILTERS", True)
+# Prefix of the names of the saved Jira filters created by this app.
+JIRA_SAVED_FILTER_PREFIX = env.str("JIRA_SAVED_FILTER_PREFIX", "Sprints: ")
+# Keep the dashboard issues in a cached snapshot, and retrieve only the ones updated since the previous refresh (see
+# `libs.issue_snapshot`).
+JIRA_INCREMENTAL_DASHBOARD = env.bool("JIRA_INCREMENTAL_DASHBOARD", True)
+# Cluster-wide budgets of the Jira requests, as `(requests per second, burst size)` for each endpoint class.
+JIRA_RATE_LIMITS = {
+    "search": (env.float("JIRA_RATE_LIMIT_SEARCH", 5), env.int("JIRA_RATE_LIMIT_SEARCH_BURST", 10)),
+    "tempo": (env.float("JIRA_RATE_LIMIT_TEMPO", 10), env.int("JIRA_RATE_LIMIT_TEMPO_BURST", 20)),
+    "poker": (env.float("JIRA_RATE_LIMIT_POKER", 5), env.int("JIRA_RATE_LIMIT_POKER_BURST", 10)),
+    "default": (env.float("JIRA_RATE_LIMIT_DEFAULT", 20), env.int("JIRA_RATE_LIMIT_DEFAULT_BURST", 40)),
+}
+# Number of retries of the requests throttled by Jira (HTTP 429).
+JIRA_RATE_LIMIT_RETRIES = env.int("JIRA_RATE_LIMIT_RETRIES", 5)
+# Base delay (in seconds) of the exponential backoff used when the throttled response does not contain `Retry-After`.
+JIRA_RATE_LIMIT_BACKOFF = env.float("JIRA_RATE_LIMIT_BACKOFF", 1.0)
+# Maximum delay (in seconds) before retrying the throttled request.
+JIRA_RATE_LIMIT_MAX_BACKOFF = env.float("JIRA_RATE_LIMIT_MAX_BACKOFF", 60.0)
+# Record the HTTP exchanges with Jira and Google into fixtures (`record`) or serve the responses from them (`replay`).
+HTTP_REPLAY_MODE = env("HTTP_REPLAY_MODE", default="")
+# Directory with the recorded fixtures.
+HTTP_REPLAY_FIXTURES_DIR = env("HTTP_REPLAY_FIXTURES_DIR", default=str(ROOT_DIR.path("replay")))
+# Simulated latency (in seconds) of the replayed responses, with an optional random jitter added to it.
+HTTP_REPLAY_LATENCY = env.float("HTTP_REPLAY_LATENCY", 0)
+HTTP_REPLAY_LATENCY_JITTER = env.float("HTTP_REPLAY_LATENCY_JITTER", 0)
+# Bearer token required for accessing the Prometheus metrics. The metrics endpoint is disabled when it is not set.
+PROMETHEUS_METRICS_TOKEN = env("PROMETHEUS_METRICS_TOKEN", default="")
+# Number of users retrieved with each request while loading the user directory. Jira does not return more than 1000.
+JIRA_USER_DIRECTORY_PAGE_SIZE = env.int("JIRA_USER_DIRECTORY_PAGE_SIZE", 1000)
+# Maximum number of concurrent requests used by `CustomJira.worklog_list`.
+JIRA_WORKLOG_LIST_CONCURRENCY = env.int("JIRA_WORKLOG_LIST_CONCURRENCY", 4)
+# Number of retries of a failed `CustomJira.worklog_list` chunk.
+JIRA_WORKLOG_LIST_RETRIES = env.int("JIRA_WORKLOG_LIST_RETRIES", 3)
+# Base delay (in seconds) of the exponential backoff between the retries of a failed `CustomJira.worklog_list` chunk.
+JIRA_WORKLOG_LIST_RETRY_BACKOFF = env.float("JIRA_WORKLOG_LIST_RETRY_BACKOFF", 1.0)
 # THe prefix used for distinguishing sprint boards from other ones.
 JIRA_SPRINT_BOARD_PREFIX = env.str("SPRINT_BOARD_PREFIX", "Sprint - ")
 # Username of a helper Jira bot used for indicating custom review time requirements.
@@ -699,6 +760,8 @@ SPILLOVER_CLEAN_HINTS_MESSAGE = fr"congratulations for achieving a clean sprint!
                                 fr"[Spillover spreadsheet|{GOOGLE_SPILLOVER_SPREADSHEET_URL}]. " \
                                 fr"You can also add them upfront as a Jira comment " \
                                 fr"matching the following regexp: {{code:python}} {SPILLOVER_REASON_DIRECTIVE}{{code}}"
+# Maximum number of the spillover reminders posted to Jira simultaneously.
+SPILLOVER_REMINDER_CONCURRENCY = env.int("SPILLOVER_REMINDER_CONCURRENCY", 4)
 
 # Specify names of the Tempo account categories.
 TEMPO_BILLABLE_ACCOUNT = env.str("TEMPO_BILLABLE_ACCOUNT", "BILLABLE")
@@ -716,7 +779,13 @@ CACHE_WORKLOG_TIMEOUT_ONE_TIME = SECONDS_IN_MINUTE * 2
 CACHE_SPRINT_TIMEOUT_ONE_TIME = SECONDS_IN_MINUTE * 2
 CACHE_WORKLOG_REGENERATE_LOCK = "cache-worklog-regenerate"
 CACHE_WORKLOG_REGENERATE_LOCK_TIMEOUT_SECONDS = env.int("CACHE_WORKLOG_REGENERATE_LOCK_TIMEOUT_SECONDS", SECONDS_IN_MINUTE * 30)
-CACHE_SPRINT_START_DATE_PREFIX = "sprint_start_date-"
+CACHE_SPRINT_CALENDAR_KEY = "sprint_calendar"
+CACHE_SPRINT_CALENDAR_LOCK = "sprint_calendar_lock"
+CACHE_SPRINT_CALENDAR_LOCK_TIMEOUT_SECONDS = SECONDS_IN_MINUTE * 2
+# The cached sprint dates are refreshed in the background after this time.
+CACHE_SPRINT_CALENDAR_REFRESH_SECONDS = SECONDS_IN_HOUR
+# Each process keeps its copy of the sprint dates in memory for this time.
+CACHE_SPRINT_CALENDAR_LOCAL_TIMEOUT_SECONDS = SECONDS_IN_MINUTE
 CACHE_SPRINT_DATES_TIMEOUT_SECONDS = SECONDS_IN_HOUR * HOURS_IN_DAY * SPRINT_DURATION_DAYS
 CACHE_SPRINT_END_LOCK = "sprint_end_lock-"
 CACHE_SPRINT_END_LOCK_TIMEOUT_SECONDS = SECONDS_IN_HOUR * HOURS_IN_DAY
@@ -728,6 +797,45 @@ CACHE_ISSUES_KEY = "issues"
 CACHE_ISSUES_KEY_LONG_TERM = "issues_lt"
 CACHE_ISSUES_TIMEOUT_SHOT_TERM = SECONDS_IN_HOUR * HOURS_IN_DAY * 2
 CACHE_ISSUES_LOCK = "issues_lock"
+CACHE_JIRA_PREFIX = "jira-"
+CACHE_ISSUE_SNAPSHOT_PREFIX = "issue_snapshot-"
+# The snapshots of the dashboard issues are rebuilt from scratch after this time, instead of being updated.
+CACHE_ISSUE_SNAPSHOT_TIMEOUT = env.int("CACHE_ISSUE_SNAPSHOT_TIMEOUT", SECONDS_IN_HOUR)
+# Timeouts of the cached responses of rarely modified Jira endpoints.
+CACHE_JIRA_TIMEOUTS = {
+    "fields": SECONDS_IN_HOUR * HOURS_IN_DAY,
+    "projects": SECONDS_IN_HOUR,
+    "boards": SECONDS_IN_HOUR,
+    "quickfilters": SECONDS_IN_MINUTE * 15,
+    "poker_session_vote_values": SECONDS_IN_HOUR * HOURS_IN_DAY,
+    "user": SECONDS_IN_HOUR * HOURS_IN_DAY,
+    # Only the searches explicitly marked as cached.
+    "search": SECONDS_IN_MINUTE * 5,
+}
+# Stale responses are kept for `timeout * CACHE_JIRA_REVALIDATION_FACTOR` seconds for the conditional revalidation.
+CACHE_JIRA_REVALIDATION_FACTOR = 4
+CACHE_JIRA_RATE_LIMIT_PREFIX = "jira_rate_limit-"
+CACHE_JQL_FILTER_PREFIX = "jql_filter-"
+CACHE_JQL_FILTER_TIMEOUT = SECONDS_IN_HOUR * HOURS_IN_DAY * 30
+CACHE_SCHEDULE_PREFIX = "schedule-"
+# The schedules are cached until the start of the sprint, but not longer than this.
+CACHE_SCHEDULE_TIMEOUT = env.int("CACHE_SCHEDULE_TIMEOUT", SECONDS_IN_HOUR * 6)
+CACHE_USER_DIRECTORY_KEY = "user_directory"
+CACHE_USER_DIRECTORY_TIMEOUT = SECONDS_IN_HOUR * HOURS_IN_DAY
+# Users missing from the cached directory are cached individually, with this prefix.
+CACHE_USER_DIRECTORY_USER_PREFIX = "user_directory_user-"
+CACHE_MATTERMOST_USERNAME_PREFIX = "mattermost_username-"
+CACHE_ROTATIONS_KEY = "rotations"
+CACHE_ROTATIONS_TIMEOUT = SECONDS_IN_MINUTE * 15
+CACHE_HANDBOOK_ROLES_KEY = "handbook_roles"
+CACHE_HANDBOOK_ROLES_LOCK = "handbook_roles_lock"
+# The cached handbook roles are revalidated in the background after this time.
+CACHE_HANDBOOK_ROLES_REVALIDATE_SECONDS = SECONDS_IN_MINUTE * 15
+# The last known handbook roles are used for this time if the handbook is unavailable.
+CACHE_HANDBOOK_ROLES_TIMEOUT = SECONDS_IN_HOUR * HOURS_IN_DAY * 7
+CACHE_TOPOLOGY_PREFIX = "topology-"
+CACHE_TOPOLOGY_VERSION_KEY = "topology_version"
+CACHE_TOPOLOGY_TIMEOUT = SECONDS_IN_HOUR
 
 # Dict for local account naming.
 TEMPO_ACCOUNT_TRANSLATE = {
@@ -769,6 +877,8 @@ MATTERMOST_TEAM_NAME = env.str("MATTERMOST_TEAM_NAME")
 # Handbook roles page URL
 HANDBOOK_ROLES_PAGE = env.str("HANDBOOK_ROLES_PAGE", None)
 FEATURE_CELL_ROLES = env.bool("FEATURE_CELL_ROLES", False)
+# Timeout (in seconds) of the requests retrieving the handbook roles page.
+HANDBOOK_ROLES_PAGE_TIMEOUT = env.float("HANDBOOK_ROLES_PAGE_TIMEOUT", 5.0)
 
 # Example HTML: `<li><a href="../roles/#cell-manager-recruitment">Recruitment manager</a>: John Doe</li>`
 ROLES_REGEX = env.str("ROLES_REGEX", r"<li>.*roles.*>([A-Za-z ]+).*: (.+)<\/li>")
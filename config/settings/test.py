@@ -29,6 +29,9 @@ CACHES = {
 
 CELERYBEAT_SCHEDULE = {}
 
+# The saved filters would need to be mocked for each Jira connection.
+JIRA_SAVED_FILTERS = False
+
 # PASSWORDS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
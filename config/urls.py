@@ -13,6 +13,7 @@ from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from sprints.dashboard.views import metrics_view
 from sprints.users.api import GoogleLogin
 
 schema_view = get_schema_view(
@@ -38,6 +39,8 @@ urlpatterns = [
     path("dashboard/", include("sprints.dashboard.urls", namespace="dashboard")),
     # Sustainability Dashboard
     path("sustainability/", include("sprints.sustainability.urls", namespace="sustainability")),
+    # Prometheus metrics
+    path("metrics/", metrics_view, name="metrics"),
 ]
 
 # Provide an option to disable standard (not social auth) login/registration page.
@@ -4,7 +4,10 @@ from datetime import (
     datetime,
     timedelta,
 )
-from multiprocessing.pool import ThreadPool
+from typing import (
+    Iterable,
+    Iterator,
+)
 
 from dateutil.parser import parse
 from django.conf import settings
@@ -12,12 +15,15 @@ from django.core.exceptions import ImproperlyConfigured
 from jira import Issue
 from jira.resources import User
 
-from sprints.dashboard.libs.jira import CustomJira
-from sprints.dashboard.models import Dashboard
+from sprints.dashboard.libs import jql
+from sprints.dashboard.libs.jira import (
+    CustomJira,
+    IssueRecord,
+)
+from sprints.dashboard.models import get_dashboards
+from sprints.dashboard.sprint_calendar import get_current_sprint_start_date
 from sprints.dashboard.utils import (
     get_all_sprints,
-    get_cells,
-    get_current_sprint_start_date,
     get_issue_fields,
     get_sprint_number,
 )
@@ -44,27 +50,33 @@ def get_specific_day_of_sprint(day: int) -> datetime:
     return parse(start_date) + timedelta(days=day - 1)
 
 
-def get_next_sprint_issues(conn: CustomJira, changelog: bool = False) -> list[Issue]:
+def get_next_sprint_issues(conn: CustomJira, changelog: bool = False) -> Iterator[Issue]:
     """
     Retrieve all issues scheduled for the next sprint.
 
     Filtering by sprints excludes non-cell tickets.
+    The issues are streamed, so they need to be consumed while the connection is still checked out.
 
     :param conn: Jira connection.
     :param changelog: Include issue's history.
-    :return: List of issues scheduled for the next sprint.
+    :return: Issues scheduled for the next sprint.
     """
     sprints = get_all_sprints(conn)
-    sprints_str = ",".join((str(s.id) for s in sprints['future']))
-    return conn.search_issues(
-        jql_str=f"Sprint IN ({sprints_str})",
-        fields=list(get_issue_fields(conn, settings.JIRA_REQUIRED_FIELDS + settings.JIRA_AUTOMATION_FIELDS).values()),
-        expand="changelog" if changelog else "",  # Retrieve history of changes for each issue.
-        maxResults=0,
+    query = jql.in_('Sprint', [sprint.id for sprint in sprints['future']])
+    fields = list(get_issue_fields(conn, settings.JIRA_REQUIRED_FIELDS + settings.JIRA_AUTOMATION_FIELDS).values())
+    return jql.search_saved_filter(
+        conn,
+        "next sprint issues",
+        query,
+        lambda jql_str: conn.search_issues_iter(
+            jql_str=jql_str,
+            fields=fields,
+            expand="changelog" if changelog else "",  # Retrieve history of changes for each issue.
+        ),
     )
 
 
-def get_unestimated_next_sprint_issues(conn: CustomJira) -> list[Issue]:
+def get_unestimated_next_sprint_issues(conn: CustomJira) -> list[IssueRecord]:
     """
     Retrieve all unestimated issues scheduled for the next sprint or placed in the stretch goals.
 
@@ -80,15 +92,24 @@ def get_unestimated_next_sprint_issues(conn: CustomJira) -> list[Issue]:
         raise ImproperlyConfigured(f"No sprint named {settings.SPRINT_ASYNC_INJECTION_SPRINT} has been found in Jira.")
 
     used_sprints = sprints['future'] + [stretch_goals]
-    sprints_str = ",".join((str(s.id) for s in used_sprints))
-    return conn.search_issues(
-        jql_str=f'Sprint IN ({sprints_str}) '
-        f'AND "{settings.JIRA_FIELDS_STATUS}" != "{settings.SPRINT_STATUS_ARCHIVED}" '  # Ignore archived.
-        f'AND "{settings.JIRA_FIELDS_STORY_POINTS}" is EMPTY '  # Only unestimated.
-        f'AND issuetype NOT IN subTaskIssueTypes()'  # Ignore subtasks.
-        f'AND status = {settings.SPRINT_STATUS_BACKLOG}',  # Include only unstarted issues.
-        fields=['None'],  # We don't need any fields here. The `key` attribute will be sufficient.
-        maxResults=0,
+    query = jql.and_(
+        jql.in_('Sprint', [sprint.id for sprint in used_sprints]),
+        jql.ne(settings.JIRA_FIELDS_STATUS, settings.SPRINT_STATUS_ARCHIVED),  # Ignore archived.
+        jql.is_empty(settings.JIRA_FIELDS_STORY_POINTS),  # Only unestimated.
+        jql.not_in('issuetype', jql.Function('subTaskIssueTypes()')),  # Ignore subtasks.
+        jql.eq('status', settings.SPRINT_STATUS_BACKLOG),  # Include only unstarted issues.
+    )
+    return list(
+        jql.search_saved_filter(
+            conn,
+            "unestimated next sprint issues",
+            query,
+            lambda jql_str: conn.search_issue_records_iter(
+                jql_str,
+                fields=['None'],  # We don't need any fields here. The `key` and `id` attributes will be sufficient.
+                cached=True,
+            ),
+        )
     )
 
 
@@ -154,7 +175,7 @@ def ping_users_on_ticket(conn: CustomJira, issue: Issue, message: str, epic_owne
         conn.add_comment(issue.key, comment)
 
 
-def group_incomplete_issues(conn: CustomJira, issues: list[Issue]) -> defaultdict[User, dict[str, list[str]]]:
+def group_incomplete_issues(conn: CustomJira, issues: Iterable[Issue]) -> defaultdict[User, dict[str, list[str]]]:
     """
     Compose a dict mapping users with dicts mapping users' tickets with lists of missing tickets' fields.
 
@@ -273,13 +294,10 @@ def get_overcommitted_users(conn: CustomJira) -> dict[str, list[User]]:
     :param conn: Jira connection.
     :return: List of overcommitted users.
     """
-    cells = get_cells(conn)
     result = dict[str, list[User]]()
 
-    # Generate dashboards in parallel.
-    with ThreadPool(processes=settings.MULTIPROCESSING_POOL_SIZE) as pool:
-        results = [pool.apply_async(Dashboard, (cell.board_id, conn)) for cell in cells]
-        dashboards = [result.get(settings.MULTIPROCESSING_TIMEOUT) for result in results]
+    # The shared data (including the issues) is retrieved once for all cells.
+    dashboards = get_dashboards(conn).values()
 
     for dashboard in dashboards:
         overcommitted_users: list[User] = []
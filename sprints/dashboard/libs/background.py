@@ -0,0 +1,31 @@
+"""
+Refreshing cached data in the background.
+
+The stale data is served while it is being refreshed in a separate thread. The refreshes are coordinated between the
+processes with a lock stored in the cache, so only one of them calls the external service at a time.
+"""
+import threading
+from typing import Callable
+
+from django.core.cache import cache
+
+
+def run_in_background_once(lock_key: str, lock_timeout: int, func: Callable[[], None]) -> bool:
+    """
+    Run the function in a separate thread, unless another process is already running it.
+
+    :param lock_key: Cache key of the lock held while the function is running.
+    :param lock_timeout: Number of seconds after which the lock is released, even if the function has not finished.
+    :returns whether the function has been started
+    """
+    if not cache.add(lock_key, True, lock_timeout):
+        return False
+
+    def run() -> None:
+        try:
+            func()
+        finally:
+            cache.delete(lock_key)
+
+    threading.Thread(target=run, daemon=True).start()
+    return True
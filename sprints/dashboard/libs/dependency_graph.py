@@ -0,0 +1,83 @@
+import contextvars
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+
+class DependencyGraph:
+    """
+    Steps with dependencies between them, executed concurrently.
+
+    Each step is started as soon as all of its dependencies have finished, so the total time approaches the duration of
+    the slowest chain of the dependent steps instead of the sum of all of them. The steps are run in worker threads,
+    within copies of the caller's context (e.g. the memoization scope of the request).
+
+    Example:
+        graph = DependencyGraph()
+        graph.add('sprints', get_sprints)
+        graph.add('issues', get_issues, depends_on=['sprints'])
+        graph.run()
+    """
+
+    def __init__(self) -> None:
+        self._steps: Dict[str, Tuple[Callable[[], Any], Tuple[str, ...]]] = {}
+        self.results: Dict[str, Any] = {}
+        # Duration of each step, in seconds.
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable[[], Any], depends_on: Iterable[str] = ()) -> None:
+        """
+        Add the step to the graph. The dependencies need to be added first, so the graph cannot contain cycles.
+
+        :raises ValueError if the step already exists or any of its dependencies does not exist
+        """
+        depends_on = tuple(depends_on)
+        if name in self._steps:
+            raise ValueError(f"Step {name} already exists.")
+        if missing := [dependency for dependency in depends_on if dependency not in self._steps]:
+            raise ValueError(f"Unknown dependencies of {name}: {', '.join(missing)}.")
+        self._steps[name] = (func, depends_on)
+
+    def run(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Execute the steps and return their results.
+
+        If any step fails, the steps that have not been started yet are skipped and its exception is raised.
+
+        :param max_workers: Maximum number of steps run at once. Defaults to the number of steps.
+        """
+        pending = dict(self._steps)
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers or len(pending) or 1) as executor:
+            while pending or running:
+                for name, (func, depends_on) in list(pending.items()):
+                    if all(dependency in self.results for dependency in depends_on):
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self._run_step, name, func)] = name
+                        del pending[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    future.result()
+        return self.results
+
+    def _run_step(self, name: str, func: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        try:
+            result = func()
+        finally:
+            self.timings[name] = time.perf_counter() - start
+        self.results[name] = result
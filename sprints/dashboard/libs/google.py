@@ -2,6 +2,7 @@ import re
 from contextlib import contextmanager
 from datetime import timedelta
 from typing import (
+    Any,
     Dict,
     Iterator,
     List,
@@ -10,10 +11,19 @@ from typing import (
 
 from dateutil.parser import parse
 from django.conf import settings
+from django.core.cache import cache
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient import discovery
+from googleapiclient.http import build_http
 
 from config.settings.base import SECONDS_IN_HOUR
+from sprints.dashboard.libs.replay import (
+    RECORD,
+    REPLAY,
+    RecordingHttp,
+    ReplayHttp,
+)
 
 
 @contextmanager
@@ -23,13 +33,23 @@ def connect_to_google(service: str) -> Iterator[discovery.Resource]:
         'https://www.googleapis.com/auth/calendar',
         'https://www.googleapis.com/auth/spreadsheets',
     ]
-    credentials = service_account.Credentials.from_service_account_info(settings.GOOGLE_API_CREDENTIALS, scopes=scopes)
     api_version = {
         'calendar': 'v3',
         'sheets': 'v4',
     }
+    if settings.HTTP_REPLAY_MODE == REPLAY:
+        auth: Dict[str, Any] = {'http': ReplayHttp()}
+    else:
+        credentials = service_account.Credentials.from_service_account_info(
+            settings.GOOGLE_API_CREDENTIALS, scopes=scopes
+        )
+        if settings.HTTP_REPLAY_MODE == RECORD:
+            auth = {'http': RecordingHttp(AuthorizedHttp(credentials, http=build_http()))}
+        else:
+            auth = {'credentials': credentials}
+
     try:
-        service = discovery.build(service, api_version[service], credentials=credentials, cache_discovery=False)
+        service = discovery.build(service, api_version[service], cache_discovery=False, **auth)
     except KeyError:
         raise AttributeError("Unknown service name.")
     yield service
@@ -71,7 +91,6 @@ def get_vacations(from_: str, to: str) -> List[Dict[str, Union[int, str, Dict[st
                 except (AttributeError, TypeError):  # The event doesn't relate to vacations.
                     pass
 
-        vacations.sort(key=lambda x: x['user'])  # Small optimization for searching
         return vacations
 
 
@@ -139,22 +158,47 @@ def get_rotations_spreadsheet() -> List[List[str]]:
 
 def get_rotations_users(sprint_number: str, cell_name: str) -> Dict[str, List[str]]:
     """Retrieve users that have cell roles assigned for the chosen sprint."""
-    spreadsheet = get_rotations_spreadsheet()
-    sprint_rows: List[int] = []
+    sprint_rotations = get_rotations_index().get(int(sprint_number), {})
+    return {
+        header.replace(cell_name, '').strip(): users
+        for header, users in sprint_rotations.items()
+        if header.startswith(cell_name)
+    }
+
+
+def get_rotations_index() -> Dict[int, Dict[str, List[str]]]:
+    """
+    Retrieve the rotations as `{sprint_number: {column_header: [users]}}`, where the column headers consist of the cell
+    and role names (e.g. `Bebop FF`).
+
+    The index is cached, so the spreadsheet is not downloaded for every lookup.
+    """
+    index = cache.get(settings.CACHE_ROTATIONS_KEY)
+    if index is None:
+        index = _build_rotations_index(get_rotations_spreadsheet())
+        cache.set(settings.CACHE_ROTATIONS_KEY, index, settings.CACHE_ROTATIONS_TIMEOUT)
+    return index
+
+
+def _build_rotations_index(spreadsheet: List[List[str]]) -> Dict[int, Dict[str, List[str]]]:
+    """
+    Parse the rotations spreadsheet. Its first column contains the sprint numbers, optionally followed by the part of
+    the sprint (e.g. `230a`, `230b`), and the other columns contain the users with the roles for each sprint.
+    """
+    sprint_rows: Dict[int, List[int]] = {}
     for i, row in enumerate(spreadsheet[0]):
-        if row.startswith(sprint_number):
-            sprint_rows.append(i)
-
-    result: Dict[str, List[str]] = {}
-    for column in spreadsheet:
-        if column[0].startswith(cell_name):
-            role_name = column[0].replace(cell_name, '').strip()
-            result[role_name] = []
-            for row in sprint_rows:  # type: ignore
-                if column[row]:  # type: ignore
-                    result[role_name].append(column[row])  # type: ignore
-
-    return result
+        if sprint_number_search := re.match(r'\d+', row):
+            sprint_rows.setdefault(int(sprint_number_search.group()), []).append(i)
+
+    columns = [column for column in spreadsheet if column]
+    return {
+        sprint_number: {
+            # Google API omits trailing empty cells, so the columns can be shorter than the first one.
+            column[0]: [column[row] for row in rows if row < len(column) and column[row]]
+            for column in columns
+        }
+        for sprint_number, rows in sprint_rows.items()
+    }
 
 
 def get_availability_spreadsheet() -> List[List[str]]:
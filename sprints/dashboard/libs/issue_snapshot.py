@@ -0,0 +1,113 @@
+"""
+Snapshots of the issues matching the dashboard query, refreshed incrementally.
+
+Retrieving the dashboard issues with all of their fields is the slowest part of loading a dashboard, even though most of
+them do not change between the refreshes. Therefore, the raw issues are kept in the cache, and each refresh retrieves
+only:
+1. the keys of the issues matching the query, for dropping the ones that have been deleted or have left the query,
+2. the issues matching the query that have been updated since the previous refresh. This includes the issues that have
+   joined the query, as moving an issue to a sprint or changing its status updates it.
+
+The query is the same for all cells, so their dashboards share the snapshot. It is rebuilt from scratch after
+`CACHE_ISSUE_SNAPSHOT_TIMEOUT`, which limits the effects of any changes that are not reflected in the `updated` field.
+"""
+import math
+import time
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.settings.base import SECONDS_IN_MINUTE
+from sprints.dashboard.libs import jql
+from sprints.dashboard.libs.jira import (
+    CustomJira,
+    IssueRecord,
+    parse_issue_records,
+)
+
+# Added to the time since the previous refresh, as the relative dates in JQL have a precision of one minute.
+SYNC_MARGIN_MINUTES = 1
+
+
+def get_issue_records(
+    conn: CustomJira,
+    jql_str: str,
+    fields: List[str],
+    incremental: Optional[bool] = None,
+) -> Iterator[IssueRecord]:
+    """
+    Retrieve the issues matching the query as `IssueRecord` objects. See `get_raw_issues`.
+    """
+    return parse_issue_records(get_raw_issues(conn, jql_str, fields, incremental).values(), fields)
+
+
+def get_raw_issues(
+    conn: CustomJira,
+    jql_str: str,
+    fields: List[str],
+    incremental: Optional[bool] = None,
+) -> Dict[str, dict]:
+    """
+    Retrieve the issues matching the query, updating their snapshot stored in the cache.
+
+    :param incremental: Update the cached snapshot instead of retrieving all issues. Defaults to
+        `settings.JIRA_INCREMENTAL_DASHBOARD`.
+    :returns raw issues in the `{key: issue JSON}` format
+    """
+    if incremental is None:
+        incremental = settings.JIRA_INCREMENTAL_DASHBOARD
+    if not incremental:
+        return _search(conn, jql_str, fields)
+
+    cache_key = f'{settings.CACHE_ISSUE_SNAPSHOT_PREFIX}{jql.fingerprint(jql_str, fields)}'
+    # The time is measured before retrieving the issues, so the next refresh includes the changes made in the meantime.
+    synced_at = time.time()
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = {'created_at': synced_at, 'issues': _search(conn, jql_str, fields)}
+    else:
+        snapshot['issues'] = _update(conn, jql_str, fields, snapshot['issues'], synced_at - snapshot['synced_at'])
+    snapshot['synced_at'] = synced_at
+
+    if (timeout := snapshot['created_at'] + settings.CACHE_ISSUE_SNAPSHOT_TIMEOUT - synced_at) > 0:
+        cache.set(cache_key, snapshot, int(timeout))
+    return snapshot['issues']
+
+
+def _search(conn: CustomJira, jql_str: str, fields: List[str]) -> Dict[str, dict]:
+    return {raw_issue['key']: raw_issue for raw_issue in conn.search_raw_issues_iter(jql_str, fields)}
+
+
+def _update(
+    conn: CustomJira,
+    jql_str: str,
+    fields: List[str],
+    issues: Dict[str, dict],
+    elapsed: float,
+) -> Dict[str, dict]:
+    """
+    Apply the changes made since the previous refresh to the snapshot of the issues.
+
+    :param elapsed: Number of seconds since the previous refresh.
+    """
+    # Retrieving only the keys is much cheaper than retrieving the fields (especially the descriptions).
+    current_keys = {
+        raw_issue['key']
+        for raw_issue in conn.search_raw_issues_iter(jql_str, ['None'], settings.JIRA_SEARCH_KEYS_PAGE_SIZE)
+    }
+    issues = {key: raw_issue for key, raw_issue in issues.items() if key in current_keys}
+
+    minutes = math.ceil(elapsed / SECONDS_IN_MINUTE) + SYNC_MARGIN_MINUTES
+    issues.update(_search(conn, jql.and_(jql.group(jql_str), jql.ge('updated', f'-{minutes}m')), fields))
+
+    # This should not happen, but an issue missing in the snapshot would never be retrieved until it is updated again.
+    if missing := current_keys - issues.keys():
+        for clause in jql.in_chunks('key', missing):
+            issues.update(_search(conn, clause, fields))
+    return issues
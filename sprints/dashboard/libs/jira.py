@@ -1,22 +1,54 @@
+import asyncio
+import contextvars
+import functools
+import hashlib
+import http
 import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from functools import cached_property
+from multiprocessing.pool import ThreadPool
 from typing import (
+    Any,
+    Awaitable,
+    Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
+    Optional,
+    TypeVar,
 )
 
 from django.conf import settings
+from django.core.cache import cache
 from jira import JIRA
 from jira.client import ResultList
 from jira.exceptions import JIRAError
 from jira.resources import (
+    Board,
     GreenHopperResource,
+    Issue,
+    Project,
     Resource,
-    Worklog,
+    User,
 )
 from jira.utils import json_loads
+from requests.exceptions import RequestException
+
+from sprints.dashboard.libs.jql import fingerprint
+from sprints.dashboard.libs.metrics import CACHE_EVENTS
+from sprints.dashboard.libs.replay import get_jira_adapter
+from sprints.dashboard.libs.scope import in_current_context
+
+T = TypeVar('T')
+
+_cache_stats: Counter = Counter()
+_cache_stats_lock = threading.Lock()
 
 
 class QuickFilter(GreenHopperResource):
@@ -131,6 +163,115 @@ class Poker(Resource):
         super().update(data, async_, jira, notify, **kwargs)
 
 
+class RecordUser:
+    """
+    Lightweight representation of a Jira user parsed directly from the JSON response.
+
+    It is hashed and compared by `name`, like `jira.resources.User`, so both can be used interchangeably as dict keys.
+    """
+
+    __slots__ = ('name', 'key', 'displayName', 'emailAddress')
+
+    def __init__(self, raw: dict) -> None:
+        self.name = raw.get('name')
+        self.key = raw.get('key')
+        self.displayName = raw.get('displayName')
+        self.emailAddress = raw.get('emailAddress')
+
+    def __hash__(self):
+        return hash(str(self.name))
+
+    def __eq__(self, other):
+        return str(self.name) == str(getattr(other, 'name', None))
+
+    def __repr__(self):
+        return f"<RecordUser name='{self.name}'>"
+
+    def __str__(self):
+        return _get_readable_value({'displayName': self.displayName, 'key': self.key, 'name': self.name}, self)
+
+
+class RecordValue:
+    """Lightweight, read-only replacement of `PropertyHolder` for nested values (e.g. status or comments)."""
+
+    __slots__ = ('_raw',)
+
+    def __init__(self, raw: dict) -> None:
+        self._raw = raw
+
+    def __getattr__(self, item: str) -> Any:
+        # Private attributes are not looked up in the raw data to avoid recursion before `_raw` is set.
+        if item.startswith('_'):
+            raise AttributeError(item)
+        try:
+            return _parse_record_value(self._raw[item])
+        except KeyError:
+            raise AttributeError(item)
+
+    def __str__(self):
+        readable = _get_readable_value(self._raw, self)
+        # Include the child of the nested select fields, like `jira.resources.Resource` does.
+        if 'child' in self._raw:
+            readable += f" - {self.child}"
+        return readable
+
+
+def _get_readable_value(raw: dict, obj: Any) -> str:
+    """Get the first value that is likely to be human-readable, in the same order as `jira.resources.Resource`."""
+    for name in Resource._READABLE_IDS:
+        if raw.get(name) is not None:
+            return str(raw[name])
+    return repr(obj)
+
+
+def _parse_record_value(value: Any) -> Any:
+    """Wrap raw JSON values, so they can be accessed in the same way as `jira.resources` objects."""
+    if isinstance(value, dict):
+        # Users are the only nested values that are hashed, so they need their own type.
+        if 'displayName' in value and 'name' in value:
+            return RecordUser(value)
+        return RecordValue(value)
+    if isinstance(value, list):
+        return [_parse_record_value(item) for item in value]
+    return value
+
+
+@functools.lru_cache()
+def _get_record_fields_class(field_ids: tuple[str, ...]) -> type:
+    """Create a `__slots__` class for storing the specified issue fields."""
+
+    def __init__(self, raw: dict) -> None:
+        for field_id in field_ids:
+            setattr(self, field_id, _parse_record_value(raw.get(field_id)))
+
+    return type('RecordFields', (), {'__slots__': field_ids, '__init__': __init__})
+
+
+class IssueRecord:
+    """
+    Compact representation of an issue built directly from the search JSON.
+
+    It provides the same `key` and `fields` attributes as `jira.resources.Issue`, but it retains only the requested
+    fields and skips creating the `Resource` and `PropertyHolder` trees, which makes it much cheaper to build.
+    """
+
+    __slots__ = ('id', 'key', 'fields')
+
+    def __init__(self, raw: dict, fields_class: type) -> None:
+        self.id = raw['id']
+        self.key = raw['key']
+        self.fields = fields_class(raw.get('fields', {}))
+
+    def __repr__(self):
+        return f"<IssueRecord key='{self.key}'>"
+
+
+def parse_issue_records(raw_issues: Iterable[dict], fields: List[str]) -> Iterator[IssueRecord]:
+    """Parse the issues from the search JSON (e.g. stored in the cache) into `IssueRecord` objects."""
+    fields_class = _get_record_fields_class(tuple(fields))
+    return (IssueRecord(raw_issue, fields_class) for raw_issue in raw_issues)
+
+
 class CustomJira(JIRA):
     """Custom Jira class for using greenhopper and Tempo APIs."""
 
@@ -141,6 +282,18 @@ class CustomJira(JIRA):
     TEMPO_ACCOUNTS_URL = '{server}/rest/tempo-accounts/1/{path}'
     TEMPO_TIMESHEETS_URL = '{server}/rest/tempo-timesheets/3/{path}'
 
+    def _create_http_basic_session(self, username: str, password: str, timeout: Optional[int] = None) -> None:
+        """
+        Create the session with a custom HTTP adapter.
+
+        The adapter is mounted before any request is sent, so it handles the requests made by `JIRA.__init__` too.
+        """
+        super()._create_http_basic_session(username, password, timeout)
+        # The default adapter keeps only 10 sockets alive, which is not enough for the thread pools sharing one session.
+        adapter = get_jira_adapter(pool_connections=1, pool_maxsize=settings.MULTIPROCESSING_POOL_SIZE)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
     def move_to_backlog(self, issue_keys: list[str]):
         """
         It is not mentioned in Python lib docs, but the limit for the issue-moving queries is 50 issues. Source:
@@ -159,9 +312,221 @@ class CustomJira(JIRA):
         for chunk in chunks(issue_keys, batch_size):
             super().add_issues_to_sprint(sprint_id, chunk)
 
+    def fields(self) -> List[Dict[str, Any]]:
+        """Return a list of all issue fields."""
+        return self._get_cached_json('fields', 'field')
+
+    def projects(self) -> List[Project]:
+        """Get a list of projects visible to the current authenticated user."""
+        r_json = self._get_cached_json('projects', 'project')
+        return [Project(self._options, self._session, raw_project_json) for raw_project_json in r_json]
+
+    def boards(
+        self, startAt: int = 0, maxResults: int = 50, type: str = None, name: str = None, projectKeyOrID: str = None
+    ) -> ResultList:
+        """
+        Get a list of boards.
+
+        The boards are paginated, so they are cached without the revalidation.
+        """
+        fetch_boards = super().boards
+        r_json = self._get_cached(
+            'boards',
+            ('board', startAt, maxResults, type, name, projectKeyOrID),
+            lambda: [board.raw for board in fetch_boards(startAt, maxResults, type, name, projectKeyOrID)],
+        )
+        boards = [Board(self._options, self._session, raw_board_json) for raw_board_json in r_json]
+        return ResultList(boards, startAt, maxResults, len(boards), True)
+
+    def user(self, id: str, expand: str = None) -> User:
+        """Get a user by their username."""
+        params = {'username': id}
+        if expand is not None:
+            params['expand'] = expand
+        r_json = self._get_cached_json('user', 'user', params=params)
+        return User(self._options, self._session, r_json)
+
+    def _get_cached(self, endpoint: str, key_parts: tuple, loader: Callable[[], T]) -> T:
+        """
+        Retrieve the response from the cache or load it with `loader`. Use it for responses that cannot be revalidated.
+
+        :param endpoint: Name of the endpoint, used for determining the timeout from `settings.CACHE_JIRA_TIMEOUTS`.
+        :param key_parts: Values identifying the request.
+        :param loader: Function retrieving the JSON-serializable response.
+        """
+        key = _get_cache_key(endpoint, key_parts)
+        entry, fresh = _get_cache_entry(endpoint, key)
+        if fresh:
+            return entry['data']
+
+        _count_cache_event(endpoint, 'miss')
+        data = loader()
+        _set_cache_entry(endpoint, key, data)
+        return data
+
+    def _get_cached_json(self, endpoint: str, path: str, params: dict = None, base: str = JIRA.JIRA_BASE_URL) -> Any:
+        """
+        Cached version of `_get_json`.
+
+        When the cached response is stale and the server returned an `ETag` or `Last-Modified` header for it, the
+        response is revalidated with a conditional request instead of downloading it again.
+
+        :param endpoint: Name of the endpoint, used for determining the timeout from `settings.CACHE_JIRA_TIMEOUTS`.
+        """
+        key = _get_cache_key(endpoint, (base, path, sorted((params or {}).items())))
+        entry, fresh = _get_cache_entry(endpoint, key)
+        if fresh:
+            return entry['data']
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self._session.get(self._get_url(path, base), params=params, headers=headers)
+        except JIRAError as e:
+            # `ResilientSession` raises an error for all responses other than 2xx.
+            if not (entry and e.status_code == http.HTTPStatus.NOT_MODIFIED):
+                raise
+            _count_cache_event(endpoint, 'revalidated')
+            _set_cache_entry(endpoint, key, entry['data'], entry.get('etag'), entry.get('last_modified'))
+            return entry['data']
+
+        _count_cache_event(endpoint, 'miss')
+        data = json_loads(response)
+        _set_cache_entry(
+            endpoint, key, data, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        )
+        return data
+
+    def search_issues_iter(
+        self,
+        jql_str: str,
+        fields: Optional[List[str]] = None,
+        expand: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Issue]:
+        """
+        Yield issues matching the JQL query page by page.
+
+        Unlike `search_issues` with `maxResults=0`, this does not wait for all pages before returning, so the consumer
+        can start processing the issues while the rest of them is being retrieved. The next page is prefetched in the
+        background, so at most two pages are kept in the memory at once.
+
+        Note: the generator needs to be consumed while the connection is still checked out.
+
+        :param jql_str: The JQL search string.
+        :param fields: List of issue fields to include in the results.
+        :param expand: Extra information to fetch inside each issue.
+        :param page_size: Number of issues retrieved with each request. Defaults to `settings.JIRA_SEARCH_PAGE_SIZE`.
+        """
+        page_size = page_size or settings.JIRA_SEARCH_PAGE_SIZE
+
+        def fetch_page(start_at: int) -> tuple[List[Issue], int]:
+            page = self.search_issues(jql_str, startAt=start_at, maxResults=page_size, fields=fields, expand=expand)
+            return page, page.total
+
+        return self._iter_pages(fetch_page)
+
+    def search_issue_records_iter(
+        self,
+        jql_str: str,
+        fields: List[str],
+        page_size: Optional[int] = None,
+        cached: bool = False,
+    ) -> Iterator[IssueRecord]:
+        """
+        Fast path of `search_issues_iter`, which parses the search JSON directly into `IssueRecord` objects.
+
+        :param jql_str: The JQL search string.
+        :param fields: IDs of the issue fields to retrieve. Only these fields are available in the records.
+        :param page_size: Number of issues retrieved with each request. Defaults to `settings.JIRA_SEARCH_PAGE_SIZE`.
+        :param cached: Share the results between the processes for `settings.CACHE_JIRA_TIMEOUTS['search']`. Identical
+            queries are recognized by their fingerprints, so use `libs.jql` for building them.
+        """
+        return parse_issue_records(self.search_raw_issues_iter(jql_str, fields, page_size, cached), fields)
+
+    def search_raw_issues_iter(
+        self,
+        jql_str: str,
+        fields: List[str],
+        page_size: Optional[int] = None,
+        cached: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Yield the issues as the raw search JSON, which can be stored (e.g. in the cache) and parsed later with
+        `parse_issue_records`. The arguments are the same as in `search_issue_records_iter`.
+        """
+        page_size = page_size or settings.JIRA_SEARCH_PAGE_SIZE
+
+        def fetch_page(start_at: int) -> tuple[List[dict], int]:
+            params = {
+                'jql': jql_str,
+                'startAt': start_at,
+                'maxResults': page_size,
+                'fields': ','.join(fields),
+                'validateQuery': True,
+            }
+            if cached:
+                key_parts = (fingerprint(jql_str, fields), start_at, page_size)
+                r_json = self._get_cached('search', key_parts, lambda: self._get_json('search', params=params))
+            else:
+                r_json = self._get_json('search', params=params)
+            return r_json['issues'], r_json['total']
+
+        return self._iter_pages(fetch_page)
+
+    def comments_since(self, issue_key: str, since: str, page_size: Optional[int] = None) -> Iterator[RecordValue]:
+        """
+        Yield comments of the issue created at or after `since`, starting from the newest one.
+
+        The comments are retrieved page by page in the reversed chronological order, so the older ones are not
+        downloaded at all.
+
+        :param issue_key: Key of the issue.
+        :param since: ISO 8601 date or timestamp. Jira uses the same format, so the timestamps are compared as strings.
+        :param page_size: Number of comments retrieved with each request.
+            Defaults to `settings.JIRA_COMMENTS_PAGE_SIZE`.
+        """
+        page_size = page_size or settings.JIRA_COMMENTS_PAGE_SIZE
+        start_at = 0
+        while True:
+            params = {'startAt': start_at, 'maxResults': page_size, 'orderBy': '-created'}
+            r_json = self._get_json(f'issue/{issue_key}/comment', params=params)
+            for raw_comment in r_json['comments']:
+                if raw_comment['created'] < since:
+                    return
+                yield RecordValue(raw_comment)
+
+            start_at += len(r_json['comments'])
+            if not r_json['comments'] or start_at >= r_json['total']:
+                return
+
+    @staticmethod
+    def _iter_pages(fetch_page: Callable[[int], tuple[List[T], int]]) -> Iterator[T]:
+        """
+        Yield items from the paginated endpoint, while prefetching the next page in the background.
+
+        :param fetch_page: Callable retrieving the page starting at the specified index. It returns a tuple with the
+            items and the total number of results.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page, total = fetch_page(0)
+            start_at = 0
+            while page:
+                start_at += len(page)
+                next_page = executor.submit(in_current_context(fetch_page), start_at) if start_at < total else None
+                yield from page
+                page, total = next_page.result() if next_page else ([], total)
+
     def quickfilters(self, board_id: int) -> ResultList:
         """Retrieve quickfilters defined for the board with `board_id`."""
-        r_json = self._get_json(f'gadgets/rapidview/pool/quickfilters/{board_id}', base=self.GREENHOPPER_BASE_URL)
+        r_json = self._get_cached_json(
+            'quickfilters', f'gadgets/rapidview/pool/quickfilters/{board_id}', base=self.GREENHOPPER_BASE_URL
+        )
         filters = [QuickFilter(self._options, self._session, raw_quickfilters_json) for raw_quickfilters_json in r_json]
         return ResultList(filters, 0, len(filters), len(filters), True)
 
@@ -204,23 +569,39 @@ class CustomJira(JIRA):
         report = Report(self._options, self._session, r_json)
         return report
 
-    def worklog_list(self, worklogs: List[int]) -> List[Worklog]:
+    def worklog_list(self, worklogs: List[int]) -> List[Dict[str, str]]:
         """
         Retrieves list of worklogs with IDs provided in the request's body.
 
-        Limited to 1000 worklogs. Source:
+        The IDs are split into chunks of 1000 (the API limit), which are retrieved concurrently and parsed as soon as
+        they arrive. The results keep the order of the chunks. Only the `id` and `issueId` of each worklog are retained.
+        Source:
         https://developer.atlassian.com/cloud/jira/platform/rest/v3/?utm_source=%2Fcloud%2Fjira%2Fplatform%2Frest%2F&utm_medium=302#api-rest-api-3-worklog-list-post
         """
-        aggregated_worklogs: List[Dict] = []
-        for chunk in chunks(worklogs, 1000):
-            r_json = self._session.post(
-                url=self._get_url('worklog/list', self.API_V2),
-                data=json.dumps({'ids': chunk}),
-            )
-            aggregated_worklogs.extend(json.loads(r_json.text))
+        aggregated_worklogs: List[Dict[str, str]] = []
+        with ThreadPool(settings.JIRA_WORKLOG_LIST_CONCURRENCY) as pool:
+            for chunk_worklogs in pool.imap(in_current_context(self._worklog_list_chunk), chunks(worklogs, 1000)):
+                aggregated_worklogs.extend(chunk_worklogs)
+
+        return aggregated_worklogs
+
+    def _worklog_list_chunk(self, chunk: List[int]) -> List[Dict[str, str]]:
+        """
+        Retrieve a single chunk of worklogs for `worklog_list`.
 
-        worklogs = [Worklog(self._options, self._session, raw_worklog_json) for raw_worklog_json in aggregated_worklogs]
-        return worklogs
+        Failed requests are retried `settings.JIRA_WORKLOG_LIST_RETRIES` times with an exponential backoff.
+        """
+        for attempt in range(settings.JIRA_WORKLOG_LIST_RETRIES):
+            try:
+                return self._post_worklog_list(chunk)
+            except (JIRAError, RequestException):
+                time.sleep(settings.JIRA_WORKLOG_LIST_RETRY_BACKOFF * 2 ** attempt)
+        # The errors of the last attempt are raised.
+        return self._post_worklog_list(chunk)
+
+    def _post_worklog_list(self, chunk: List[int]) -> List[Dict[str, str]]:
+        r = self._session.post(url=self._get_url('worklog/list', self.API_V2), data=json.dumps({'ids': chunk}))
+        return [{'id': worklog['id'], 'issueId': worklog['issueId']} for worklog in json_loads(r)]
 
     def poker_sessions(self, board_id: int, state: str = None, name: str = None) -> list[Poker]:
         """
@@ -313,7 +694,9 @@ class CustomJira(JIRA):
         :param board_id: The board to get possible values from.
         :return: A list of possible vote values.
         """
-        response = self._get_json(f'board/{board_id}/settings', base=self.AGILE_POKER_URL)
+        response = self._get_cached_json(
+            'poker_session_vote_values', f'board/{board_id}/settings', base=self.AGILE_POKER_URL
+        )
         return [float(vote['value']) for vote in response.get('voteValues', []) if is_number(vote['value'])]
 
     def poker_session_results(self, session_id: int) -> dict[str, dict[str, dict[str, object]]]:
@@ -372,9 +755,156 @@ class CustomJira(JIRA):
         return {field: field_ids[field] for field in required_fields}
 
 
-@contextmanager
-def connect_to_jira() -> Iterator[CustomJira]:
-    """Context manager for establishing connection with Jira server."""
+class AsyncCustomJira:
+    """
+    Asyncio counterpart of `CustomJira` for fanning out many independent requests.
+
+    The requests are still sent by the wrapped (synchronous) connection, so they reuse its warm HTTP session, but they
+    are run in worker threads and awaited concurrently. The number of requests in flight is bounded with a semaphore.
+
+    Example:
+        schedules = AsyncCustomJira(conn).gather(*(jira.user_schedule(m, from_, to) for m in members))
+    """
+
+    def __init__(self, conn: CustomJira, max_concurrency: Optional[int] = None) -> None:
+        self.conn = conn
+        self.max_concurrency = max_concurrency or settings.JIRA_ASYNC_MAX_CONCURRENCY
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking request in a worker thread, respecting the concurrency limit."""
+        # The semaphore needs to be created within the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    def gather(self, *aws: Awaitable[T]) -> List[T]:
+        """
+        Run awaitables concurrently from synchronous code and return their results in the same order.
+
+        If an event loop is already running in this thread (e.g. in an async view), then the awaitables are run in a
+        private event loop in a separate thread, as `asyncio.run` cannot be nested. The caller is blocked until they
+        finish in both cases.
+        """
+
+        async def _gather() -> List[T]:
+            return list(await asyncio.gather(*aws))
+
+        self._semaphore = None
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_gather())
+
+        # The context is copied, so the requests are sent within the caller's context (e.g. its memoization scope).
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(context.run, asyncio.run, _gather()).result()
+
+    async def quickfilters(self, board_id: int) -> ResultList:
+        """Async version of `CustomJira.quickfilters`."""
+        return await self._run(self.conn.quickfilters, board_id)
+
+    async def user_schedule(self, user: str, from_: str, to: str) -> Schedule:
+        """Async version of `CustomJira.user_schedule`."""
+        return await self._run(self.conn.user_schedule, user, from_, to)
+
+    async def report(self, from_: str, to: str) -> Report:
+        """Async version of `CustomJira.report`."""
+        return await self._run(self.conn.report, from_, to)
+
+    async def worklog_list(self, worklogs: List[int]) -> List[Dict[str, str]]:
+        """Async version of `CustomJira.worklog_list`."""
+        return await self._run(self.conn.worklog_list, worklogs)
+
+    async def poker_sessions(self, board_id: int, state: str = None, name: str = None) -> list[Poker]:
+        """Async version of `CustomJira.poker_sessions`."""
+        return await self._run(self.conn.poker_sessions, board_id, state, name)
+
+    async def poker_session_results(self, session_id: int) -> dict[str, dict[str, dict[str, object]]]:
+        """Async version of `CustomJira.poker_session_results`."""
+        return await self._run(self.conn.poker_session_results, session_id)
+
+
+def _get_cache_key(endpoint: str, key_parts: tuple) -> str:
+    """Generate a cache key for the request. The request details are hashed to fit the limits of the key length."""
+    digest = hashlib.md5(repr(key_parts).encode()).hexdigest()
+    return f'{settings.CACHE_JIRA_PREFIX}{endpoint}-{digest}'
+
+
+def _get_cache_entry(endpoint: str, key: str) -> tuple[Optional[dict], bool]:
+    """
+    Retrieve the cached response along with the information whether it is fresh.
+
+    Entries stored before the last invalidation of the endpoint are ignored.
+    """
+    invalidation_key = f'{settings.CACHE_JIRA_PREFIX}{endpoint}-invalidated'
+    cached = cache.get_many([key, invalidation_key])
+    entry = cached.get(key)
+    if entry and entry['stored_at'] <= cached.get(invalidation_key, 0):
+        entry = None
+
+    fresh = bool(entry) and entry['fresh_until'] > time.time()  # type: ignore
+    if fresh:
+        _count_cache_event(endpoint, 'hit')
+    return entry, fresh
+
+
+def _set_cache_entry(
+    endpoint: str, key: str, data: Any, etag: Optional[str] = None, last_modified: Optional[str] = None
+) -> None:
+    """
+    Store the response in the cache.
+
+    The entry is kept longer than its timeout, so it can be revalidated after it becomes stale.
+    """
+    timeout = settings.CACHE_JIRA_TIMEOUTS[endpoint]
+    now = time.time()
+    entry = {
+        'data': data,
+        'etag': etag,
+        'last_modified': last_modified,
+        'stored_at': now,
+        'fresh_until': now + timeout,
+    }
+    cache.set(key, entry, timeout * settings.CACHE_JIRA_REVALIDATION_FACTOR)
+
+
+def _count_cache_event(endpoint: str, event: str) -> None:
+    """Increment the per-process counter of the cache event (`hit`, `miss` or `revalidated`)."""
+    with _cache_stats_lock:
+        _cache_stats[(endpoint, event)] += 1
+    CACHE_EVENTS.labels(endpoint, event).inc()
+
+
+def get_jira_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return cache hit/miss/revalidation counters of this process, grouped by the endpoint."""
+    result: Dict[str, Dict[str, int]] = {}
+    with _cache_stats_lock:
+        for (endpoint, event), count in _cache_stats.items():
+            result.setdefault(endpoint, {})[event] = count
+    return result
+
+
+def invalidate_jira_cache(*endpoints: str) -> None:
+    """
+    Invalidate cached responses of the specified endpoints. If no endpoints are specified, invalidate all of them.
+
+    :param endpoints: Names of the endpoints, as defined in `settings.CACHE_JIRA_TIMEOUTS`.
+    """
+    now = time.time()
+    cache.set_many(
+        {
+            f'{settings.CACHE_JIRA_PREFIX}{endpoint}-invalidated': now
+            for endpoint in endpoints or settings.CACHE_JIRA_TIMEOUTS
+        },
+        max(settings.CACHE_JIRA_TIMEOUTS.values()) * settings.CACHE_JIRA_REVALIDATION_FACTOR,
+    )
+
+
+def create_jira_connection() -> CustomJira:
+    """Establish a new connection with the Jira server."""
     conn = CustomJira(
         server=settings.JIRA_SERVER,
         basic_auth=(settings.JIRA_USERNAME, settings.JIRA_PASSWORD),
@@ -388,8 +918,123 @@ def connect_to_jira() -> Iterator[CustomJira]:
             },
         },
     )
-    yield conn
-    conn.close()
+    return conn
+
+
+class JiraConnectionPool:
+    """
+    Process-wide pool of warm Jira connections.
+
+    Creating `CustomJira` is expensive (new session, TLS handshake, `serverInfo` and `field` requests), so idle
+    connections are kept here and reused by the next `connect_to_jira` call. The pool never blocks - if all connections
+    are checked out, a new one is created, and it is closed on release when there are already `size` idle connections.
+
+    A connection is checked out once per thread, so nested `connect_to_jira` calls (e.g. `refresh_sprint_calendar`
+    invoked within a task) reuse the connection of the outer block.
+
+    Idle connections are verified with a lightweight request if they have not been used for longer than
+    `health_check_interval` seconds.
+    """
+
+    def __init__(self, size: int, health_check_interval: int) -> None:
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._idle: list[tuple[CustomJira, float]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    def _reset_after_fork(self) -> None:
+        """Sockets cannot be shared with the parent process (e.g. after Celery forks its workers)."""
+        if self._pid != os.getpid():
+            with self._lock:
+                self._idle = []
+                self._local = threading.local()
+                self._pid = os.getpid()
+
+    def _is_healthy(self, conn: CustomJira, last_used: float) -> bool:
+        """Check whether the idle connection can still be used."""
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.server_info()
+        except (JIRAError, RequestException):
+            return False
+        return True
+
+    def _acquire(self) -> CustomJira:
+        """Retrieve a healthy idle connection or create a new one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+
+            if self._is_healthy(conn, last_used):
+                return conn
+            conn.close()
+
+        return create_jira_connection()
+
+    def _release(self, conn: CustomJira, discard: bool = False) -> None:
+        """Return the connection to the pool or close it if the pool is full."""
+        with self._lock:
+            if not discard and len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[CustomJira]:
+        """Check out a connection for the current thread."""
+        self._reset_after_fork()
+        if (conn := getattr(self._local, 'conn', None)) is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        discard = False
+        try:
+            yield conn
+        except RequestException:
+            # The connection might be broken, so we should not reuse it.
+            discard = True
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn, discard)
+
+    def clear(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _last_used in idle:
+            conn.close()
+
+
+_pool: Optional[JiraConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_jira_connection_pool() -> JiraConnectionPool:
+    """Lazily create the connection pool, so the settings can be overridden before the first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JiraConnectionPool(
+                    settings.JIRA_CONNECTION_POOL_SIZE,
+                    settings.JIRA_CONNECTION_HEALTH_CHECK_SECONDS,
+                )
+    return _pool
+
+
+@contextmanager
+def connect_to_jira() -> Iterator[CustomJira]:
+    """Context manager for retrieving a pooled connection with Jira server."""
+    with get_jira_connection_pool().connection() as conn:
+        yield conn
 
 
 def chunks(lst: List, n: int) -> Iterator[List]:
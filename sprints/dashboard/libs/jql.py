@@ -0,0 +1,244 @@
+"""
+Builder of canonical JQL queries.
+
+The same query is always rendered in the same way (e.g. the values of `IN` clauses are deduplicated and sorted), so it
+can be fingerprinted for caching its results, and registered as a saved Jira filter. Long queries (e.g. the ones with
+lists of sprint IDs) can then be replaced with `filter = ID`, which keeps the request URLs short.
+"""
+import hashlib
+import itertools
+import re
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    TypeVar,
+    Union,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+from jira import JIRA
+from jira.exceptions import JIRAError
+
+Value = Union[str, int]
+T = TypeVar('T')
+
+# Field names that can be used in JQL without quotes.
+_PLAIN_FIELD_REGEX = re.compile(r'^[A-Za-z_][\w.]*$')
+
+
+class Function(str):
+    """JQL function call (e.g. `openSprints()`), which is inserted into the query without quotes."""
+
+
+class And(str):
+    """Conjunction of the clauses."""
+
+
+class Or(str):
+    """Disjunction of the clauses."""
+
+
+def quote(value: Value) -> str:
+    """Render the value, quoting and escaping it if it is a string."""
+    if isinstance(value, (int, Function)):
+        return str(value)
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def field(name: str) -> str:
+    """Render the name of the field, quoting it only when necessary (e.g. for `Story Points`)."""
+    return name if _PLAIN_FIELD_REGEX.match(name) else quote(name)
+
+
+def eq(name: str, value: Value) -> str:
+    """Match the value."""
+    return f'{field(name)} = {quote(value)}'
+
+
+def ne(name: str, value: Value) -> str:
+    """Match anything but the value."""
+    return f'{field(name)} != {quote(value)}'
+
+
+def ge(name: str, value: Value) -> str:
+    """Match the values greater than or equal to the value (e.g. `updated >= "-5m"`)."""
+    return f'{field(name)} >= {quote(value)}'
+
+
+def contains(name: str, value: Value) -> str:
+    """Match the text (e.g. the summary) containing the value."""
+    return f'{field(name)} ~ {quote(value)}'
+
+
+def is_empty(name: str) -> str:
+    """Match the issues without the value of the field."""
+    return f'{field(name)} is EMPTY'
+
+
+def in_(name: str, values: Union[Iterable[Value], Function]) -> str:
+    """
+    Match any of the values. The values are deduplicated and sorted, so their order does not change the query.
+
+    :raises ValueError if no values were specified, as JQL does not allow empty lists
+    """
+    return f'{field(name)} IN {_render_list(values)}'
+
+
+def not_in(name: str, values: Union[Iterable[Value], Function]) -> str:
+    """Match none of the values. See `in_`."""
+    return f'{field(name)} NOT IN {_render_list(values)}'
+
+
+def and_(*clauses: str) -> And:
+    """Combine the clauses with `AND`. Empty clauses are skipped."""
+    return And(' AND '.join(f'({clause})' if isinstance(clause, Or) else clause for clause in clauses if clause))
+
+
+def or_(*clauses: str) -> Or:
+    """Combine the clauses with `OR`. Empty clauses are skipped."""
+    return Or(' OR '.join(f'({clause})' if isinstance(clause, And) else clause for clause in clauses if clause))
+
+
+def group(query: str) -> str:
+    """Parenthesize the query (e.g. an arbitrary JQL string), so it can be safely combined with other clauses."""
+    return f'({query})' if query else query
+
+
+def in_chunks(name: str, values: Iterable[Value], max_length: int = 0) -> Iterator[str]:
+    """
+    Split the `IN` clause into clauses not longer than `max_length`. Use it for the queries with long lists of values
+    (e.g. issue IDs), which would exceed the limits of the request size.
+
+    :param max_length: Maximum length of each clause. Defaults to `settings.JIRA_MAX_JQL_LENGTH`.
+    """
+    max_length = max_length or settings.JIRA_MAX_JQL_LENGTH
+    chunk: list = []
+    length = len(in_(name, ['']))
+    for value in _sort_values(values):
+        value_length = len(quote(value)) + 1  # +1 for the separator.
+        if chunk and length + value_length > max_length:
+            yield in_(name, chunk)
+            chunk, length = [], len(in_(name, ['']))
+        chunk.append(value)
+        length += value_length
+    if chunk:
+        yield in_(name, chunk)
+
+
+def fingerprint(query: str, fields: Iterable[str] = ()) -> str:
+    """Get the fingerprint of the query and the retrieved fields, for identifying its cached results."""
+    return hashlib.sha1('\n'.join([query, *sorted(fields)]).encode()).hexdigest()
+
+
+def saved_filter(conn: JIRA, name: str, query: str) -> str:
+    """
+    Get the `filter = ID` query for the saved filter with the specified query, creating the filter if necessary.
+
+    Each version of the query (e.g. after the sprints have changed) gets its own filter, so the filters are never
+    modified while they can be used by other processes. The filters of the previous versions are deleted, so they do not
+    pile up in Jira. The IDs of the filters are stored in the cache. Use `search_saved_filter` for running the searches,
+    as it handles the filters deleted in the meantime.
+
+    If the saved filters are disabled with `settings.JIRA_SAVED_FILTERS`, or the filter cannot be created, the original
+    query is returned.
+
+    :param name: Name describing the purpose of the query. Use it only for queries with a limited number of versions
+        (e.g. not for the queries specific to a user).
+    """
+    if not settings.JIRA_SAVED_FILTERS:
+        return query
+
+    query_fingerprint = fingerprint(query)
+    cache_key = _get_filter_cache_key(query)
+    if (filter_id := cache.get(cache_key)) is None:
+        try:
+            filter_id = _get_or_create_filter(
+                conn, f'{settings.JIRA_SAVED_FILTER_PREFIX}{name}', query_fingerprint[:12], query
+            )
+        except JIRAError:
+            return query
+        cache.set(cache_key, filter_id, settings.CACHE_JQL_FILTER_TIMEOUT)
+    return eq('filter', filter_id)
+
+
+def search_saved_filter(conn: JIRA, name: str, query: str, search: Callable[[str], Iterable[T]]) -> Iterator[T]:
+    """
+    Run the search with the saved filter (see `saved_filter`).
+
+    If the filter cannot be used (e.g. it has been deleted in Jira, even while the pages of the results were being
+    retrieved), its cached ID is dropped and the search continues with the original query instead.
+
+    :param search: Callable running the search with the specified JQL string, e.g. `conn.search_issues_iter`.
+    """
+    filter_query = saved_filter(conn, name, query)
+    if filter_query == query:
+        return iter(search(query))
+    try:
+        results = iter(search(filter_query))
+    except JIRAError:
+        cache.delete(_get_filter_cache_key(query))
+        return iter(search(query))
+    return _fall_back_to_query(results, query, search)
+
+
+def _fall_back_to_query(results: Iterator[T], query: str, search: Callable[[str], Iterable[T]]) -> Iterator[T]:
+    """
+    Yield the results. If retrieving any of them fails, continue with the results of the original query, skipping the
+    ones that have already been yielded. The filter is based on the same query, so the results have the same order.
+    """
+    yielded = 0
+    while True:
+        try:
+            result = next(results)
+        except StopIteration:
+            return
+        except JIRAError:
+            cache.delete(_get_filter_cache_key(query))
+            yield from itertools.islice(search(query), yielded, None)
+            return
+        yield result
+        yielded += 1
+
+
+def _get_filter_cache_key(query: str) -> str:
+    return f'{settings.CACHE_JQL_FILTER_PREFIX}{fingerprint(query)}'
+
+
+def _get_or_create_filter(conn: JIRA, name: str, version: str, query: str) -> int:
+    """
+    Get ID of the saved filter with the version of the query, reusing the one created by other processes (e.g. if the
+    cache has been cleared). The filters with the other versions of the query are deleted.
+    """
+    filter_id = None
+    superseded = []
+    version_regex = re.compile(fr'^{re.escape(name)} [0-9a-f]{{{len(version)}}}$')
+    for saved in conn.favourite_filters():
+        if saved.name == f'{name} {version}':
+            filter_id = int(saved.id)
+        elif version_regex.match(saved.name):
+            superseded.append(saved)
+
+    if filter_id is None:
+        filter_id = int(conn.create_filter(name=f'{name} {version}', jql=query, favourite=True).id)
+    for saved in superseded:
+        try:
+            saved.delete()
+        except JIRAError:
+            pass  # The filter has been deleted by another process.
+    return filter_id
+
+
+def _render_list(values: Union[Iterable[Value], Function]) -> str:
+    if isinstance(values, Function):
+        return values
+    rendered = _sort_values(values)
+    if not rendered:
+        raise ValueError("The list of values cannot be empty.")
+    return '(' + ','.join(quote(value) for value in rendered) + ')'
+
+
+def _sort_values(values: Iterable[Value]) -> list:
+    return sorted(set(values), key=lambda value: (isinstance(value, str), value))
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.cache import cache
 from mattermostdriver import Driver
 from requests import HTTPError
 
@@ -33,14 +34,24 @@ class Mattermost:
         """
         Function that helps to get mattermost usernames from emails.
 
+        The usernames are cached, so only the unknown emails are looked up in Mattermost.
+
         :param emails: Emails of the users.
         :return: Mattermost usernames of the users.
         """
+        keys = {email: f'{settings.CACHE_MATTERMOST_USERNAME_PREFIX}{email}' for email in emails}
+        cached_usernames = cache.get_many(keys.values())
+
         usernames = []
+        new_usernames = {}
         for email in emails:
+            if username := cached_usernames.get(keys[email]):
+                usernames.append(username)
+                continue
             try:
                 username = self.mattermost_connection.users.get_user_by_email(email).get('username')
                 usernames.append(username)
+                new_usernames[keys[email]] = username
             except HTTPError as e:
                 # Log exception to Sentry if call fails, but do not break the server.
                 if not settings.DEBUG:
@@ -48,6 +59,7 @@ class Mattermost:
                     from sentry_sdk import capture_exception
                     capture_exception(e)
 
+        cache.set_many(new_usernames, settings.CACHE_USER_DIRECTORY_TIMEOUT)
         return usernames
 
     def post_message_to_channel(self, channel_name: str, message: str) -> None:
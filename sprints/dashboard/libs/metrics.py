@@ -0,0 +1,193 @@
+import contextvars
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import (
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+)
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from requests import (
+    PreparedRequest,
+    Response,
+)
+from requests.adapters import HTTPAdapter
+
+UNKNOWN_CALLER = 'unknown'
+
+REQUEST_LABELS = ('endpoint', 'method', 'caller')
+
+REQUEST_DURATION = Histogram(
+    'jira_request_duration_seconds',
+    "Duration of the requests sent to Jira and its plugins.",
+    REQUEST_LABELS,
+    buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60),
+)
+REQUEST_COUNT = Counter(
+    'jira_requests_total',
+    "Number of the requests sent to Jira and its plugins.",
+    REQUEST_LABELS + ('status',),
+)
+RESPONSE_SIZE = Histogram(
+    'jira_response_size_bytes',
+    "Size of the responses received from Jira and its plugins.",
+    REQUEST_LABELS,
+    buckets=(1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7),
+)
+REQUEST_ERRORS = Counter(
+    'jira_request_errors_total',
+    "Number of the failed requests (connection errors and HTTP 4xx/5xx responses) sent to Jira and its plugins.",
+    REQUEST_LABELS + ('error',),
+)
+CACHE_EVENTS = Counter(
+    'jira_cache_events_total',
+    "Number of the cache hits, misses and revalidations of the cached Jira responses.",
+    ('endpoint', 'event'),
+)
+THROTTLED_REQUESTS = Counter(
+    'jira_throttled_requests_total',
+    "Number of the requests throttled by Jira and retried after a backoff.",
+    ('endpoint_class', 'caller'),
+)
+DASHBOARD_STEP_DURATION = Histogram(
+    'dashboard_step_duration_seconds',
+    "Duration of the steps of retrieving the data of the sprint dashboard.",
+    ('step',),
+    buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60),
+)
+
+# Prefix of the REST API paths, containing the API name and version (e.g. `/rest/api/2`). It is not normalized.
+ENDPOINT_PREFIX_PATTERN = re.compile(r'^(/rest/[^/]+/[^/]+)?(.*)$')
+# Patterns replacing IDs in the paths, so the number of the endpoint labels is bounded.
+ENDPOINT_PATTERNS = (
+    (re.compile(r'/[A-Z][A-Z0-9_]+-\d+(?=/|$)'), '/{key}'),  # Issue keys, e.g. `SE-1234`.
+    (re.compile(r'/\d+(?=/|$)'), '/{id}'),
+)
+
+# Threads started by the thread pools do not inherit the context, so their requests are tagged only when they are run
+# within its copy (like the steps of `DependencyGraph` and the functions wrapped with `scope.in_current_context`).
+_caller: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('jira_caller', default=None)
+# Tokens of the callers set by the tasks, with task IDs as keys.
+_task_tokens: Dict[str, contextvars.Token] = {}
+
+
+def get_caller() -> str:
+    """Return the name of the task or view sending the request."""
+    return _caller.get() or UNKNOWN_CALLER
+
+
+def set_caller(caller: Optional[str]) -> contextvars.Token:
+    """Tag the following requests with the name of the task or view."""
+    return _caller.set(caller)
+
+
+def reset_caller(token: contextvars.Token) -> None:
+    """Restore the caller set before the `set_caller` call that returned the `token`."""
+    _caller.reset(token)
+
+
+@contextmanager
+def tag_caller(name: str) -> Iterator[None]:
+    """Tag the requests sent within the context with the specified name."""
+    token = set_caller(name)
+    try:
+        yield
+    finally:
+        reset_caller(token)
+
+
+def get_endpoint(url: str) -> str:
+    """Strip the server and IDs from the URL."""
+    prefix, path = ENDPOINT_PREFIX_PATTERN.match(urlsplit(url).path).groups()  # type: ignore
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f'{prefix or ""}{path}'
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """HTTP adapter collecting the Prometheus metrics of each request."""
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore
+        labels: Tuple[str, str, str] = (get_endpoint(request.url or ''), request.method or '', get_caller())
+        start = time.perf_counter()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except Exception as e:
+            REQUEST_ERRORS.labels(*labels, type(e).__name__).inc()
+            raise
+        finally:
+            REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - start)
+
+        REQUEST_COUNT.labels(*labels, response.status_code).inc()
+        if response.status_code >= 400:
+            REQUEST_ERRORS.labels(*labels, response.status_code).inc()
+        size = response.headers.get('Content-Length')
+        if size is None and not kwargs.get('stream'):
+            size = len(response.content)
+        if size is not None:
+            RESPONSE_SIZE.labels(*labels).observe(int(size))
+        return response
+
+
+def generate_metrics() -> Tuple[bytes, str]:
+    """
+    Render the metrics in the Prometheus text format.
+
+    When the `prometheus_multiproc_dir` environment variable is set, the metrics of all processes sharing this directory
+    are aggregated. This includes the Celery workers, which do not expose their metrics themselves, so in production
+    the directory is a volume shared by the Django and Celery containers (see `production.yml`). Otherwise, only the
+    metrics of the current process are included.
+    """
+    if 'prometheus_multiproc_dir' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class JiraCallerMiddleware:
+    """Tag the Jira requests sent while handling the request with the name of the view."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if token := getattr(request, '_jira_caller_token', None):
+            reset_caller(token)
+        return response
+
+    # noinspection PyMethodMayBeStatic
+    def process_view(self, request, _view_func, _view_args, _view_kwargs) -> None:
+        request._jira_caller_token = set_caller(request.resolver_match.view_name)
+
+
+@task_prerun.connect
+def _set_task_caller(task_id: str = None, task=None, **_kwargs) -> None:
+    if task_id:
+        _task_tokens[task_id] = set_caller(task.name if task else None)
+
+
+@task_postrun.connect
+def _reset_task_caller(task_id: str = None, **_kwargs) -> None:
+    # Tasks run eagerly by other tasks (e.g. with `group(...).apply()`) restore the caller of the outer task.
+    if token := _task_tokens.pop(task_id, None):
+        reset_caller(token)
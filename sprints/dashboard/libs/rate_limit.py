@@ -0,0 +1,221 @@
+import abc
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from requests import (
+    PreparedRequest,
+    Response,
+)
+
+from sprints.dashboard.libs.metrics import (
+    THROTTLED_REQUESTS,
+    InstrumentedAdapter,
+    get_caller,
+)
+
+# Status codes returned by Jira when it throttles the requests. The server errors (e.g. 503) are not included, as they
+# are already retried by `jira.resilientsession.ResilientSession`. Retrying them here too would multiply the attempts.
+THROTTLING_STATUS_CODES = {429}
+
+# Endpoint classes with separate budgets, matched against the request's path.
+ENDPOINT_CLASSES = (
+    ('search', re.compile(r'/rest/api/\d+/search')),
+    ('tempo', re.compile(r'/rest/tempo-')),
+    ('poker', re.compile(r'/rest/pokerng/')),
+)
+DEFAULT_ENDPOINT_CLASS = 'default'
+
+# Atomically refills the bucket and takes a token from it. Returns the number of seconds to wait before retrying, or 0
+# if the token has been acquired. Numbers are returned as strings, because Redis truncates Lua numbers to integers.
+ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at', 'blocked_until')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+if blocked_until > now then
+    return tostring(blocked_until - now)
+end
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+# Pauses all requests of the endpoint class until the specified time, unless they are already paused for longer.
+BLOCK_SCRIPT = """
+local blocked_until = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+if tonumber(ARGV[1]) > blocked_until then
+    redis.call('HSET', KEYS[1], 'blocked_until', ARGV[1])
+    redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])) + 60)
+end
+"""
+
+
+def get_endpoint_class(url: str) -> str:
+    """Determine the budget used by the request."""
+    for endpoint_class, pattern in ENDPOINT_CLASSES:
+        if pattern.search(url):
+            return endpoint_class
+    return DEFAULT_ENDPOINT_CLASS
+
+
+def _get_budget(endpoint_class: str) -> Tuple[float, float]:
+    """Return the number of requests per second and the burst size of the endpoint class."""
+    return settings.JIRA_RATE_LIMITS.get(endpoint_class, settings.JIRA_RATE_LIMITS[DEFAULT_ENDPOINT_CLASS])
+
+
+class RateLimiter(abc.ABC):
+    """Token bucket rate limiter with separate buckets for each endpoint class."""
+
+    def acquire(self, endpoint_class: str) -> None:
+        """Block until the request of the endpoint class is allowed."""
+        while (wait := self._try_acquire(endpoint_class)) > 0:
+            time.sleep(wait)
+
+    @abc.abstractmethod
+    def block(self, endpoint_class: str, seconds: float) -> None:
+        """Pause all requests of the endpoint class, e.g. when the server asked to retry after a specified time."""
+
+    @abc.abstractmethod
+    def _try_acquire(self, endpoint_class: str) -> float:
+        """Take a token from the bucket. Return the number of seconds to wait if the bucket is empty."""
+
+
+class RedisRateLimiter(RateLimiter):
+    """Rate limiter sharing the buckets between all processes via Redis."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+        self._acquire = client.register_script(ACQUIRE_SCRIPT)
+        self._block = client.register_script(BLOCK_SCRIPT)
+
+    def block(self, endpoint_class: str, seconds: float) -> None:
+        self._block(keys=[self._get_key(endpoint_class)], args=[time.time() + seconds, seconds])
+
+    def _try_acquire(self, endpoint_class: str) -> float:
+        rate, capacity = _get_budget(endpoint_class)
+        return float(self._acquire(keys=[self._get_key(endpoint_class)], args=[rate, capacity, time.time()]))
+
+    @staticmethod
+    def _get_key(endpoint_class: str) -> str:
+        return f'{settings.CACHE_JIRA_RATE_LIMIT_PREFIX}{endpoint_class}'
+
+
+class LocalRateLimiter(RateLimiter):
+    """Process-wide rate limiter, used when the cache backend is not Redis (e.g. in tests and local development)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Endpoint class: (tokens, updated_at, blocked_until)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+
+    def block(self, endpoint_class: str, seconds: float) -> None:
+        with self._lock:
+            tokens, updated_at, blocked_until = self._get_bucket(endpoint_class)
+            self._buckets[endpoint_class] = (tokens, updated_at, max(blocked_until, time.time() + seconds))
+
+    def _try_acquire(self, endpoint_class: str) -> float:
+        rate, capacity = _get_budget(endpoint_class)
+        now = time.time()
+        with self._lock:
+            tokens, updated_at, blocked_until = self._get_bucket(endpoint_class)
+            if blocked_until > now:
+                return blocked_until - now
+
+            tokens = min(capacity, tokens + max(now - updated_at, 0) * rate)
+            wait = 0.
+            if tokens < 1:
+                wait = (1 - tokens) / rate
+            else:
+                tokens -= 1
+            self._buckets[endpoint_class] = (tokens, now, blocked_until)
+            return wait
+
+    def _get_bucket(self, endpoint_class: str) -> Tuple[float, float, float]:
+        _rate, capacity = _get_budget(endpoint_class)
+        return self._buckets.get(endpoint_class, (capacity, time.time(), 0.))
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the rate limiter shared by all Jira connections."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                try:
+                    _rate_limiter = RedisRateLimiter(get_redis_connection())
+                except NotImplementedError:
+                    _rate_limiter = LocalRateLimiter()
+    return _rate_limiter
+
+
+def get_retry_delay(response: Response, attempt: int) -> float:
+    """
+    Determine how long to wait before retrying the throttled request.
+
+    The `Retry-After` header is respected when it is present. Otherwise, an exponential backoff with a full jitter is
+    used, so the retries from different workers are spread in time.
+    """
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = 0
+        if delay > 0:
+            return min(delay, settings.JIRA_RATE_LIMIT_MAX_BACKOFF)
+
+    delay = min(settings.JIRA_RATE_LIMIT_BACKOFF * 2 ** attempt, settings.JIRA_RATE_LIMIT_MAX_BACKOFF)
+    return random.uniform(delay / 2, delay)
+
+
+class RateLimitedAdapter(InstrumentedAdapter):
+    """
+    HTTP adapter throttling the requests with the shared rate limiter.
+
+    Throttled requests (HTTP 429) are retried after a backoff. The backoff is applied to all requests of the
+    endpoint class, so the other workers slow down too instead of getting throttled as well.
+    """
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore
+        rate_limiter = get_rate_limiter()
+        endpoint_class = get_endpoint_class(request.url or '')
+
+        attempt = 0
+        while True:
+            rate_limiter.acquire(endpoint_class)
+            response = super().send(request, *args, **kwargs)
+            if response.status_code not in THROTTLING_STATUS_CODES or attempt >= settings.JIRA_RATE_LIMIT_RETRIES:
+                return response
+
+            THROTTLED_REQUESTS.labels(endpoint_class, get_caller()).inc()
+            delay = get_retry_delay(response, attempt)
+            rate_limiter.block(endpoint_class, delay)
+            response.close()
+            attempt += 1
@@ -0,0 +1,167 @@
+"""
+Record and replay the HTTP exchanges with Jira (including Tempo and Agile Poker) and Google APIs.
+
+With `HTTP_REPLAY_MODE=record` the responses of the real services are saved as fixtures in `HTTP_REPLAY_FIXTURES_DIR`.
+With `HTTP_REPLAY_MODE=replay` the responses are served from these fixtures, without accessing the network. This makes
+it possible to profile the whole pipeline (e.g. `Dashboard`, `SustainabilityDashboard` or `complete_sprint_task`)
+reproducibly. `HTTP_REPLAY_LATENCY` and `HTTP_REPLAY_LATENCY_JITTER` can be used for simulating the network latency.
+
+Note: the fixtures contain real data from the services, so they should not be committed to the public repository.
+"""
+import hashlib
+import json
+import os
+import random
+import time
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import httplib2
+from django.conf import settings
+from requests import (
+    PreparedRequest,
+    Response,
+)
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from sprints.dashboard.libs.metrics import InstrumentedAdapter
+from sprints.dashboard.libs.rate_limit import RateLimitedAdapter
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Response headers that are not stored, because the content is stored decoded or they contain session data.
+IGNORED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+class MissingFixtureError(Exception):
+    """Raised when the replayed request has not been recorded."""
+
+
+def _get_fixture_path(service: str, method: str, url: str, body: Optional[Union[str, bytes]]) -> str:
+    """Determine the fixture file of the request."""
+    if isinstance(body, str):
+        body = body.encode()
+    digest = hashlib.sha1(f'{method} {url}\n'.encode() + (body or b'')).hexdigest()
+    return os.path.join(settings.HTTP_REPLAY_FIXTURES_DIR, service, f'{digest}.json')
+
+
+def save_fixture(
+    service: str,
+    method: str,
+    url: str,
+    body: Optional[Union[str, bytes]],
+    status: int,
+    headers: Dict[str, str],
+    content: bytes,
+) -> None:
+    """Store the response of the request."""
+    path = _get_fixture_path(service, method, url, body)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fixture = {
+        # The request details are stored only for making the fixtures easier to inspect.
+        'method': method,
+        'url': url,
+        'status': status,
+        'headers': {name: value for name, value in headers.items() if name.lower() not in IGNORED_HEADERS},
+        'content': content.decode('utf-8', errors='surrogateescape'),
+    }
+    with open(path, 'w') as f:
+        json.dump(fixture, f, indent=2)
+
+
+def load_fixture(service: str, method: str, url: str, body: Optional[Union[str, bytes]]) -> Dict[str, Any]:
+    """
+    Load the recorded response of the request and wait for the simulated latency.
+
+    :raises MissingFixtureError: if the request has not been recorded.
+    """
+    path = _get_fixture_path(service, method, url, body)
+    try:
+        with open(path) as f:
+            fixture = json.load(f)
+    except FileNotFoundError:
+        raise MissingFixtureError(f"No recorded response for {method} {url} ({path}).")
+
+    if latency := settings.HTTP_REPLAY_LATENCY + random.uniform(0, settings.HTTP_REPLAY_LATENCY_JITTER):
+        time.sleep(latency)
+    fixture['content'] = fixture['content'].encode('utf-8', errors='surrogateescape')
+    return fixture
+
+
+class RecordingAdapter(RateLimitedAdapter):
+    """HTTP adapter saving the responses received from Jira as fixtures."""
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore
+        response = super().send(request, *args, **kwargs)
+        save_fixture(
+            'jira',
+            request.method or '',
+            request.url or '',
+            request.body,
+            response.status_code,
+            dict(response.headers),
+            response.content,
+        )
+        return response
+
+
+class _ReplayTransport(HTTPAdapter):
+    """HTTP adapter serving the recorded responses instead of sending the requests."""
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore
+        fixture = load_fixture('jira', request.method or '', request.url or '', request.body)
+        response = Response()
+        response.status_code = fixture['status']
+        response.headers = CaseInsensitiveDict(fixture['headers'])
+        response._content = fixture['content']
+        response.encoding = 'utf-8'
+        response.url = request.url or ''
+        response.request = request
+        return response
+
+
+class ReplayAdapter(InstrumentedAdapter, _ReplayTransport):
+    """Instrumented HTTP adapter serving the recorded Jira responses."""
+
+
+def get_jira_adapter(**kwargs) -> HTTPAdapter:
+    """Return the HTTP adapter for the Jira connection, depending on `HTTP_REPLAY_MODE`."""
+    if settings.HTTP_REPLAY_MODE == RECORD:
+        return RecordingAdapter(**kwargs)
+    if settings.HTTP_REPLAY_MODE == REPLAY:
+        return ReplayAdapter(**kwargs)
+    return RateLimitedAdapter(**kwargs)
+
+
+class RecordingHttp:
+    """Wrapper of the `httplib2.Http`-like object saving the responses received from Google APIs as fixtures."""
+
+    def __init__(self, http) -> None:
+        self.http = http
+
+    def request(self, uri: str, method: str = 'GET', body=None, headers=None, **kwargs) -> Tuple[Any, bytes]:
+        response, content = self.http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        save_fixture('google', method, uri, body, response.status, dict(response), content)
+        return response, content
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.http, item)
+
+
+class ReplayHttp:
+    """`httplib2.Http` replacement serving the recorded Google API responses."""
+
+    def request(self, uri: str, method: str = 'GET', body=None, headers=None, **kwargs) -> Tuple[Any, bytes]:
+        fixture = load_fixture('google', method, uri, body)
+        response = httplib2.Response({**fixture['headers'], 'status': fixture['status']})
+        return response, fixture['content']
+
+    def close(self) -> None:
+        pass
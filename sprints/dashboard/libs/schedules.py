@@ -0,0 +1,82 @@
+import time
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Dict,
+    Iterable,
+    Tuple,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+
+from sprints.dashboard.libs.jira import (
+    AsyncCustomJira,
+    CustomJira,
+)
+
+
+def get_schedule_range(sprint_start: str, sprint_end: str) -> Tuple[str, str]:
+    """
+    Get the range of the schedules retrieved for the sprint. It contains one extra day on each end of the sprint, so the
+    commitments can be calculated for different timezones.
+    """
+    date_format = settings.JIRA_API_DATE_FORMAT
+    return (
+        (datetime.strptime(sprint_start, date_format) - timedelta(days=1)).strftime(date_format),
+        (datetime.strptime(sprint_end, date_format) + timedelta(days=1)).strftime(date_format),
+    )
+
+
+def get_user_schedules(
+    conn: CustomJira,
+    users: Iterable[str],
+    from_: str,
+    to: str,
+    sprint_start: str,
+) -> Dict[str, Dict]:
+    """
+    Retrieve the users' commitments `from_` the date `to` another date (both inclusive).
+
+    The schedules are shared by the dashboards of all cells, so each of them is cached until the start of the sprint
+    (but not longer than `settings.CACHE_SCHEDULE_TIMEOUT`). The missing ones are retrieved concurrently.
+
+    :param sprint_start: Start date of the sprint, for which the schedules are retrieved.
+    :returns commitments of each user, in the `{user: {'total': seconds, 'days': {date: seconds}}}` format
+    """
+    users = list(dict.fromkeys(users))
+    keys = {user: _get_cache_key(user, from_, to) for user in users}
+    cached = cache.get_many(keys.values())
+    schedules = {user: cached[key] for user, key in keys.items() if key in cached}
+
+    if missing := [user for user in users if user not in schedules]:
+        async_conn = AsyncCustomJira(conn)
+        retrieved = async_conn.gather(*(async_conn.user_schedule(user, from_, to) for user in missing))
+        new_schedules = {
+            user: {
+                'total': schedule.requiredSeconds,
+                'days': {day.date: day.requiredSeconds for day in schedule.days},
+            }
+            for user, schedule in zip(missing, retrieved)
+        }
+        if (timeout := _get_timeout(sprint_start)) > 0:
+            cache.set_many({keys[user]: schedule for user, schedule in new_schedules.items()}, timeout)
+        schedules.update(new_schedules)
+
+    return schedules
+
+
+def _get_cache_key(user: str, from_: str, to: str) -> str:
+    return f'{settings.CACHE_SCHEDULE_PREFIX}{user}-{from_}-{to}'
+
+
+def _get_timeout(sprint_start: str) -> int:
+    """Get the number of seconds until the start of the sprint, limited to `settings.CACHE_SCHEDULE_TIMEOUT`."""
+    start = datetime.strptime(
+        f'{sprint_start} {settings.SPRINT_START_TIME_UTC}', f'{settings.JIRA_API_DATE_FORMAT} %H:%M'
+    )
+    remaining = start.replace(tzinfo=timezone.utc).timestamp() - time.time()
+    return int(min(remaining, settings.CACHE_SCHEDULE_TIMEOUT))
@@ -0,0 +1,120 @@
+"""
+Memoization scoped to a single Celery task or HTTP request.
+
+Data that is expensive to retrieve, but is expected to change rarely (e.g. the sprints of the boards), can be memoized
+for the duration of the task or request, so it is retrieved only once, regardless of how many functions need it.
+Outside of these scopes (and in threads started by the thread pools, which do not inherit the context, unless they are
+run within its copy, like the steps of `DependencyGraph` and the functions wrapped with `in_current_context`), nothing
+is memoized.
+"""
+import contextvars
+import functools
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+)
+
+_scope: contextvars.ContextVar[Optional[Dict[str, Dict[Any, Any]]]] = contextvars.ContextVar(
+    'memoization_scope', default=None
+)
+# Tokens of the scopes entered by the tasks, with task IDs as keys.
+_task_tokens: Dict[str, contextvars.Token] = {}
+# Name of the memo holding the locks of the other ones.
+_LOCKS_MEMO = '__locks__'
+
+T = TypeVar('T')
+
+
+@contextmanager
+def memoization_scope() -> Iterator[None]:
+    """Memoize the data within the context. Nested scopes share the memoized data with the outermost one."""
+    if _scope.get() is not None:
+        yield
+        return
+
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def get_memo(name: str) -> Optional[Dict[Any, Any]]:
+    """Return the memoized data with the specified name, or `None` outside of the memoization scope."""
+    scope = _scope.get()
+    if scope is None:
+        return None
+    return scope.setdefault(name, {})
+
+
+def clear_memo(name: str) -> None:
+    """Forget the memoized data, e.g. after modifying it."""
+    if (scope := _scope.get()) is not None:
+        scope.pop(name, None)
+
+
+@contextmanager
+def memo_lock(name: str) -> Iterator[None]:
+    """
+    Hold the lock of the memoized data while retrieving it, so the threads sharing the scope (e.g. the ones run within
+    its copy) do not retrieve the same data concurrently. Outside of the memoization scope, this does nothing.
+    """
+    scope = _scope.get()
+    if scope is None:
+        yield
+        return
+
+    # `dict.setdefault` is atomic, so all threads get the same lock.
+    with scope.setdefault(_LOCKS_MEMO, {}).setdefault(name, threading.Lock()):
+        yield
+
+
+def in_current_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap the function, so it is run within a copy of the current context, even when it is called by the threads of a
+    thread pool. This way, they share the memoization scope and tag the Jira requests with the caller's name.
+
+    Each call gets its own copy, as a context cannot be entered by multiple threads at once.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+class MemoizationScopeMiddleware:
+    """Memoize the data within the request."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with memoization_scope():
+            return self.get_response(request)
+
+
+@task_prerun.connect
+def _enter_task_scope(task_id: str = None, **_kwargs) -> None:
+    # Tasks run eagerly by other tasks (e.g. with `group(...).apply()`) share the scope of the outer task.
+    if task_id and _scope.get() is None:
+        _task_tokens[task_id] = _scope.set({})
+
+
+@task_postrun.connect
+def _exit_task_scope(task_id: str = None, **_kwargs) -> None:
+    if token := _task_tokens.pop(task_id, None):
+        _scope.reset(token)
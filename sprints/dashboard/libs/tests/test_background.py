@@ -0,0 +1,31 @@
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+from django.core.cache import cache
+
+from sprints.dashboard.libs.background import run_in_background_once
+
+LOCK = 'test_lock'
+
+
+@patch("sprints.dashboard.libs.background.threading.Thread")
+def test_run_in_background_once(mock_thread: Mock):
+    cache.delete(LOCK)
+    func = Mock()
+
+    assert run_in_background_once(LOCK, 60, func)
+    assert cache.get(LOCK)
+    # Another process is already running the function.
+    assert not run_in_background_once(LOCK, 60, func)
+    mock_thread.return_value.start.assert_called_once()
+
+    # The lock is released after the function finishes, even if it fails.
+    func.side_effect = ValueError
+    try:
+        mock_thread.call_args.kwargs['target']()
+    except ValueError:
+        pass
+    func.assert_called_once()
+    assert cache.get(LOCK) is None
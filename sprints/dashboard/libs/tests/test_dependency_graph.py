@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from sprints.dashboard.libs.dependency_graph import DependencyGraph
+from sprints.dashboard.libs.scope import (
+    get_memo,
+    memoization_scope,
+)
+
+
+def test_dependency_graph_runs_independent_steps_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def step(name, wait=False):
+        def run():
+            if wait:
+                barrier.wait()  # Both steps need to be running at the same time.
+            order.append(name)
+            return name
+        return run
+
+    graph = DependencyGraph()
+    graph.add('root', step('root'))
+    graph.add('a', step('a', wait=True), depends_on=['root'])
+    graph.add('b', step('b', wait=True), depends_on=['root'])
+    graph.add('c', step('c'), depends_on=['a', 'b'])
+
+    assert graph.run() == {'root': 'root', 'a': 'a', 'b': 'b', 'c': 'c'}
+    assert order[0] == 'root'
+    assert order[-1] == 'c'
+    assert set(graph.timings) == {'root', 'a', 'b', 'c'}
+
+
+def test_dependency_graph_shares_context():
+    def memoize():
+        get_memo('test')['value'] = 1
+
+    graph = DependencyGraph()
+    graph.add('memoize', memoize)
+    with memoization_scope():
+        graph.run()
+        assert get_memo('test') == {'value': 1}
+
+
+def test_dependency_graph_failure():
+    def fail():
+        time.sleep(0.01)
+        raise KeyError("Failed.")
+
+    dependent_called = []
+    graph = DependencyGraph()
+    graph.add('fail', fail)
+    graph.add('dependent', lambda: dependent_called.append(True), depends_on=['fail'])
+
+    with pytest.raises(KeyError):
+        graph.run()
+    assert not dependent_called
+    assert 'fail' in graph.timings
+
+
+def test_dependency_graph_validation():
+    graph = DependencyGraph()
+    graph.add('a', lambda: None)
+    with pytest.raises(ValueError):
+        graph.add('a', lambda: None)
+    with pytest.raises(ValueError):
+        graph.add('b', lambda: None, depends_on=['c'])
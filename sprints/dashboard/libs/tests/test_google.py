@@ -1,7 +1,14 @@
 import re
+from unittest.mock import (
+    Mock,
+    patch,
+)
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
+
+from sprints.dashboard.libs.google import get_rotations_users
 
 
 @pytest.mark.parametrize(
@@ -24,3 +31,25 @@ def test_vacation_format(calendar_event, expected_name, expected_action, expecte
     assert search.get('name') or search.get('first_name') == expected_name
     assert search.get('action') == expected_action
     assert search.get('hours') == expected_hours
+
+
+ROTATIONS_SPREADSHEET = [
+    ['Sprint', '229', '230a', '230b', '231a', '231b'],
+    ['Bebop FF', 'John Doe', 'Jane Doe', 'Jack Doe', 'Jake Doe'],
+    ['Bebop DD', 'Jack Doe', '', 'Jane Doe', 'John Doe', 'Jake Doe'],
+    ['Serenity FF', 'Jill Doe', 'Joe Doe', 'Jim Doe'],
+]
+
+
+@patch("sprints.dashboard.libs.google.get_rotations_spreadsheet", return_value=ROTATIONS_SPREADSHEET)
+def test_get_rotations_users(mock_get_rotations_spreadsheet: Mock):
+    cache.clear()
+
+    assert get_rotations_users('230', 'Bebop') == {'FF': ['Jane Doe', 'Jack Doe'], 'DD': ['Jane Doe']}
+    assert get_rotations_users('231', 'Bebop') == {'FF': ['Jake Doe'], 'DD': ['John Doe', 'Jake Doe']}
+    assert get_rotations_users('230', 'Serenity') == {'FF': ['Joe Doe', 'Jim Doe']}
+    assert get_rotations_users('23', 'Bebop') == {}
+    assert get_rotations_users('230', 'Firefly') == {}
+
+    # The spreadsheet is downloaded only once.
+    mock_get_rotations_spreadsheet.assert_called_once_with()
@@ -0,0 +1,103 @@
+from typing import (
+    Dict,
+    List,
+)
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from sprints.dashboard.libs.issue_snapshot import (
+    get_issue_records,
+    get_raw_issues,
+)
+
+QUERY = 'filter = 1'
+FIELDS = ['summary']
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def get_mock_connection(issues: Dict[str, str], updated: List[str]) -> Mock:
+    """
+    Mock searching for the issues.
+
+    :param issues: Summaries of the issues matching the query.
+    :param updated: Keys of the issues updated since the previous refresh.
+    """
+
+    def search(jql_str: str, fields: List[str], _page_size=None):
+        if fields == ['None']:
+            keys = list(issues)
+        elif 'updated >= ' in jql_str:
+            keys = updated
+        elif jql_str.startswith('key IN'):
+            keys = [key for key in issues if f'"{key}"' in jql_str]
+        else:
+            keys = list(issues)
+        return iter([{'id': key, 'key': key, 'fields': {'summary': issues[key]}} for key in keys])
+
+    conn = Mock()
+    conn.search_raw_issues_iter.side_effect = search
+    return conn
+
+
+def get_summaries(conn: Mock) -> Dict[str, str]:
+    return {key: raw_issue['fields']['summary'] for key, raw_issue in get_raw_issues(conn, QUERY, FIELDS).items()}
+
+
+@override_settings(JIRA_INCREMENTAL_DASHBOARD=True, CACHE_ISSUE_SNAPSHOT_TIMEOUT=3600)
+@patch("sprints.dashboard.libs.issue_snapshot.time.time")
+def test_get_raw_issues_incremental(mock_time: Mock):
+    mock_time.return_value = 1000
+    conn = get_mock_connection({'A-1': 'first', 'A-2': 'second'}, updated=[])
+    assert get_summaries(conn) == {'A-1': 'first', 'A-2': 'second'}
+    conn.search_raw_issues_iter.assert_called_once_with(QUERY, FIELDS)
+
+    # A-1 has left the query, A-2 has been updated, and A-3 has joined the query.
+    mock_time.return_value = 1090
+    conn = get_mock_connection({'A-2': 'changed', 'A-3': 'third'}, updated=['A-2', 'A-3'])
+    assert get_summaries(conn) == {'A-2': 'changed', 'A-3': 'third'}
+    assert [call.args[0] for call in conn.search_raw_issues_iter.call_args_list] == [
+        QUERY,
+        '(filter = 1) AND updated >= "-3m"',
+    ]
+
+    # A-4 is missing in the snapshot, even though it has not been updated.
+    mock_time.return_value = 1100
+    conn = get_mock_connection({'A-2': 'changed', 'A-3': 'third', 'A-4': 'fourth'}, updated=[])
+    assert get_summaries(conn) == {'A-2': 'changed', 'A-3': 'third', 'A-4': 'fourth'}
+    assert conn.search_raw_issues_iter.call_args_list[-1].args[0] == 'key IN ("A-4")'
+
+
+@override_settings(JIRA_INCREMENTAL_DASHBOARD=True, CACHE_ISSUE_SNAPSHOT_TIMEOUT=3600)
+@patch("sprints.dashboard.libs.issue_snapshot.time.time")
+def test_get_raw_issues_rebuilds_expired_snapshot(mock_time: Mock):
+    mock_time.return_value = 1000
+    get_summaries(get_mock_connection({'A-1': 'first'}, updated=[]))
+
+    # The snapshot expires an hour after it has been created, even if it has been updated in the meantime.
+    mock_time.return_value = 4000
+    get_summaries(get_mock_connection({'A-1': 'first'}, updated=[]))
+    mock_time.return_value = 4700
+    conn = get_mock_connection({'A-1': 'changed'}, updated=[])
+    assert get_summaries(conn) == {'A-1': 'changed'}
+    conn.search_raw_issues_iter.assert_called_once_with(QUERY, FIELDS)
+
+
+@override_settings(JIRA_INCREMENTAL_DASHBOARD=False)
+def test_get_issue_records_without_snapshot():
+    conn = get_mock_connection({'A-1': 'first'}, updated=[])
+    with patch.object(cache, 'set') as mock_set:
+        records = list(get_issue_records(conn, QUERY, FIELDS))
+
+    assert [(record.key, record.fields.summary) for record in records] == [('A-1', 'first')]
+    conn.search_raw_issues_iter.assert_called_once_with(QUERY, FIELDS)
+    mock_set.assert_not_called()
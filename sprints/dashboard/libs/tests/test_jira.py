@@ -0,0 +1,318 @@
+import asyncio
+import http
+import json
+import threading
+from collections import Counter
+from datetime import (
+    datetime,
+    timedelta,
+)
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from freezegun import freeze_time
+from jira import JIRAError
+from jira.client import ResultList
+from jira.resources import User as JiraUser
+from requests.exceptions import ConnectionError
+
+from sprints.dashboard.libs.jira import (
+    AsyncCustomJira,
+    CustomJira,
+    JiraConnectionPool,
+    get_jira_cache_stats,
+    invalidate_jira_cache,
+)
+from sprints.dashboard.libs.metrics import (
+    get_caller,
+    tag_caller,
+)
+
+
+@patch("sprints.dashboard.libs.jira.create_jira_connection", side_effect=lambda: Mock())
+def test_connection_pool_reuses_connections(mock_create: Mock):
+    pool = JiraConnectionPool(size=1, health_check_interval=60)
+
+    with pool.connection() as conn:
+        first = conn
+    with pool.connection() as conn:
+        assert conn is first
+
+    mock_create.assert_called_once()
+    first.close.assert_not_called()
+
+
+@patch("sprints.dashboard.libs.jira.create_jira_connection", side_effect=lambda: Mock())
+def test_connection_pool_nested_checkout(mock_create: Mock):
+    pool = JiraConnectionPool(size=1, health_check_interval=60)
+
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+
+    mock_create.assert_called_once()
+
+
+@patch("sprints.dashboard.libs.jira.create_jira_connection", side_effect=lambda: Mock())
+def test_connection_pool_overflow(mock_create: Mock):
+    pool = JiraConnectionPool(size=1, health_check_interval=60)
+    connections = []
+    barrier = threading.Barrier(2)
+
+    def checkout():
+        with pool.connection() as conn:
+            connections.append(conn)
+            barrier.wait()
+
+    threads = [threading.Thread(target=checkout) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_create.call_count == 2
+    assert connections[0] is not connections[1]
+    # Only one idle connection is retained.
+    assert sum(conn.close.call_count for conn in connections) == 1
+
+
+@patch("sprints.dashboard.libs.jira.create_jira_connection", side_effect=lambda: Mock())
+def test_connection_pool_health_check(mock_create: Mock):
+    pool = JiraConnectionPool(size=1, health_check_interval=0)
+
+    with pool.connection() as conn:
+        broken = conn
+    broken.server_info.side_effect = ConnectionError()
+
+    with pool.connection() as conn:
+        assert conn is not broken
+
+    broken.close.assert_called_once()
+    assert mock_create.call_count == 2
+
+
+@patch("sprints.dashboard.libs.jira.create_jira_connection", side_effect=lambda: Mock())
+def test_connection_pool_discards_broken_connection(_mock_create: Mock):
+    pool = JiraConnectionPool(size=1, health_check_interval=60)
+
+    with pytest.raises(ConnectionError):
+        with pool.connection() as conn:
+            broken = conn
+            raise ConnectionError()
+
+    broken.close.assert_called_once()
+    with pool.connection() as conn:
+        assert conn is not broken
+
+
+def test_async_jira_gather_preserves_order():
+    conn = Mock()
+    conn.user_schedule.side_effect = lambda user, from_, to: f"{user}: {from_} - {to}"
+    async_conn = AsyncCustomJira(conn, max_concurrency=2)
+
+    members = ['user1', 'user2', 'user3']
+    schedules = async_conn.gather(*(async_conn.user_schedule(member, 'from', 'to') for member in members))
+
+    assert schedules == [f"{member}: from - to" for member in members]
+    assert conn.user_schedule.call_count == len(members)
+
+
+def test_async_jira_gather_within_running_event_loop():
+    conn = Mock()
+    conn.quickfilters.side_effect = lambda board_id: [board_id]
+    async_conn = AsyncCustomJira(conn)
+
+    async def view() -> list:
+        return async_conn.gather(*(async_conn.quickfilters(board_id) for board_id in (1, 2)))
+
+    assert asyncio.run(view()) == [[1], [2]]
+
+
+def _get_mock_jira(responses: list) -> CustomJira:
+    """Create `CustomJira` without connecting to the server."""
+    conn = object.__new__(CustomJira)
+    conn._options = {'server': 'https://jira.example.com', 'rest_path': 'api', 'rest_api_version': '2'}
+    conn._session = Mock(get=Mock(side_effect=responses))
+    return conn
+
+
+def _get_mock_response(data, headers: dict = None) -> Mock:
+    return Mock(
+        status_code=200,
+        text=json.dumps(data),
+        content=json.dumps(data).encode(),
+        headers=headers or {},
+        json=Mock(return_value=data),
+    )
+
+
+@override_settings(CACHE_JIRA_TIMEOUTS={'fields': 60})
+def test_cached_json():
+    cache.clear()
+    conn = _get_mock_jira([_get_mock_response([{'id': 'summary'}])])
+
+    assert conn.fields() == [{'id': 'summary'}]
+    assert conn.fields() == [{'id': 'summary'}]
+    conn._session.get.assert_called_once()
+
+    invalidate_jira_cache('fields')
+    conn._session.get.side_effect = [_get_mock_response([{'id': 'status'}])]
+    with freeze_time(datetime.now() + timedelta(seconds=1)):
+        assert conn.fields() == [{'id': 'status'}]
+
+
+@override_settings(CACHE_JIRA_TIMEOUTS={'fields': 60})
+def test_cached_json_revalidation():
+    cache.clear()
+    conn = _get_mock_jira([
+        _get_mock_response([{'id': 'summary'}], {'ETag': '"v1"'}),
+        JIRAError(status_code=http.HTTPStatus.NOT_MODIFIED),
+    ])
+
+    conn.fields()
+    with freeze_time(datetime.now() + timedelta(seconds=61)):
+        assert conn.fields() == [{'id': 'summary'}]
+
+    assert conn._session.get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert get_jira_cache_stats()['fields']['revalidated'] >= 1
+
+
+def test_search_issues_iter():
+    conn = object.__new__(CustomJira)
+    pages = {
+        0: ResultList(['issue1', 'issue2'], _startAt=0, _maxResults=2, _total=3),
+        2: ResultList(['issue3'], _startAt=2, _maxResults=2, _total=3),
+    }
+    conn.search_issues = Mock(side_effect=lambda jql_str, startAt, **_kwargs: pages[startAt])
+
+    assert list(conn.search_issues_iter('project = TEST', page_size=2)) == ['issue1', 'issue2', 'issue3']
+    assert [call.kwargs['startAt'] for call in conn.search_issues.call_args_list] == [0, 2]
+    assert all(call.kwargs['maxResults'] == 2 for call in conn.search_issues.call_args_list)
+
+
+def test_search_issue_records_iter():
+    conn = object.__new__(CustomJira)
+    conn._options = {'server': 'https://jira.example.com', 'rest_path': 'api', 'rest_api_version': '2'}
+    conn._session = Mock()
+    raw_issue = {
+        'id': '1',
+        'key': 'TEST-1',
+        'fields': {
+            'assignee': {'name': 'user1', 'displayName': 'User 1'},
+            'status': {'name': 'In progress'},
+            'customfield_1': ['sprint'],
+            'ignored': 'value',
+        },
+    }
+    conn._get_json = Mock(return_value={'issues': [raw_issue], 'total': 1})
+
+    issues = list(conn.search_issue_records_iter('project = TEST', ['assignee', 'status', 'customfield_1', 'flagged']))
+
+    assert len(issues) == 1
+    issue = issues[0]
+    assert issue.key == 'TEST-1'
+    assert issue.fields.status.name == 'In progress'
+    assert issue.fields.customfield_1 == ['sprint']
+    assert issue.fields.flagged is None
+    assert not hasattr(issue.fields, 'ignored')
+    assert issue.fields.assignee == JiraUser(conn._options, conn._session, raw={'name': 'user1'})
+    assert {issue.fields.assignee: 1}[JiraUser(conn._options, conn._session, raw={'name': 'user1'})] == 1
+    assert conn._get_json.call_args.kwargs['params']['fields'] == 'assignee,status,customfield_1,flagged'
+
+
+def test_search_issue_records_iter_cached():
+    cache.clear()
+    conn = object.__new__(CustomJira)
+    conn._get_json = Mock(return_value={'issues': [{'id': '1', 'key': 'TEST-1', 'fields': {}}], 'total': 1})
+
+    for _ in range(2):
+        issues = list(conn.search_issue_records_iter('Sprint IN (1,2)', ['status'], cached=True))
+        assert [issue.key for issue in issues] == ['TEST-1']
+    conn._get_json.assert_called_once()
+
+    list(conn.search_issue_records_iter('Sprint IN (1,3)', ['status'], cached=True))
+    assert conn._get_json.call_count == 2
+
+
+def test_comments_since():
+    conn = object.__new__(CustomJira)
+    author = {'name': 'user1', 'displayName': 'User 1'}
+    pages = [
+        {
+            'comments': [
+                {'created': '2019-01-03T10:00:00.000+0000', 'body': 'Third.', 'author': author},
+                {'created': '2019-01-02T10:00:00.000+0000', 'body': 'Second.', 'author': author},
+            ],
+            'total': 4,
+        },
+        {
+            'comments': [
+                {'created': '2018-12-31T10:00:00.000+0000', 'body': 'First.', 'author': author},
+                {'created': '2018-12-30T10:00:00.000+0000', 'body': 'Zeroth.', 'author': author},
+            ],
+            'total': 4,
+        },
+    ]
+    conn._get_json = Mock(side_effect=pages)
+
+    comments = list(conn.comments_since('TEST-1', '2019-01-01', page_size=2))
+
+    assert [comment.body for comment in comments] == ['Third.', 'Second.']
+    assert comments[0].author.displayName == 'User 1'
+    # The second page is needed to find out that there are no more recent comments.
+    assert conn._get_json.call_count == 2
+    assert conn._get_json.call_args.args[0] == 'issue/TEST-1/comment'
+    assert conn._get_json.call_args.kwargs['params'] == {'startAt': 2, 'maxResults': 2, 'orderBy': '-created'}
+
+
+@override_settings(JIRA_WORKLOG_LIST_CONCURRENCY=2, JIRA_WORKLOG_LIST_RETRIES=1, JIRA_WORKLOG_LIST_RETRY_BACKOFF=0)
+def test_worklog_list():
+    attempts: Counter = Counter()
+
+    def post(url, data):
+        ids = json.loads(data)['ids']
+        attempts[ids[0]] += 1
+        # The first chunk fails once and finishes last.
+        if ids[0] == 0 and attempts[0] == 1:
+            raise ConnectionError()
+        return _get_mock_response([{'id': str(i), 'issueId': str(i % 7), 'comment': ''} for i in ids])
+
+    conn = _get_mock_jira([])
+    conn._session.post = Mock(side_effect=post)
+
+    worklogs = conn.worklog_list(list(range(2500)))
+
+    assert worklogs == [{'id': str(i), 'issueId': str(i % 7)} for i in range(2500)]
+    assert attempts == {0: 2, 1000: 1, 2000: 1}
+
+
+def test_worklog_list_requests_are_tagged_with_caller():
+    callers = []
+
+    def post(url, data):
+        callers.append(get_caller())
+        return _get_mock_response([{'id': str(i), 'issueId': '1'} for i in json.loads(data)['ids']])
+
+    conn = _get_mock_jira([])
+    conn._session.post = Mock(side_effect=post)
+
+    with tag_caller('test_task'):
+        conn.worklog_list(list(range(2500)))
+
+    # The chunks are retrieved by the threads of a pool.
+    assert callers == ['test_task'] * 3
+
+
+@override_settings(JIRA_WORKLOG_LIST_RETRIES=1, JIRA_WORKLOG_LIST_RETRY_BACKOFF=0)
+def test_worklog_list_retries_exhausted():
+    conn = _get_mock_jira([])
+    conn._session.post = Mock(side_effect=ConnectionError())
+
+    with pytest.raises(ConnectionError):
+        conn.worklog_list([1, 2])
+    assert conn._session.post.call_count == 2
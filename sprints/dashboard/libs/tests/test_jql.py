@@ -0,0 +1,137 @@
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from jira import JIRAError
+
+from sprints.dashboard.libs import jql
+from sprints.dashboard.tests.test_utils import MockItem
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def test_canonical_query():
+    user_clause = jql.or_(jql.eq('assignee', 'user'), jql.eq('Reviewer 1', 'user'))
+    query = jql.and_(
+        user_clause,
+        jql.in_('Sprint', [3, 1, 2, 1]),
+        jql.in_('status', {'Merged', 'Backlog'}),
+        jql.contains('summary', 'Say "hi"'),
+        '',
+    )
+    assert query == (
+        '(assignee = "user" OR "Reviewer 1" = "user") AND Sprint IN (1,2,3) AND status IN ("Backlog","Merged") '
+        'AND summary ~ "Say \\"hi\\""'
+    )
+    assert jql.or_(jql.and_(jql.eq('a', 1), jql.is_empty('b')), jql.in_('Sprint', jql.Function('openSprints()'))) == (
+        '(a = 1 AND b is EMPTY) OR Sprint IN openSprints()'
+    )
+    assert jql.in_('status', ['B', 'A']) == jql.in_('status', ['A', 'B'])
+    assert jql.and_(jql.group('filter = 1 OR a = 1'), jql.ge('updated', '-5m')) == (
+        '(filter = 1 OR a = 1) AND updated >= "-5m"'
+    )
+
+    with pytest.raises(ValueError):
+        jql.in_('Sprint', [])
+
+
+def test_in_chunks():
+    queries = list(jql.in_chunks('id', range(100, 120), max_length=30))
+    assert all(len(query) <= 30 for query in queries)
+    assert queries[0] == 'id IN (100,101,102,103,104)'
+    assert sum(query.count(',') + 1 for query in queries) == 20
+
+
+def test_fingerprint():
+    assert jql.fingerprint('Sprint IN (1,2)', ['b', 'a']) == jql.fingerprint('Sprint IN (1,2)', ['a', 'b'])
+    assert jql.fingerprint('Sprint IN (1,2)') != jql.fingerprint('Sprint IN (1,3)')
+
+
+@override_settings(JIRA_SAVED_FILTERS=True, JIRA_SAVED_FILTER_PREFIX='Test: ')
+def test_saved_filter():
+    conn = Mock()
+    conn.favourite_filters.return_value = []
+    conn.create_filter.return_value = MockItem(id='10')
+
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (1,2)') == 'filter = 10'
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (1,2)') == 'filter = 10'
+    conn.create_filter.assert_called_once()
+    assert conn.create_filter.call_args.kwargs['jql'] == 'Sprint IN (1,2)'
+
+    # The filter created by another process is reused.
+    name = conn.create_filter.call_args.kwargs['name']
+    cache.clear()
+    previous_filter = Mock(id='10')
+    previous_filter.name = name
+    other_filter = Mock(id='9')
+    other_filter.name = 'Test: next sprint issues 0123456789ab'
+    conn.favourite_filters.return_value = [previous_filter, other_filter]
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (1,2)') == 'filter = 10'
+    conn.create_filter.assert_called_once()
+
+    # A new version of the query gets its own filter, and the filter of the previous version is deleted.
+    conn.create_filter.return_value = MockItem(id='11')
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (2,3)') == 'filter = 11'
+    previous_filter.delete.assert_called_once()
+    other_filter.delete.assert_not_called()
+
+    # The original query is used if the filter cannot be created.
+    conn.create_filter.side_effect = JIRAError("Forbidden.")
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (3,4)') == 'Sprint IN (3,4)'
+
+
+@override_settings(JIRA_SAVED_FILTERS=True)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_search_saved_filter_falls_back_to_query(lazy: bool):
+    conn = Mock()
+    conn.favourite_filters.return_value = []
+    conn.create_filter.return_value = MockItem(id='10')
+
+    def search_pages():
+        raise JIRAError("The filter does not exist.")
+        yield  # noqa  # pylint: disable=unreachable
+
+    def search(jql_str: str):
+        if jql_str == 'filter = 10':
+            # The lazy searches (e.g. `CustomJira.search_issues_iter`) retrieve the first page when they are iterated.
+            return search_pages() if lazy else search_pages().send(None)
+        return iter(['TEST-1'])
+
+    assert list(jql.search_saved_filter(conn, 'next sprint', 'Sprint IN (1,2)', search)) == ['TEST-1']
+    # The ID of the deleted filter is forgotten, so a new filter is created with the next search.
+    conn.create_filter.return_value = MockItem(id='11')
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (1,2)') == 'filter = 11'
+
+
+@override_settings(JIRA_SAVED_FILTERS=True)
+def test_search_saved_filter_deleted_between_pages():
+    conn = Mock()
+    conn.favourite_filters.return_value = []
+    conn.create_filter.return_value = MockItem(id='10')
+
+    def search_pages():
+        yield 'TEST-1'
+        yield 'TEST-2'
+        # Another process has created a new version of the filter and deleted this one.
+        raise JIRAError("The filter does not exist.")
+
+    def search(jql_str: str):
+        if jql_str == 'filter = 10':
+            return search_pages()
+        return iter(['TEST-1', 'TEST-2', 'TEST-3'])
+
+    assert list(jql.search_saved_filter(conn, 'next sprint', 'Sprint IN (1,2)', search)) == [
+        'TEST-1',
+        'TEST-2',
+        'TEST-3',
+    ]
+
+
+def test_saved_filters_disabled():
+    conn = Mock()
+    assert jql.saved_filter(conn, 'next sprint', 'Sprint IN (1,2)') == 'Sprint IN (1,2)'
+    conn.create_filter.assert_not_called()
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+)
+from django.test import (
+    RequestFactory,
+    override_settings,
+)
+from prometheus_client import REGISTRY
+from requests import (
+    PreparedRequest,
+    Response,
+)
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError
+
+from sprints.dashboard.libs.metrics import (
+    UNKNOWN_CALLER,
+    InstrumentedAdapter,
+    get_caller,
+    get_endpoint,
+    tag_caller,
+)
+from sprints.dashboard.views import metrics_view
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://jira.example.com/rest/api/2/search?jql=project%3DSE", "/rest/api/2/search"),
+        ("https://jira.example.com/rest/api/2/issue/SE-1234/comment", "/rest/api/2/issue/{key}/comment"),
+        ("https://jira.example.com/rest/agile/1.0/board/12/sprint", "/rest/agile/1.0/board/{id}/sprint"),
+        (
+            "https://jira.example.com/rest/pokerng/1.0/session/id/5?withUserKeys=true",
+            "/rest/pokerng/1.0/session/id/{id}",
+        ),
+    ],
+)
+def test_get_endpoint(url, expected):
+    assert get_endpoint(url) == expected
+
+
+def test_tag_caller():
+    assert get_caller() == 'unknown'
+    with tag_caller('outer'):
+        with tag_caller('inner'):
+            assert get_caller() == 'inner'
+        assert get_caller() == 'outer'
+    assert get_caller() == 'unknown'
+
+
+def _get_sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _get_request(url: str) -> PreparedRequest:
+    request = PreparedRequest()
+    request.prepare(method='GET', url=url)
+    return request
+
+
+@patch.object(HTTPAdapter, "send")
+def test_instrumented_adapter(mock_send: Mock):
+    response = Response()
+    response.status_code = 404
+    response._content = b'{"errorMessages": []}'
+    mock_send.return_value = response
+    labels = {'endpoint': '/rest/api/2/issue/{key}', 'method': 'GET', 'caller': 'test'}
+    requests_before = _get_sample('jira_requests_total', status='404', **labels)
+    errors_before = _get_sample('jira_request_errors_total', error='404', **labels)
+
+    with tag_caller('test'):
+        InstrumentedAdapter().send(_get_request('https://jira.example.com/rest/api/2/issue/SE-1'))
+
+    assert _get_sample('jira_requests_total', status='404', **labels) == requests_before + 1
+    assert _get_sample('jira_request_errors_total', error='404', **labels) == errors_before + 1
+    assert _get_sample('jira_response_size_bytes_count', **labels) >= 1
+    assert _get_sample('jira_request_duration_seconds_count', **labels) >= 1
+
+
+@patch.object(HTTPAdapter, "send", side_effect=ConnectionError())
+def test_instrumented_adapter_connection_error(_mock_send: Mock):
+    labels = {'endpoint': '/rest/api/2/field', 'method': 'GET', 'caller': 'test'}
+    errors_before = _get_sample('jira_request_errors_total', error='ConnectionError', **labels)
+
+    with tag_caller('test'), pytest.raises(ConnectionError):
+        InstrumentedAdapter().send(_get_request('https://jira.example.com/rest/api/2/field'))
+
+    assert _get_sample('jira_request_errors_total', error='ConnectionError', **labels) == errors_before + 1
+
+
+@override_settings(PROMETHEUS_METRICS_TOKEN='secret')
+def test_metrics_view():
+    factory = RequestFactory()
+
+    assert metrics_view(factory.get('/metrics/')).status_code == 403
+    assert metrics_view(factory.get('/metrics/', HTTP_AUTHORIZATION='Bearer other')).status_code == 403
+
+    response = metrics_view(factory.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret'))
+    assert response.status_code == 200
+    assert b'jira_requests_total' in response.content
+
+
+@override_settings(PROMETHEUS_METRICS_TOKEN='')
+def test_metrics_view_disabled_without_token():
+    assert metrics_view(RequestFactory().get('/metrics/', HTTP_AUTHORIZATION='Bearer ')).status_code == 403
+
+
+def test_caller_is_not_shared_between_threads():
+    with tag_caller('test'), ThreadPoolExecutor(max_workers=1) as executor:
+        # E.g. another task run concurrently by a threaded Celery worker.
+        assert executor.submit(get_caller).result() == UNKNOWN_CALLER
+        assert get_caller() == 'test'
+
+
+def test_caller_of_tasks():
+    outer, inner = Mock(), Mock()
+    outer.name, inner.name = 'outer_task', 'inner_task'
+    task_prerun.send(sender=outer, task_id='outer', task=outer)
+    assert get_caller() == 'outer_task'
+
+    # Tasks run eagerly within other tasks restore the caller of the outer task.
+    task_prerun.send(sender=inner, task_id='inner', task=inner)
+    assert get_caller() == 'inner_task'
+    task_postrun.send(sender=inner, task_id='inner', task=inner)
+    assert get_caller() == 'outer_task'
+
+    task_postrun.send(sender=outer, task_id='outer', task=outer)
+    assert get_caller() == UNKNOWN_CALLER
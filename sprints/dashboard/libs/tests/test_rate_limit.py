@@ -0,0 +1,116 @@
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from django.test import override_settings
+from requests import (
+    PreparedRequest,
+    Response,
+)
+from requests.adapters import HTTPAdapter
+
+from sprints.dashboard.libs.rate_limit import (
+    LocalRateLimiter,
+    RateLimitedAdapter,
+    RateLimiter,
+    get_endpoint_class,
+    get_retry_delay,
+)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://jira.example.com/rest/api/2/search?jql=", "search"),
+        ("https://jira.example.com/rest/tempo-core/1/user/schedule", "tempo"),
+        ("https://jira.example.com/rest/tempo-accounts/1/account", "tempo"),
+        ("https://jira.example.com/rest/pokerng/1.0/session/id/1", "poker"),
+        ("https://jira.example.com/rest/api/2/field", "default"),
+    ],
+)
+def test_get_endpoint_class(url, expected):
+    assert get_endpoint_class(url) == expected
+
+
+@override_settings(JIRA_RATE_LIMITS={'default': (2, 2)})
+@patch("sprints.dashboard.libs.rate_limit.time")
+def test_local_rate_limiter(mock_time: Mock):
+    mock_time.time.return_value = 1000
+    rate_limiter = LocalRateLimiter()
+
+    assert rate_limiter._try_acquire('default') == 0
+    assert rate_limiter._try_acquire('default') == 0
+    # The bucket is empty, so the next token will be available after 1 / rate seconds.
+    assert rate_limiter._try_acquire('default') == 0.5
+
+    mock_time.time.return_value = 1000.5
+    assert rate_limiter._try_acquire('default') == 0
+
+    rate_limiter.block('default', 10)
+    assert rate_limiter._try_acquire('default') == 10
+
+
+def _get_response(status_code: int, headers: dict = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.raw = Mock()
+    response._content = b''
+    response.headers.update(headers or {})
+    return response
+
+
+@override_settings(JIRA_RATE_LIMIT_MAX_BACKOFF=60, JIRA_RATE_LIMIT_BACKOFF=1)
+def test_get_retry_delay():
+    assert get_retry_delay(_get_response(429, {'Retry-After': '5'}), 0) == 5
+    assert get_retry_delay(_get_response(429, {'Retry-After': '600'}), 0) == 60
+    assert 4 <= get_retry_delay(_get_response(429), 3) <= 8
+
+
+@override_settings(JIRA_RATE_LIMIT_RETRIES=2)
+@patch("sprints.dashboard.libs.rate_limit.get_rate_limiter")
+@patch.object(HTTPAdapter, "send")
+def test_rate_limited_adapter_retries(mock_send: Mock, mock_get_rate_limiter: Mock):
+    mock_send.side_effect = [_get_response(429, {'Retry-After': '3'}), _get_response(429), _get_response(200)]
+    request = PreparedRequest()
+    request.prepare(method='GET', url='https://jira.example.com/rest/tempo-core/1/user/schedule')
+
+    response = RateLimitedAdapter().send(request)
+
+    assert response.status_code == 200
+    assert mock_send.call_count == 3
+    rate_limiter = mock_get_rate_limiter.return_value
+    assert rate_limiter.acquire.call_count == 3
+    rate_limiter.acquire.assert_called_with('tempo')
+    assert rate_limiter.block.call_args_list[0].args == ('tempo', 3)
+
+
+@override_settings(JIRA_RATE_LIMIT_RETRIES=1)
+@patch("sprints.dashboard.libs.rate_limit.get_rate_limiter")
+@patch.object(HTTPAdapter, "send")
+def test_rate_limited_adapter_retries_exhausted(mock_send: Mock, _mock_get_rate_limiter: Mock):
+    mock_send.side_effect = [_get_response(429), _get_response(429)]
+    request = PreparedRequest()
+    request.prepare(method='GET', url='https://jira.example.com/rest/api/2/search')
+
+    assert RateLimitedAdapter().send(request).status_code == 429
+    assert mock_send.call_count == 2
+
+
+@patch("sprints.dashboard.libs.rate_limit.get_rate_limiter")
+@patch.object(HTTPAdapter, "send")
+def test_rate_limited_adapter_does_not_retry_server_errors(mock_send: Mock, mock_get_rate_limiter: Mock):
+    # They are retried by `jira.resilientsession.ResilientSession`.
+    mock_send.return_value = _get_response(503)
+    request = PreparedRequest()
+    request.prepare(method='GET', url='https://jira.example.com/rest/api/2/search')
+
+    assert RateLimitedAdapter().send(request).status_code == 503
+    mock_send.assert_called_once()
+    mock_get_rate_limiter.return_value.block.assert_not_called()
+
+
+def test_rate_limiter_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimiter()
@@ -0,0 +1,68 @@
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import httplib2
+import pytest
+from django.test import override_settings
+from requests import (
+    Response,
+    Session,
+)
+from requests.adapters import HTTPAdapter
+
+from sprints.dashboard.libs.replay import (
+    MissingFixtureError,
+    RecordingAdapter,
+    RecordingHttp,
+    ReplayAdapter,
+    ReplayHttp,
+)
+
+URL = 'https://jira.example.com/rest/api/2/search?jql=project%3DSE'
+
+
+def _get_session(adapter: HTTPAdapter) -> Session:
+    session = Session()
+    session.mount('https://', adapter)
+    return session
+
+
+@patch("sprints.dashboard.libs.rate_limit.get_rate_limiter", Mock())
+@patch.object(HTTPAdapter, "send")
+def test_record_and_replay_jira(mock_send: Mock, tmp_path):
+    response = Response()
+    response.status_code = 200
+    response.headers.update({'Content-Type': 'application/json', 'Set-Cookie': 'JSESSIONID=secret'})
+    response._content = b'{"issues": []}'
+    mock_send.return_value = response
+
+    with override_settings(HTTP_REPLAY_FIXTURES_DIR=str(tmp_path)):
+        _get_session(RecordingAdapter()).post(URL, data='{"fields": []}')
+        mock_send.reset_mock()
+
+        replayed = _get_session(ReplayAdapter()).post(URL, data='{"fields": []}')
+        assert replayed.status_code == 200
+        assert replayed.json() == {"issues": []}
+        assert 'Set-Cookie' not in replayed.headers
+        mock_send.assert_not_called()
+
+        with pytest.raises(MissingFixtureError):
+            _get_session(ReplayAdapter()).post(URL, data='{"fields": ["summary"]}')
+
+
+@override_settings(HTTP_REPLAY_LATENCY=0.01)
+def test_record_and_replay_google(tmp_path):
+    url = 'https://www.googleapis.com/calendar/v3/users/me/calendarList?fields=items%28id%29&alt=json'
+    http = Mock()
+    http.request.return_value = (httplib2.Response({'status': '200', 'content-type': 'application/json'}), b'{}')
+
+    with override_settings(HTTP_REPLAY_FIXTURES_DIR=str(tmp_path)):
+        RecordingHttp(http).request(url, method='GET', headers={'Authorization': 'Bearer secret'})
+
+        response, content = ReplayHttp().request(url, method='GET', headers={})
+        assert response.status == 200
+        assert response['content-type'] == 'application/json'
+        assert content == b'{}'
+        assert 'secret' not in ''.join(path.read_text() for path in tmp_path.rglob('*.json'))
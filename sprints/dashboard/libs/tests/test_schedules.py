@@ -0,0 +1,64 @@
+import time
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from sprints.dashboard.libs.schedules import (
+    get_schedule_range,
+    get_user_schedules,
+)
+from sprints.dashboard.tests.test_utils import MockItem
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def get_mock_connection() -> Mock:
+    conn = Mock()
+    conn.user_schedule.side_effect = lambda user, from_, to: MockItem(
+        requiredSeconds=len(user) * 3600,
+        days=[
+            MockItem(date=from_, requiredSeconds=len(user) * 1800),
+            MockItem(date=to, requiredSeconds=len(user) * 1800),
+        ],
+    )
+    return conn
+
+
+def test_get_schedule_range():
+    assert get_schedule_range('2019-01-01', '2019-01-14') == ('2018-12-31', '2019-01-15')
+
+
+@override_settings(SPRINT_START_TIME_UTC='00:00', CACHE_SCHEDULE_TIMEOUT=3600)
+@patch("sprints.dashboard.libs.schedules.time.time", return_value=time.mktime((2019, 1, 1, 0, 0, 0, 0, 0, 0)))
+def test_get_user_schedules_shared_between_cells(_mock_time: Mock):
+    conn = get_mock_connection()
+
+    schedules = get_user_schedules(conn, ['a', 'bb', 'a'], '2019-01-13', '2019-01-29', '2019-01-14')
+    assert schedules == {
+        'a': {'total': 3600, 'days': {'2019-01-13': 1800, '2019-01-29': 1800}},
+        'bb': {'total': 7200, 'days': {'2019-01-13': 3600, '2019-01-29': 3600}},
+    }
+    assert conn.user_schedule.call_count == 2
+
+    # Only the missing schedule is retrieved for the next cell.
+    schedules = get_user_schedules(conn, ['bb', 'ccc'], '2019-01-13', '2019-01-29', '2019-01-14')
+    assert set(schedules) == {'bb', 'ccc'}
+    assert conn.user_schedule.call_count == 3
+    conn.user_schedule.assert_called_with('ccc', '2019-01-13', '2019-01-29')
+
+
+@override_settings(SPRINT_START_TIME_UTC='00:00', CACHE_SCHEDULE_TIMEOUT=3600)
+def test_get_user_schedules_not_cached_after_sprint_start():
+    conn = get_mock_connection()
+
+    get_user_schedules(conn, ['a'], '2018-12-31', '2019-01-15', '2019-01-01')
+    get_user_schedules(conn, ['a'], '2018-12-31', '2019-01-15', '2019-01-01')
+    assert conn.user_schedule.call_count == 2
@@ -0,0 +1,54 @@
+from unittest.mock import Mock
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+)
+from django.test import RequestFactory
+
+from sprints.dashboard.libs.scope import (
+    MemoizationScopeMiddleware,
+    clear_memo,
+    get_memo,
+    memoization_scope,
+)
+
+
+def test_memoization_scope():
+    assert get_memo('test') is None
+
+    with memoization_scope():
+        get_memo('test')['key'] = 'value'
+        with memoization_scope():
+            assert get_memo('test') == {'key': 'value'}
+        assert get_memo('test') == {'key': 'value'}
+
+        clear_memo('test')
+        assert get_memo('test') == {}
+
+    assert get_memo('test') is None
+
+
+def test_memoization_scope_of_tasks():
+    task = Mock()
+    task_prerun.send(sender=task, task_id='outer', task=task)
+    get_memo('test')['key'] = 'value'
+
+    # Tasks run eagerly within other tasks share their scope.
+    task_prerun.send(sender=task, task_id='inner', task=task)
+    assert get_memo('test') == {'key': 'value'}
+    task_postrun.send(sender=task, task_id='inner', task=task)
+    assert get_memo('test') == {'key': 'value'}
+
+    task_postrun.send(sender=task, task_id='outer', task=task)
+    assert get_memo('test') is None
+
+
+def test_memoization_scope_middleware():
+    def get_response(_request):
+        get_memo('test')['key'] = 'value'
+        return get_memo('test')
+
+    middleware = MemoizationScopeMiddleware(get_response)
+    assert middleware(RequestFactory().get('/')) == {'key': 'value'}
+    assert get_memo('test') is None
@@ -0,0 +1,80 @@
+from unittest.mock import (
+    Mock,
+    call,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from jira.exceptions import JIRAError
+
+from sprints.dashboard.libs.user_directory import (
+    SEARCH_LIMIT,
+    UserDirectory,
+)
+
+
+def _get_raw_user(i: int) -> dict:
+    return {
+        'name': f'user{i}',
+        'key': f'JIRAUSER{i}',
+        'displayName': f'User {i}',
+        'emailAddress': f'user{i}@example.com',
+        'active': True,
+    }
+
+
+@override_settings(JIRA_USER_DIRECTORY_PAGE_SIZE=2)
+def test_user_directory_pagination():
+    cache.clear()
+    conn = Mock()
+    conn._get_json.side_effect = [[_get_raw_user(0), _get_raw_user(1)], [_get_raw_user(2)]]
+
+    directory = UserDirectory(conn)
+
+    assert len(directory) == 3
+    assert conn._get_json.call_args_list == [
+        call('user/search', params={'username': "''", 'startAt': 0, 'maxResults': 2}),
+        call('user/search', params={'username': "''", 'startAt': 2, 'maxResults': 2}),
+    ]
+    for value in ('user2', 'JIRAUSER2', 'User 2', 'user2@example.com'):
+        assert directory[value].name == 'user2'
+
+    # The directory is shared via the cache.
+    assert UserDirectory(Mock())['User 1'].emailAddress == 'user1@example.com'
+
+
+def test_user_directory_missing_user():
+    cache.clear()
+    conn = Mock()
+    conn._get_json.return_value = [_get_raw_user(0)]
+    conn.user.side_effect = lambda username: Mock(raw=_get_raw_user(int(username.removeprefix('user'))))
+
+    directory = UserDirectory(conn)
+
+    assert directory['user1'].key == 'JIRAUSER1'
+    conn.user.assert_called_once_with('user1')
+    conn.search_users.assert_not_called()
+    assert directory['User 1'].name == 'user1'
+
+    # The user is cached separately, without rewriting the whole directory.
+    assert len(cache.get(settings.CACHE_USER_DIRECTORY_KEY)) == 1
+    other_conn = Mock()
+    assert UserDirectory(other_conn)['user1'].key == 'JIRAUSER1'
+    other_conn.user.assert_not_called()
+
+
+def test_user_directory_missing_user_search():
+    cache.clear()
+    conn = Mock()
+    conn._get_json.return_value = [_get_raw_user(0)]
+    conn.user.side_effect = JIRAError(status_code=404)
+    # The search matches the prefixes, so the first result is not the requested user.
+    conn.search_users.return_value = [Mock(raw=_get_raw_user(10)), Mock(raw=_get_raw_user(1))]
+
+    directory = UserDirectory(conn)
+
+    assert directory['user1@example.com'].name == 'user1'
+    conn.search_users.assert_called_once_with('user1@example.com', maxResults=SEARCH_LIMIT)
+
+    assert directory.get('user') is None
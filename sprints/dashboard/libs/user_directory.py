@@ -0,0 +1,157 @@
+import hashlib
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+from jira.exceptions import JIRAError
+
+from sprints.dashboard.libs.jira import (
+    CustomJira,
+    RecordUser,
+)
+
+
+# Number of the users matched by the search for a user missing from the directory. The search matches the prefixes, so
+# the requested user does not need to be the first result.
+SEARCH_LIMIT = 50
+
+
+class UserDirectory:
+    """
+    Directory of Jira users with O(1) lookups by their `name`, `key`, `displayName` or `emailAddress`.
+
+    The users are bulk-loaded from Jira and stored in the cache, so the directory is shared between the processes.
+    Users missing from the directory are retrieved individually, so it does not need to be reloaded when a new user is
+    created. They are cached under separate keys, so adding them does not rewrite the whole directory.
+    """
+
+    LOOKUP_FIELDS = ('name', 'key', 'displayName', 'emailAddress')
+
+    def __init__(self, conn: CustomJira) -> None:
+        self.conn = conn
+        self._users: Dict[str, Dict[str, str]] = {}
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        """Load the directory from the cache, or from Jira if it has not been cached yet."""
+        if self._loaded:
+            return
+        users = cache.get(settings.CACHE_USER_DIRECTORY_KEY)
+        if users is None:
+            self.refresh()
+        else:
+            self._users = users
+            self._build_indexes()
+            self._loaded = True
+
+    def __getitem__(self, value: str) -> RecordUser:
+        user = self.get(value)
+        if not user:
+            raise KeyError(value)
+        return user
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._users)
+
+    @property
+    def users(self) -> List[RecordUser]:
+        """All users from the directory."""
+        self._load()
+        return [RecordUser(raw_user) for raw_user in self._users.values()]
+
+    def get(self, value: str) -> Optional[RecordUser]:
+        """
+        Retrieve the user by any of the `LOOKUP_FIELDS`.
+
+        If the user is not in the directory, then it is retrieved from Jira (see `_find_user`) and cached until the next
+        `refresh`.
+        """
+        self._load()
+        for field in self.LOOKUP_FIELDS:
+            if key := self._indexes[field].get(value):
+                return RecordUser(self._users[key])
+
+        cache_key = f'{settings.CACHE_USER_DIRECTORY_USER_PREFIX}{hashlib.sha1(value.encode()).hexdigest()}'
+        raw_user = cache.get(cache_key)
+        if raw_user is None:
+            if not (raw_user := self._find_user(value)):
+                return None
+            cache.set(cache_key, raw_user, settings.CACHE_USER_DIRECTORY_TIMEOUT)
+
+        self._add_user(raw_user)
+        return RecordUser(raw_user)
+
+    def refresh(self) -> None:
+        """
+        Reload all users from Jira.
+
+        Unlike `search_users`, this is not limited to the 1000 users returned by a single request.
+        """
+        raw_users = (self._get_raw_user(raw_user) for raw_user in self._fetch_all_users())
+        self._users = {raw_user['key']: raw_user for raw_user in raw_users}
+        self._build_indexes()
+        cache.set(settings.CACHE_USER_DIRECTORY_KEY, self._users, settings.CACHE_USER_DIRECTORY_TIMEOUT)
+        self._loaded = True
+
+    def _find_user(self, value: str) -> Optional[Dict[str, str]]:
+        """
+        Retrieve the user by its username, or search for the user with the exact value of any of the `LOOKUP_FIELDS`.
+
+        The search also matches the prefixes of the names and email addresses, so other results are skipped.
+        """
+        try:
+            return self._get_raw_user(self.conn.user(value).raw)
+        except JIRAError as e:
+            if e.status_code != 404:
+                raise
+
+        for user in self.conn.search_users(value, maxResults=SEARCH_LIMIT):
+            raw_user = self._get_raw_user(user.raw)
+            if value in raw_user.values():
+                return raw_user
+        return None
+
+    def _fetch_all_users(self) -> Iterable[Dict]:
+        """Retrieve all users from Jira page by page."""
+        page_size = settings.JIRA_USER_DIRECTORY_PAGE_SIZE
+        start_at = 0
+        while True:
+            page = self.conn._get_json(
+                'user/search',
+                params={
+                    'username': "''",  # Searching for the "quotes" returns all users.
+                    'startAt': start_at,
+                    'maxResults': page_size,
+                },
+            )
+            yield from page
+            if len(page) < page_size:
+                break
+            start_at += len(page)
+
+    def _get_raw_user(self, raw_user: Dict) -> Dict[str, str]:
+        """Retain only the fields used by the directory."""
+        return {field: raw_user.get(field) for field in self.LOOKUP_FIELDS}
+
+    def _add_user(self, raw_user: Dict[str, str]) -> None:
+        """Add the user to this instance of the directory."""
+        self._users[raw_user['key']] = raw_user
+        self._index_user(raw_user)
+
+    def _build_indexes(self) -> None:
+        self._indexes = {field: {} for field in self.LOOKUP_FIELDS}
+        for raw_user in self._users.values():
+            self._index_user(raw_user)
+
+    def _index_user(self, raw_user: Dict[str, str]) -> None:
+        for field in self.LOOKUP_FIELDS:
+            if value := raw_user.get(field):
+                # Keep the first user in case of duplicated display names.
+                self._indexes[field].setdefault(value, raw_user['key'])
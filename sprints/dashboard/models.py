@@ -1,15 +1,30 @@
 """These are standard Python classes, not Django models. We don't store dashboard in the DB."""
+import contextvars
 import functools
 import re
+import threading
 import typing
-from datetime import timedelta
+from collections import defaultdict
+from datetime import (
+    date,
+    datetime,
+)
+from multiprocessing.pool import ThreadPool
 from typing import (
+    Any,
+    Callable,
+    DefaultDict,
     Dict,
+    Hashable,
+    Iterable,
+    Iterator,
     List,
+    Optional,
     Set,
+    Tuple,
+    Union,
 )
 
-from dateutil.parser import parse
 from django.conf import settings
 from jira import (
     Issue,
@@ -21,23 +36,27 @@ from config.settings.base import (
     SECONDS_IN_HOUR,
     SECONDS_IN_MINUTE,
 )
+from sprints.dashboard.libs import jql
+from sprints.dashboard.libs.dependency_graph import DependencyGraph
 from sprints.dashboard.libs.google import get_vacations
+from sprints.dashboard.libs.issue_snapshot import get_issue_records
 from sprints.dashboard.libs.jira import (
     CustomJira,
-    QuickFilter,
+    IssueRecord,
+)
+from sprints.dashboard.libs.metrics import DASHBOARD_STEP_DURATION
+from sprints.dashboard.libs.schedules import (
+    get_schedule_range,
+    get_user_schedules,
 )
+from sprints.dashboard.topology import Topology
 from sprints.dashboard.utils import (
     Cell,
-    daterange,
+    ParsedSprint,
     extract_sprint_id_from_str,
-    get_all_sprints,
-    get_cell,
-    get_cell_members,
     get_issue_fields,
-    get_next_sprint,
-    get_sprint_end_date,
+    get_next_cell_sprint,
     get_sprint_meeting_day_division,
-    get_sprint_start_date,
     prepare_jql_query,
 )
 
@@ -47,7 +66,7 @@ class DashboardIssue:
 
     def __init__(
         self,
-        issue: Issue,
+        issue: Union[Issue, IssueRecord],
         current_sprint_ids: Set[int],
         cell_members: List[str],
         unassigned_user: JiraUser,
@@ -199,7 +218,7 @@ class DashboardIssue:
         return self.key.startswith(cell_key) or self.reviewer_1.name in cell_members
 
     @staticmethod
-    def _is_flagged(issue: Issue, issue_fields: Dict[str, str]) -> bool:
+    def _is_flagged(issue: Union[Issue, IssueRecord], issue_fields: Dict[str, str]) -> bool:
         """Check whether the ticket has been flagged as "Impediment"."""
         return any(filter(lambda x: x.value == 'Impediment', getattr(issue.fields, issue_fields['Flagged']) or []))
 
@@ -207,6 +226,17 @@ class DashboardIssue:
 class DashboardRow:
     """Represents single dashboard row (user)."""
 
+    # Time (in seconds) committed by the user, aggregated from the issues by `Dashboard.generate_rows`.
+    TIME_COLUMNS = (
+        'current_remaining_assignee_time',
+        'current_remaining_review_time',
+        'current_remaining_upstream_time',
+        'future_assignee_time',
+        'future_review_time',
+        'future_epic_management_time',
+        'flagged_time',
+    )
+
     def __init__(self, user: JiraUser) -> None:
         self.user = user
         self.current_remaining_assignee_time = 0
@@ -252,11 +282,103 @@ class DashboardRow:
             self.future_unestimated.append(issue)
 
 
+class VacationIndex:
+    """
+    Vacation days of the users within the date range, with lookups by the users' display names.
+
+    The names from the calendar events can be prefixes of the display names (e.g. the first names), so they are stored
+    in a trie. This way, each lookup walks the display name only once, instead of comparing it with all vacations.
+    """
+
+    # Key of the vacations in the trie nodes. The other keys are single characters, so they cannot collide with it.
+    VACATIONS = ''
+
+    def __init__(self, vacations: List[Dict], from_: str, to: str) -> None:
+        """
+        :param vacations: Vacations in the format returned by `get_vacations`.
+        :param from_: The first day of the range (inclusive).
+        :param to: The last day of the range (inclusive).
+        """
+        first_day, last_day = _to_ordinal(from_), _to_ordinal(to)
+        # Dates of the days within the range, with their ordinals as keys.
+        self._dates = {
+            day: date.fromordinal(day).strftime(settings.JIRA_API_DATE_FORMAT) for day in range(first_day, last_day + 1)
+        }
+        self._trie: Dict[str, Any] = {}
+
+        for vacation in vacations:
+            start = max(_to_ordinal(vacation["start"]["date"]), first_day)
+            end = min(_to_ordinal(vacation["end"]["date"]), last_day)
+            if not vacation["user"] or start > end:
+                continue
+
+            node = self._trie
+            for char in vacation["user"]:
+                node = node.setdefault(char, {})
+            node.setdefault(self.VACATIONS, []).append((start, end, vacation["seconds"]))
+
+    def get_days(self, display_name: str) -> Iterator[Tuple[str, int]]:
+        """
+        Yield the vacation days of the user, as `(date, planned_commitments)` tuples. The days of the overlapping
+        vacations are yielded once for each vacation.
+        """
+        node = self._trie
+        for char in display_name:
+            if (node := node.get(char)) is None:  # type: ignore
+                return
+            for start, end, seconds in node.get(self.VACATIONS, ()):
+                for day in range(start, end + 1):
+                    yield self._dates[day], seconds
+
+
+@functools.lru_cache()
+def _to_ordinal(date_str: str) -> int:
+    return datetime.strptime(date_str, settings.JIRA_API_DATE_FORMAT).toordinal()
+
+
+class DashboardInputs:
+    """
+    Inputs of the dashboards (e.g. the vacations or the issues), which can be shared by the dashboards of multiple
+    cells. Each input is retrieved only once, even if the dashboards are built concurrently.
+    """
+
+    def __init__(self, members: Optional[Iterable[str]] = None) -> None:
+        # Members of all cells sharing the inputs, so their schedules can be retrieved at once.
+        self.members = list(members) if members is not None else None
+        self._values: Dict[Hashable, Any] = {}
+        self._locks: DefaultDict[Hashable, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, retrieve: Callable[[], Any]) -> Any:
+        """
+        Get the input, retrieving it if needed. The other threads requesting it in the meantime wait for the result.
+
+        The inputs are shared, so they must not be modified by the dashboards.
+        """
+        with self._lock:
+            lock = self._locks[key]
+        with lock:
+            if key not in self._values:
+                self._values[key] = retrieve()
+            return self._values[key]
+
+
 class Dashboard:
     """Aggregates user records into a dashboard."""
 
-    def __init__(self, board_id: int, conn: CustomJira) -> None:
+    def __init__(
+        self,
+        board_id: int,
+        conn: CustomJira,
+        topology: Optional[Topology] = None,
+        inputs: Optional[DashboardInputs] = None,
+    ) -> None:
+        """
+        :param topology: The topology shared with other dashboards. Loaded from the cache by default.
+        :param inputs: The inputs shared with other dashboards (see `get_dashboards`). Not shared by default.
+        """
         self.jira_connection = conn
+        self.inputs = inputs or DashboardInputs()
         self.dashboard: Dict[JiraUser, DashboardRow] = {}
         self.issue_fields: Dict[str, str]
         self.issues: List[DashboardIssue]
@@ -269,36 +391,52 @@ class Dashboard:
         self.future_sprints: List[Sprint]
         self.future_sprint_start: str
         self.future_sprint_end: str
+        # Duration of each step of retrieving the data, in seconds.
+        self.timings: Dict[str, float] = {}
 
         # Retrieve data from Jira.
-        self.cell = get_cell(conn, board_id)
-        self.get_sprints()
+        self.topology = topology or Topology(conn)
         self.create_mock_users()
-        self.vacations = get_vacations(self.before_future_sprint_start, self.after_future_sprint_end)
-        self.get_issues()
+        self.load_data()
         self.generate_rows()
 
+    def load_data(self) -> None:
+        """Retrieve the data from Jira and Google APIs. The independent steps are run concurrently."""
+        graph = DependencyGraph()
+        graph.add('sprints', self.get_sprints)
+        graph.add('issue_fields', self.get_issue_fields)
+        graph.add('vacations', self.get_vacations, depends_on=['sprints'])
+        graph.add('sprint_division', self.get_sprint_division, depends_on=['sprints'])
+        graph.add('schedules', self.get_schedules, depends_on=['sprints'])
+        graph.add('issues', self.get_issues, depends_on=['sprints', 'issue_fields'])
+        try:
+            graph.run()
+        finally:
+            self.timings = graph.timings
+            for step, duration in graph.timings.items():
+                DASHBOARD_STEP_DURATION.labels(step).observe(duration)
+
     @property
     def rows(self):
         """Simplification for the serializer."""
         return self.dashboard.values()
 
     def get_sprints(self) -> None:
-        """Retrieves current and future sprint for the board."""
-        sprints = get_all_sprints(self.jira_connection, self.board_id)
+        """Retrieves the cell with its members, and current and future sprint for the board."""
+        self.cell = self.topology.get_cell(self.board_id)
+        self.members = self.topology.get_members(self.board_id)
+        sprints = self.topology.get_all_sprints(self.board_id)
         self.active_sprints = sprints['active']
         self.future_sprints = sprints['future']
-        self.cell_future_sprint = get_next_sprint(sprints['cell'], sprints['cell'][0])
+        self.cell_future_sprint = get_next_cell_sprint(self.jira_connection, self.cell.board_id, sprints['cell'][0])
 
-        self.future_sprint_start = get_sprint_start_date(self.cell_future_sprint)
-        self.future_sprint_end = get_sprint_end_date(self.cell_future_sprint)
+        parsed_future_sprint = ParsedSprint(self.cell_future_sprint)
+        self.future_sprint_start = parsed_future_sprint.start_date
+        self.future_sprint_end = parsed_future_sprint.end_date
 
         # Helper variables to retrieve more data for different timezones (one extra day on each end of the sprint).
-        self.before_future_sprint_start = (parse(self.future_sprint_start) - timedelta(days=1)).strftime(
-            settings.JIRA_API_DATE_FORMAT
-        )
-        self.after_future_sprint_end = (parse(self.future_sprint_end) + timedelta(days=1)).strftime(
-            settings.JIRA_API_DATE_FORMAT
+        self.before_future_sprint_start, self.after_future_sprint_end = get_schedule_range(
+            self.future_sprint_start, self.future_sprint_end
         )
 
     def create_mock_users(self):
@@ -317,23 +455,50 @@ class Dashboard:
         self.dashboard.pop(self.other_cell, None)
         self.dashboard.pop(self.unassigned_user, None)
 
-    def get_issues(self) -> None:
-        """Retrieves all stories and epics for the current dashboard."""
-        self.issue_fields = get_issue_fields(self.jira_connection, settings.JIRA_REQUIRED_FIELDS)
+    def get_issue_fields(self) -> None:
+        """Retrieves IDs of the issue fields required by the dashboard."""
+        self.issue_fields = self.inputs.get(
+            'issue_fields', lambda: get_issue_fields(self.jira_connection, settings.JIRA_REQUIRED_FIELDS)
+        )
 
-        issues: List[Issue] = self.jira_connection.search_issues(
-            **prepare_jql_query(
-                [str(sprint.id) for sprint in self.active_sprints + self.future_sprints],
-                list(self.issue_fields.values()),
-            ),
-            maxResults=0,
+    def get_vacations(self) -> None:
+        """Retrieves vacations scheduled during the next sprint."""
+        start, end = self.before_future_sprint_start, self.after_future_sprint_end
+        self.vacations = self.inputs.get(('vacations', start, end), lambda: get_vacations(start, end))
+
+    def get_sprint_division(self) -> None:
+        """Retrieves the parts of the members' days before the start of the next sprint."""
+        start = self.future_sprint_start
+        self.sprint_division = self.inputs.get(
+            ('sprint_division', start), lambda: get_sprint_meeting_day_division(start)
         )
-        quickfilters: List[QuickFilter] = self.jira_connection.quickfilters(self.board_id)
 
-        self.members = get_cell_members(quickfilters)
-        self.sprint_division = get_sprint_meeting_day_division(self.future_sprint_start)
+    def get_issues(self) -> None:
+        """
+        Retrieves all stories and epics for the current dashboard. The query is the same for all cells, so the issues
+        are shared with the other dashboards, and only the ones relevant for this cell are kept.
+        """
         self.issues = []
 
+        query = prepare_jql_query(
+            [str(sprint.id) for sprint in self.active_sprints + self.future_sprints],
+            list(self.issue_fields.values()),
+        )
+
+        def retrieve_issues() -> List[IssueRecord]:
+            # The query can be replaced with a saved filter, as it is used by all cells. Only the issues changed since
+            # the previous refresh are retrieved, unless the snapshot has expired.
+            return list(
+                jql.search_saved_filter(
+                    self.jira_connection,
+                    "dashboard issues",
+                    query['jql_str'],
+                    lambda jql_str: get_issue_records(self.jira_connection, jql_str, query['fields']),
+                )
+            )
+
+        issues = self.inputs.get(('issues', jql.fingerprint(query['jql_str'], query['fields'])), retrieve_issues)
+
         active_sprint_ids = {sprint.id for sprint in self.active_sprints}
         for issue in issues:
             dashboard_issue = DashboardIssue(
@@ -348,107 +513,127 @@ class Dashboard:
             if dashboard_issue.is_relevant:
                 self.issues.append(dashboard_issue)
 
-        for member in self.members:
-            schedule = self.jira_connection.user_schedule(
-                member,
-                self.before_future_sprint_start,
-                self.after_future_sprint_end,
-            )
-            self.commitments[member] = {
-                'total': schedule.requiredSeconds,
-                'days': {day.date: day.requiredSeconds for day in schedule.days}
-            }
+    def get_schedules(self) -> None:
+        """Retrieves the members' commitments for the next sprint from Tempo."""
+        start, end = self.before_future_sprint_start, self.after_future_sprint_end
+        self.commitments = self.inputs.get(
+            ('schedules', start, end),
+            lambda: get_user_schedules(
+                self.jira_connection, self.inputs.members or self.members, start, end, self.future_sprint_start
+            ),
+        )
 
     @typing.no_type_check
     def generate_rows(self) -> None:
         """Generates rows for all users and calculates their time stats."""
-        for issue in self.issues:  # type: DashboardIssue
-            assignee = self.dashboard.setdefault(issue.assignee, DashboardRow(issue.assignee))
-            reviewer_1 = self.dashboard.setdefault(issue.reviewer_1, DashboardRow(issue.reviewer_1))
+        self.dashboard = self._aggregate_rows(self.issues)
+        self.dashboard.pop(self.other_cell, None)
+
+        # Hide users that are not included in the Sprint board's quickfilters.
+        for user in list(self.dashboard.keys()):
+            if user != self.unassigned_user and user.name not in self.members:
+                self.dashboard.pop(user)
+
+        self._calculate_commitments()
+
+    @typing.no_type_check
+    def _aggregate_rows(self, issues: Iterable[DashboardIssue]) -> Dict[JiraUser, DashboardRow]:
+        """
+        Sum the time of the issues for their assignees and reviewers.
+
+        The totals are aggregated in columns (one list per `DashboardRow` attribute, indexed by the users' positions)
+        instead of updating the attributes of the rows, so the rows are created only once per user, after processing
+        all issues. The rows are ordered by the first appearance of their users.
+        """
+        users: Dict[JiraUser, int] = {}
+        totals: Dict[str, List[int]] = {column: [] for column in DashboardRow.TIME_COLUMNS}
+        unestimated: List[Tuple[int, DashboardIssue]] = []
+
+        def get_index(user: JiraUser) -> int:
+            if (index := users.get(user)) is None:
+                index = users[user] = len(users)
+                for column in totals.values():
+                    column.append(0)
+            return index
+
+        current_assignee_time = totals['current_remaining_assignee_time']
+        current_review_time = totals['current_remaining_review_time']
+        current_upstream_time = totals['current_remaining_upstream_time']
+        future_assignee_time = totals['future_assignee_time']
+        future_review_time = totals['future_review_time']
+        future_epic_management_time = totals['future_epic_management_time']
+        flagged_time = totals['flagged_time']
+
+        for issue in issues:
+            assignee = get_index(issue.assignee)
+            reviewer_1 = get_index(issue.reviewer_1)
 
             # Calculate time for epic management
             if issue.is_epic:
-                assignee.future_epic_management_time += issue.epic_management_time
+                future_epic_management_time[assignee] += issue.epic_management_time
                 continue
 
             # Calculate hours for recurring tickets for the upcoming sprint.
             if issue.status == settings.SPRINT_STATUS_RECURRING:
-                assignee.future_assignee_time += issue.recurring_time
-                reviewer_1.future_review_time += issue.review_time
+                future_assignee_time[assignee] += issue.recurring_time
+                future_review_time[reviewer_1] += issue.review_time
                 continue
 
             # Check if the issue has any time left.
             if issue.time_estimate == 0:
-                assignee.add_unestimated_issue(issue)
+                unestimated.append((assignee, issue))
 
             # Calculations for the current sprint.
             if issue.current_sprint:
                 # Assume that no more review will be needed at this point.
                 if issue.status == settings.SPRINT_STATUS_EXTERNAL_REVIEW:
-                    assignee.current_remaining_upstream_time += issue.assignee_time
+                    current_upstream_time[assignee] += issue.assignee_time
 
                 else:
-                    reviewer_1.current_remaining_review_time += issue.review_time
-                    assignee.current_remaining_assignee_time += issue.assignee_time
+                    current_review_time[reviewer_1] += issue.review_time
+                    current_assignee_time[assignee] += issue.assignee_time
 
             # Calculations for the upcoming sprint.
             else:
-                assignee.future_assignee_time += issue.assignee_time
-                reviewer_1.future_review_time += issue.review_time
+                future_assignee_time[assignee] += issue.assignee_time
+                future_review_time[reviewer_1] += issue.review_time
 
                 if issue.is_flagged:
-                    assignee.flagged_time += issue.assignee_time
-                    reviewer_1.flagged_time += issue.review_time
-
-        self.dashboard.pop(self.other_cell, None)
+                    flagged_time[assignee] += issue.assignee_time
+                    flagged_time[reviewer_1] += issue.review_time
 
-        # Hide users that are not included in the Sprint board's quickfilters.
-        for user in list(self.dashboard.keys()):
-            if user != self.unassigned_user and user.name not in self.members:
-                self.dashboard.pop(user)
-
-        self._calculate_commitments()
+        rows = [DashboardRow(user) for user in users]
+        for column, values in totals.items():
+            for row, value in zip(rows, values):
+                setattr(row, column, value)
+        for index, issue in unestimated:
+            rows[index].add_unestimated_issue(issue)
+        return dict(zip(users, rows))
 
     @typing.no_type_check
     def _calculate_commitments(self):
         """
         Calculates time commitments and vacations for each user.
         """
+        vacations = VacationIndex(self.vacations, self.before_future_sprint_start, self.after_future_sprint_end)
         for row in self.rows:
             if row.user != self.unassigned_user:
+                commitments = self.commitments[row.user.name]
                 # Calculate vacations
-                for vacation in self.vacations:
-                    if row.user.displayName.startswith(vacation["user"]):
-                        for vacation_date in daterange(
-                            max(
-                                vacation["start"]["date"],
-                                (parse(self.future_sprint_start) - timedelta(days=1)).strftime(
-                                    settings.JIRA_API_DATE_FORMAT
-                                ),
-                            ),
-                            min(
-                                vacation["end"]["date"],
-                                (parse(self.future_sprint_end) + timedelta(days=1)).strftime(
-                                    settings.JIRA_API_DATE_FORMAT
-                                ),
-                            ),
-                        ):
-                            row.vacation_time += self._get_vacation_for_day(
-                                self.commitments[row.user.name]["days"][vacation_date],
-                                vacation_date,
-                                vacation["seconds"],
-                                row.user.displayName,
-                            )
-                    elif row.user.displayName < vacation["user"]:
-                        # Small optimization, as users' vacations are sorted.
-                        break
+                for vacation_date, planned_commitments in vacations.get_days(row.user.displayName):
+                    row.vacation_time += self._get_vacation_for_day(
+                        commitments["days"][vacation_date],
+                        vacation_date,
+                        planned_commitments,
+                        row.user.displayName,
+                    )
 
                 # Remove the "padding" from a day before and after the sprint.
                 # noinspection PyTypeChecker
                 row.set_goal_time(
-                    self.commitments[row.user.name]["total"]
-                    - self.commitments[row.user.name]["days"][self.before_future_sprint_start]
-                    - self.commitments[row.user.name]["days"][self.after_future_sprint_end]
+                    commitments["total"]
+                    - commitments["days"][self.before_future_sprint_start]
+                    - commitments["days"][self.after_future_sprint_end]
                     - row.vacation_time
                 )
 
@@ -501,3 +686,27 @@ class Dashboard:
             return vacations * division if positive_timezone else 0
 
         return vacations
+
+
+def get_dashboards(conn: CustomJira, board_ids: Optional[Iterable[int]] = None) -> Dict[int, Dashboard]:
+    """
+    Build the dashboards of multiple cells (all of them by default) in a single pass.
+
+    The data shared by the cells (the topology, issue fields, vacations, availability and schedules of the members) is
+    retrieved only once, and so are the issues, which are retrieved with one query and partitioned between the cells in
+    memory.
+
+    :returns dashboards with board IDs as keys
+    """
+    topology = Topology(conn)
+    if board_ids is None:
+        board_ids = [cell.board_id for cell in topology.cells]
+    inputs = DashboardInputs(topology.membership)
+
+    with ThreadPool(processes=settings.MULTIPROCESSING_POOL_SIZE) as pool:
+        # The dashboards are built within the caller's context (e.g. the memoization scope of the task).
+        results = {
+            board_id: pool.apply_async(contextvars.copy_context().run, (Dashboard, board_id, conn, topology, inputs))
+            for board_id in board_ids
+        }
+        return {board_id: result.get(settings.MULTIPROCESSING_TIMEOUT) for board_id, result in results.items()}
@@ -0,0 +1,162 @@
+"""
+Start and end dates of the current sprints.
+
+The dates are needed by many views and tasks, but they change only when the sprints are completed, so they are
+computed for all sprints at once and stored in the cache. Each process additionally keeps them in memory for
+`CACHE_SPRINT_CALENDAR_LOCAL_TIMEOUT_SECONDS`.
+
+Only one process recomputes the calendar at a time (the others wait for its result instead of querying Jira too). After
+`CACHE_SPRINT_CALENDAR_REFRESH_SECONDS` the calendar is refreshed in the background, while the stale dates are still
+being served.
+"""
+import threading
+import time
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+
+from sprints.dashboard.libs.background import run_in_background_once
+from sprints.dashboard.libs.jira import (
+    CustomJira,
+    connect_to_jira,
+)
+from sprints.dashboard.libs.scope import memoization_scope
+from sprints.dashboard.utils import (
+    ParsedSprint,
+    get_all_sprints,
+    get_cells,
+)
+
+# Interval between the checks whether the calendar has been computed by another process.
+LOCK_POLL_INTERVAL = 0.1
+
+# The process-wide copy of the cached entry, and the time when it needs to be retrieved from the cache again.
+_local_entry: Optional[Dict] = None
+_local_entry_expires_at = 0.
+_local_lock = threading.Lock()
+
+
+def get_current_sprint_start_date(sprint_type: str = 'active', board_id: str = '') -> str:
+    """
+    Get the start date of the current sprint.
+
+    :param sprint_type: `active`, `future` or `cell` (the active sprint of the cell)
+    :param board_id: ID of the cell's board, required for the `cell` type
+    """
+    return _get_sprint_dates(sprint_type, board_id)[0]
+
+
+def get_current_sprint_end_date(sprint_type: str = 'active', board_id: str = '') -> str:
+    """Get the end date of the current sprint. The arguments are the same as in `get_current_sprint_start_date`."""
+    return _get_sprint_dates(sprint_type, board_id)[1]
+
+
+def _get_sprint_dates(sprint_type: str, board_id: str) -> Tuple[str, str]:
+    return get_sprint_calendar()[f'{sprint_type}{board_id}']
+
+
+def get_sprint_calendar() -> Dict[str, Tuple[str, str]]:
+    """
+    Get the start and end dates of the `active` and `future` sprints, and the active sprint of each cell (`cell{ID}`,
+    where ID is the board ID of the cell).
+    """
+    global _local_entry, _local_entry_expires_at
+    now = time.time()
+    if _local_entry and now < _local_entry_expires_at:
+        return _local_entry['dates']
+
+    with _local_lock:
+        if not (_local_entry and now < _local_entry_expires_at):
+            entry = cache.get(settings.CACHE_SPRINT_CALENDAR_KEY)
+            if entry is None:
+                entry = _compute_single_flight()
+            elif entry['refresh_at'] <= now:
+                _refresh_in_background()
+            _set_local_entry(entry)
+        return _local_entry['dates']  # type: ignore
+
+
+def refresh_sprint_calendar(conn: Optional[CustomJira] = None) -> Dict:
+    """Compute the dates of the sprints and store them in the cache."""
+    if conn is None:
+        with connect_to_jira() as conn:
+            return refresh_sprint_calendar(conn)
+
+    # The sprints of the boards are retrieved only once, even if this is not run within a task or request.
+    with memoization_scope():
+        dates = {}
+        sprints = get_all_sprints(conn)
+        for sprint_type in ('active', 'future'):
+            if not sprints[sprint_type]:
+                continue  # There are no sprints of this type (e.g. the next sprints have not been created yet).
+            dates[sprint_type] = _get_dates(sprints[sprint_type][0])
+        for cell in get_cells(conn):
+            try:
+                cell_sprints = get_all_sprints(conn, cell.board_id)
+            except (KeyError, IndexError):
+                continue  # The cell does not have any sprints yet.
+            dates[f'cell{cell.board_id}'] = _get_dates(cell_sprints['cell'][0])
+
+    entry = {
+        'dates': dates,
+        'refresh_at': time.time() + settings.CACHE_SPRINT_CALENDAR_REFRESH_SECONDS,
+    }
+    cache.set(settings.CACHE_SPRINT_CALENDAR_KEY, entry, settings.CACHE_SPRINT_DATES_TIMEOUT_SECONDS)
+    _set_local_entry(entry)
+    return entry
+
+
+def invalidate_sprint_calendar() -> None:
+    """
+    Remove the dates of the sprints from the cache. Other processes can keep using their copies of them for up to
+    `CACHE_SPRINT_CALENDAR_LOCAL_TIMEOUT_SECONDS`.
+    """
+    global _local_entry
+    cache.delete(settings.CACHE_SPRINT_CALENDAR_KEY)
+    _local_entry = None
+
+
+def _get_dates(sprint) -> Tuple[str, str]:
+    parsed = ParsedSprint(sprint)
+    return parsed.start_date, parsed.end_date
+
+
+def _set_local_entry(entry: Dict) -> None:
+    global _local_entry, _local_entry_expires_at
+    _local_entry = entry
+    _local_entry_expires_at = time.time() + settings.CACHE_SPRINT_CALENDAR_LOCAL_TIMEOUT_SECONDS
+
+
+def _compute_single_flight() -> Dict:
+    """
+    Compute the calendar, unless another process is already doing this. In such case, wait for its result.
+
+    If the result does not appear in time (e.g. because the other process has been killed), it is computed anyway.
+    """
+    deadline = time.time() + settings.CACHE_SPRINT_CALENDAR_LOCK_TIMEOUT_SECONDS
+    while True:
+        if cache.add(settings.CACHE_SPRINT_CALENDAR_LOCK, True, settings.CACHE_SPRINT_CALENDAR_LOCK_TIMEOUT_SECONDS):
+            try:
+                return refresh_sprint_calendar()
+            finally:
+                cache.delete(settings.CACHE_SPRINT_CALENDAR_LOCK)
+
+        time.sleep(LOCK_POLL_INTERVAL)
+        if (entry := cache.get(settings.CACHE_SPRINT_CALENDAR_KEY)) is not None:
+            return entry
+        if time.time() > deadline:
+            return refresh_sprint_calendar()
+
+
+def _refresh_in_background() -> None:
+    """Start refreshing the calendar in a separate thread, unless another process is already doing this."""
+    run_in_background_once(
+        settings.CACHE_SPRINT_CALENDAR_LOCK,
+        settings.CACHE_SPRINT_CALENDAR_LOCK_TIMEOUT_SECONDS,
+        refresh_sprint_calendar,
+    )
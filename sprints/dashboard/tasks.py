@@ -1,11 +1,16 @@
+import functools
+import logging
 import string
 from datetime import (
     datetime,
     timedelta,
 )
+from multiprocessing.pool import ThreadPool
 from typing import (
     Dict,
+    Iterator,
     List,
+    Tuple,
 )
 
 from celery import group
@@ -19,6 +24,7 @@ from django_celery_beat.models import (
     IntervalSchedule,
     PeriodicTask,
 )
+from jira.exceptions import JIRAError
 # noinspection PyProtectedMember
 from jira.resources import (
     Issue,
@@ -44,24 +50,36 @@ from sprints.dashboard.libs.google import (
     upload_commitments,
     upload_spillovers,
 )
-from sprints.dashboard.libs.jira import connect_to_jira
+from sprints.dashboard.libs.jira import (
+    AsyncCustomJira,
+    CustomJira,
+    connect_to_jira,
+    invalidate_jira_cache,
+)
 from sprints.dashboard.libs.mattermost import create_mattermost_post
+from sprints.dashboard.libs.scope import in_current_context
+from sprints.dashboard.libs.user_directory import UserDirectory
 from sprints.dashboard.models import Dashboard
+from sprints.dashboard.sprint_calendar import (
+    get_current_sprint_end_date,
+    invalidate_sprint_calendar,
+)
+from sprints.dashboard.topology import (
+    Topology,
+    invalidate_topology,
+)
 from sprints.dashboard.utils import (
+    SprintIndex,
     compile_participants_roles,
     create_next_sprint,
     filter_sprints_by_cell,
+    forget_sprints,
     get_all_sprints,
     get_cell_member_names,
     get_cell_member_roles,
-    get_cell_members,
-    get_cell_membership,
-    get_cells,
     get_commitment_range,
-    get_current_sprint_end_date,
     get_issue_fields,
     get_meetings_issue,
-    get_next_sprint,
     get_spillover_issues,
     get_sprint_by_name,
     get_sprint_number,
@@ -74,20 +92,28 @@ from sprints.dashboard.utils import (
 )
 from sprints.webhooks.models import Webhook
 
+logger = logging.getLogger(__name__)
+
 
 @celery_app.task(ignore_result=True)
 def upload_spillovers_task(board_id: int, cell_name: str) -> None:
     """A task for documenting spillovers in the Google Spreadsheet."""
     with connect_to_jira() as conn:
         issue_fields = get_issue_fields(conn, settings.SPILLOVER_REQUIRED_FIELDS)
-        issues = get_spillover_issues(conn, issue_fields, cell_name)
         active_sprints = get_all_sprints(conn)['active']
         meetings = get_meetings_issue(conn, cell_name, issue_fields)
-        members = get_cell_member_names(conn, get_cell_members(conn.quickfilters(board_id)))
+        members = get_cell_member_names(conn, Topology(conn).get_members(board_id))
+
+        active_sprints_dict = {int(sprint.id): sprint for sprint in active_sprints}
+        # The spillovers are streamed and their comments are retrieved lazily, so they need to be processed before
+        # releasing the connection.
+        issues = get_spillover_issues(conn, issue_fields, cell_name)
+        reminders: List[Tuple[str, str, bool]] = []
+        rows = prepare_spillover_rows(issues, issue_fields, active_sprints_dict, reminders, conn)
+        prepare_clean_sprint_rows(rows, members, meetings, issue_fields, active_sprints_dict, reminders, conn)
 
-    active_sprints_dict = {int(sprint.id): sprint for sprint in active_sprints}
-    rows = prepare_spillover_rows(issues, issue_fields, active_sprints_dict)
-    prepare_clean_sprint_rows(rows, members, meetings, issue_fields, active_sprints_dict)
+    if reminders and not settings.DEBUG:  # We don't want to ping people via the dev environment.
+        add_spillover_reminder_comments_task.delay(reminders)
     upload_spillovers(rows)
 
 
@@ -105,20 +131,62 @@ def upload_commitments_task(board_id: int, cell_name: str) -> None:
     upload_commitments(users, column, range_)
 
 
+@celery_app.task(ignore_result=True)
+def add_spillover_reminder_comments_task(reminders: List[Tuple[str, str, bool]]) -> None:
+    """
+    A task for posting the spillover reason reminders on the issues. The reminders that could not be posted are logged.
+
+    :param reminders: `(issue_key, assignee_key, clean_sprint)` entries, duplicates are posted only once
+    """
+    unique_reminders = list(dict.fromkeys((key, assignee, bool(clean)) for key, assignee, clean in reminders))
+    with connect_to_jira() as conn:
+        with ThreadPool(min(settings.SPILLOVER_REMINDER_CONCURRENCY, len(unique_reminders)) or 1) as pool:
+            add_comment = in_current_context(functools.partial(_add_spillover_reminder_comment, conn))
+            results = pool.map(add_comment, unique_reminders)
+
+    failed = {key: result for key, result in results if result != 'ok'}
+    if failed:
+        logger.warning("Failed to post %d spillover reminder(s): %s", len(failed), failed)
+
+
+# DEPRECATED: Kept for one release, so the reminders queued by the previous version are still posted.
 @celery_app.task(ignore_result=True)
 def add_spillover_reminder_comment_task(issue_key: str, assignee_key: str, clean_sprint: bool = False) -> None:
-    """A task for posting the spillover reason reminder on the issue."""
+    """A task for posting the spillover reason reminder on the issue. Use `add_spillover_reminder_comments_task`."""
+    add_spillover_reminder_comments_task([(issue_key, assignee_key, clean_sprint)])
+
+
+def _add_spillover_reminder_comment(conn: CustomJira, reminder: Tuple[str, str, bool]) -> Tuple[str, str]:
+    """Post the spillover reason reminder on the issue. A failure is returned, so it does not stop other reminders."""
+    issue_key, assignee_key, clean_sprint = reminder
     message = settings.SPILLOVER_CLEAN_HINTS_MESSAGE if clean_sprint else settings.SPILLOVER_REMINDER_MESSAGE
-    with connect_to_jira() as conn:
+    try:
         conn.add_comment(issue_key, f"[~{assignee_key}], {message}")
+    except JIRAError as e:
+        return f'{issue_key}:{assignee_key}', str(e)
+    return f'{issue_key}:{assignee_key}', 'ok'
+
+
+@celery_app.task(ignore_result=True)
+def refresh_user_directory_task() -> None:
+    """A task for reloading all Jira users into the shared user directory."""
+    with connect_to_jira() as conn:
+        UserDirectory(conn).refresh()
+
+
+@celery_app.task(ignore_result=True)
+def refresh_topology_task() -> None:
+    """A task for rebuilding the cached topology of the cells."""
+    with connect_to_jira() as conn:
+        Topology(conn).refresh()
 
 
 @celery_app.task(ignore_result=True)
 def create_next_sprint_task(board_id: int) -> int:
     """A task for creating the next sprint for the specified cell."""
     with connect_to_jira() as conn:
-        cells = get_cells(conn)
-        cell = next(c for c in cells if c.board_id == board_id)
+        cell = Topology(conn).get_cell(board_id)
+        # The sprints are retrieved directly from Jira, as the cached ones could be outdated.
         sprints: List[Sprint] = get_sprints(conn, cell.board_id)
 
         next_sprint = create_next_sprint(conn, sprints, cell.key, board_id)
@@ -146,9 +214,10 @@ def create_role_issues_task(cell: Dict[str, str], sprint_id: int, sprint_number:
             jira_fields['Epic Link']: epic.key,
         }
 
+        directory = UserDirectory(conn)
         for role, users in rotations.items():
             for sprint_part, user in enumerate(users):
-                user_name = conn.search_users(user)[0].name
+                user_name = directory[user].name
                 fields.update({
                     jira_fields['Assignee']: {'name': user_name},
                     jira_fields['Reviewer 1']: {'name': user_name},
@@ -187,10 +256,9 @@ def trigger_new_sprint_webhooks_task(cell_name: str, sprint_name: str, sprint_nu
         rotations.update(future_rotations)
 
         # A list of jira usernames for a board: ['johndoe1', 'jane_doe_22', ...]
-        members = []
-        usernames = get_cell_members(conn.quickfilters(board_id))
-        for username in usernames:
-            members.append(conn.user(username))
+        usernames = Topology(conn).get_members(board_id)
+        directory = UserDirectory(conn)
+        members = [directory[username] for username in usernames]
 
         # Dictionary containing member roles: {'John Doe': ['Sprint Planning Manager', ...],...}
         cell_member_roles = get_cell_member_roles()
@@ -220,11 +288,10 @@ def complete_sprint_task(board_id: int) -> None:
     6. Open the next sprint.
     7. Create role tickets.
     8. Trigger the `new sprint` webhooks.
-    9. Release the sprint completion lock and clear the cache related to end of sprint date.
+    9. Release the sprint completion lock and invalidate the cached sprint dates.
     """
     with connect_to_jira() as conn:
-        cells = get_cells(conn)
-        cell = next(c for c in cells if c.board_id == board_id)
+        cell = Topology(conn).get_cell(board_id)
         spreadsheet_tasks = [
             upload_spillovers_task.s(cell.board_id, cell.name),
             upload_commitments_task.s(cell.board_id, cell.name),
@@ -244,25 +311,24 @@ def complete_sprint_task(board_id: int) -> None:
                 active_sprint = sprint
                 break
 
-        next_sprint = get_next_sprint(sprints, active_sprint)
+        sprint_index = SprintIndex(sprints)
+        next_sprint = sprint_index.get_next(active_sprint)
 
-        archived_issues: List[Issue] = conn.search_issues(
+        archived_issues: Iterator[Issue] = conn.search_issues_iter(
             **prepare_jql_query_active_sprint_tickets(
                 ['None'],  # We don't need any fields here. The `key` attribute will be sufficient.
                 {settings.SPRINT_STATUS_ARCHIVED},
                 project=cell.name,
             ),
-            maxResults=0,
         )
         archived_issue_keys = [issue.key for issue in archived_issues]
 
-        issues: List[Issue] = conn.search_issues(
+        issues: Iterator[Issue] = conn.search_issues_iter(
             **prepare_jql_query_active_sprint_tickets(
                 ['None'],  # We don't need any fields here. The `key` attribute will be sufficient.
                 settings.SPRINT_STATUS_ACTIVE | {settings.SPRINT_STATUS_DEPLOYED_AND_DELIVERED},
                 project=cell.name,
             ),
-            maxResults=0,
         )
         issue_keys = [issue.key for issue in issues]
 
@@ -294,14 +360,17 @@ def complete_sprint_task(board_id: int) -> None:
                 endDate=next_sprint.endDate,
                 state='active',
             )
+            forget_sprints()
 
             # Ensure that the next sprint exists. If it doesn't exist, create it.
             # Get next sprint number for creating role tasks there.
-            if future_next_sprint := get_next_sprint(sprints, next_sprint):
+            if future_next_sprint := sprint_index.get_next(next_sprint):
                 future_next_sprint_number = get_sprint_number(future_next_sprint)
             else:
                 future_next_sprint_number = create_next_sprint_task(board_id)
-                future_next_sprint = get_next_sprint(sprints, next_sprint)
+                # The index needs to be rebuilt, as it does not contain the created sprint.
+                sprint_index = SprintIndex(filter_sprints_by_cell(get_sprints(conn, cell.board_id), cell.key))
+                future_next_sprint = sprint_index.get(cell.key, future_next_sprint_number)
 
             cell_dict = {
                 'key': cell.key,
@@ -315,14 +384,11 @@ def complete_sprint_task(board_id: int) -> None:
                 cell.name, next_sprint.name, get_sprint_number(next_sprint), board_id
             )
 
-    cache.delete_many(
-        [
-            f'{settings.CACHE_SPRINT_END_LOCK}{board_id}',  # Release the lock.
-            f'{settings.CACHE_SPRINT_START_DATE_PREFIX}active',
-            f'{settings.CACHE_SPRINT_START_DATE_PREFIX}cell{board_id}',
-            f'{settings.CACHE_SPRINT_START_DATE_PREFIX}future',
-        ]
-    )
+    cache.delete(f'{settings.CACHE_SPRINT_END_LOCK}{board_id}')  # Release the lock.
+    invalidate_sprint_calendar()
+    # Cell members are usually modified between the sprints.
+    invalidate_jira_cache('quickfilters')
+    invalidate_topology()
 
     if settings.FEATURE_SPRINT_AUTOMATION:
         schedule_sprint_tasks_task.delay()
@@ -402,7 +468,7 @@ def move_out_injections_task() -> None:
 def check_tickets_ready_for_sprint_task() -> None:
     """Notify team members about incomplete tickets."""
     with connect_to_jira() as conn:
-        cell_membership = get_cell_membership(conn)
+        cell_membership = Topology(conn).membership
         issues = get_next_sprint_issues(conn)
 
         for user, incomplete_issues in group_incomplete_issues(conn, issues).items():
@@ -460,7 +526,7 @@ def create_estimation_session_task() -> None:
     """
     with connect_to_jira() as conn:
         session_name = get_next_poker_session_name(conn)
-        for cell in get_cells(conn):
+        for cell in Topology(conn).cells:
             if not settings.DEBUG:  # We really don't want to trigger this in the dev environment.
                 conn.create_poker_session(
                     board_id=cell.board_id,
@@ -491,12 +557,18 @@ def update_estimation_session_task() -> None:
     with connect_to_jira() as conn:
         session_name = get_next_poker_session_name(conn)
         issues = get_unestimated_next_sprint_issues(conn)
-        # FIXME: This will not work for more than 1000 users. To support it, add `startAt` to handle the pagination.
-        all_users = conn.search_users("''", maxResults=1000)  # Searching for the "quotes" returns all users.
+        all_users = UserDirectory(conn).users
 
-        for cell in get_cells(conn):
+        topology = Topology(conn)
+        cells = topology.cells
+        async_conn = AsyncCustomJira(conn)
+        cells_poker_sessions = async_conn.gather(
+            *(async_conn.poker_sessions(cell.board_id, state="OPEN", name=session_name) for cell in cells)
+        )
+
+        for cell, poker_sessions in zip(cells, cells_poker_sessions):
             try:
-                poker_session = conn.poker_sessions(cell.board_id, state="OPEN", name=session_name)[0]
+                poker_session = poker_sessions[0]
             except IndexError:
                 if not settings.DEBUG:
                     # It can happen:
@@ -523,7 +595,7 @@ def update_estimation_session_task() -> None:
             all_issue_ids = list(current_issue_ids | cell_issue_ids)
             if all_issue_ids:
                 # User's `name` and `key` are not always the same.
-                members = get_cell_member_names(conn, get_cell_members(conn.quickfilters(cell.board_id)))
+                members = get_cell_member_names(conn, topology.get_members(cell.board_id))
                 member_keys = set(user.key for user in all_users if user.displayName in members)
 
                 current_member_keys = set(user.userKey for user in poker_session.participants)
@@ -556,7 +628,7 @@ def close_estimation_session_task() -> None:
     with connect_to_jira() as conn:
         session_name = get_next_poker_session_name(conn)
 
-        for cell in get_cells(conn):
+        for cell in Topology(conn).cells:
             poker_sessions = conn.poker_sessions(cell.board_id, state="OPEN", name=session_name)
             if not settings.DEBUG:  # We really don't want to trigger this in the dev environment.
                 # Handle closing multiple sessions with the same name (though it should not happen).
@@ -576,9 +648,14 @@ def move_estimates_to_tickets_task() -> None:
     with connect_to_jira() as conn:
         session_name = get_next_poker_session_name(conn)
 
-        for cell in get_cells(conn):
+        cells = Topology(conn).cells
+        async_conn = AsyncCustomJira(conn)
+        cells_poker_sessions = async_conn.gather(
+            *(async_conn.poker_sessions(cell.board_id, state="CLOSED", name=session_name) for cell in cells)
+        )
+
+        for cell, poker_sessions in zip(cells, cells_poker_sessions):
             vote_values = conn.poker_session_vote_values(cell.board_id)
-            poker_sessions = conn.poker_sessions(cell.board_id, state="CLOSED", name=session_name)
 
             if not poker_sessions and not settings.DEBUG:
                 # This can happen if a new cell has been added, then its session was created manually, and it either:
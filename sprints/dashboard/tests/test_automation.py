@@ -11,9 +11,11 @@ from unittest.mock import (
 import pytest
 from dateutil.parser import parse
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.test import override_settings
 from freezegun import freeze_time
+from jira import JIRAError
 
 from sprints.dashboard.automation import (
     check_issue_injected,
@@ -80,18 +82,37 @@ def test_get_next_sprint_issues(get_all_sprints: Mock, get_issue_fields: Mock, c
     }
     get_issue_fields.return_value = {'test_field': 'testfield'}
     mock_jira = Mock()
-    mock_jira.search_issues = Mock()
+    mock_jira.search_issues_iter = Mock(return_value=iter([]))
 
-    get_next_sprint_issues(mock_jira, changelog)
+    assert list(get_next_sprint_issues(mock_jira, changelog)) == []
 
-    mock_jira.search_issues.assert_called_once_with(
+    mock_jira.search_issues_iter.assert_called_once_with(
         jql_str='Sprint IN (123,124)',
         fields=['testfield'],
         expand=expected_expand,
-        maxResults=0,
     )
 
 
+@override_settings(JIRA_SAVED_FILTERS=True)
+@patch("sprints.dashboard.automation.get_issue_fields", return_value={'test_field': 'testfield'})
+@patch("sprints.dashboard.automation.get_all_sprints", return_value={'future': [Mock(id=123), Mock(id=124)]})
+def test_get_next_sprint_issues_with_saved_filter(_get_all_sprints: Mock, _get_issue_fields: Mock):
+    cache.clear()
+    mock_jira = Mock()
+    mock_jira.favourite_filters.return_value = []
+    mock_jira.create_filter.return_value = MockItem(id='10')
+    mock_jira.search_issues_iter.return_value = iter(['TEST-1'])
+
+    assert list(get_next_sprint_issues(mock_jira)) == ['TEST-1']
+    assert mock_jira.create_filter.call_args.kwargs['jql'] == 'Sprint IN (123,124)'
+    mock_jira.search_issues_iter.assert_called_once_with(jql_str='filter = 10', fields=['testfield'], expand='')
+
+    # The filter has been deleted in Jira, so the original query is used.
+    mock_jira.search_issues_iter.side_effect = [JIRAError("The filter does not exist."), iter(['TEST-2'])]
+    assert list(get_next_sprint_issues(mock_jira)) == ['TEST-2']
+    assert mock_jira.search_issues_iter.call_args.kwargs['jql_str'] == 'Sprint IN (123,124)'
+
+
 @override_settings(SPRINT_STATUS_BACKLOG="backlog")
 @patch("sprints.dashboard.automation.get_all_sprints")
 @pytest.mark.parametrize(
@@ -113,19 +134,19 @@ def test_get_unestimated_next_sprint_issues(get_all_sprints: Mock, sprints_all:
         'all': sprints_all,
     }
     mock_jira = Mock()
-    mock_jira.search_issues = Mock()
+    mock_jira.search_issue_records_iter = Mock(return_value=iter([]))
 
     with raises:
         get_unestimated_next_sprint_issues(mock_jira)
 
-        mock_jira.search_issues.assert_called_once_with(
-            jql_str=f'Sprint IN (123,124,125) '
-            f'AND "{settings.JIRA_FIELDS_STATUS}" != "{settings.SPRINT_STATUS_ARCHIVED}" '
+        mock_jira.search_issue_records_iter.assert_called_once_with(
+            f'Sprint IN (123,124,125) '
+            f'AND {settings.JIRA_FIELDS_STATUS} != "{settings.SPRINT_STATUS_ARCHIVED}" '
             f'AND "{settings.JIRA_FIELDS_STORY_POINTS}" is EMPTY '
-            f'AND issuetype NOT IN subTaskIssueTypes()'
-            f'AND status = backlog',
+            f'AND issuetype NOT IN subTaskIssueTypes() '
+            f'AND status = "backlog"',
             fields=['None'],
-            maxResults=0,
+            cached=True,
         )
 
 
@@ -349,14 +370,12 @@ USER_4 = Mock(name="User4", raw="test_data")
 USER_5 = Mock(name="User5", raw=None)  # Special case - artificial user (like "Unassigned").
 
 
-@patch("sprints.dashboard.automation.Dashboard")
-@patch("sprints.dashboard.automation.get_cells")
+@patch("sprints.dashboard.automation.get_dashboards")
 @pytest.mark.parametrize(
-    "cells, dashboards, expected",
+    "dashboards, expected",
     [
-        ([], [], {}),
+        ([], {}),
         (
-            [MockItem(name="T1", board_id=1), MockItem(name="T2", board_id=2), MockItem(name="T3", board_id=2)],
             [
                 Mock(
                     cell=MockItem(name="T1"),
@@ -383,15 +402,12 @@ USER_5 = Mock(name="User5", raw=None)  # Special case - artificial user (like "U
         ),
     ],
 )
-def test_get_overcommitted_users(
-    mock_get_cells: Mock, mock_dashboard: Mock, cells: list[MockItem], dashboards: list[Mock], expected: list[str]
-):
+def test_get_overcommitted_users(mock_get_dashboards: Mock, dashboards: list[Mock], expected: list[str]):
     mock_jira = Mock()
-    mock_get_cells.return_value = cells
-
-    mock_dashboard.side_effect = dashboards
+    mock_get_dashboards.return_value = dict(enumerate(dashboards))
 
     assert get_overcommitted_users(mock_jira) == expected
+    mock_get_dashboards.assert_called_once_with(mock_jira)
 
 
 @patch("sprints.dashboard.automation.get_sprint_number")
@@ -1,4 +1,5 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import (
     Mock,
     patch
@@ -6,11 +7,16 @@ from unittest.mock import (
 
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import override_settings
+from jira import JIRAError
 
 from sprints.dashboard.models import (
     Dashboard,
+    DashboardInputs,
     DashboardIssue,
+    VacationIndex,
+    get_dashboards,
 )
 from sprints.dashboard.tests.helpers import does_not_raise
 
@@ -185,6 +191,123 @@ def test_get_vacation_for_day(commitments, date, planned_commitments, username,
     assert mock_dashboard._get_vacation_for_day(commitments, date, planned_commitments, username) == expected
 
 
+def test_vacation_index():
+    vacations = [
+        {"user": "John", "start": {"date": "2020-11-10"}, "end": {"date": "2020-11-17"}, "seconds": 0},
+        {"user": "Jo", "start": {"date": "2020-11-30"}, "end": {"date": "2020-12-10"}, "seconds": 3600},
+        {"user": "Jane", "start": {"date": "2020-11-20"}, "end": {"date": "2020-11-20"}, "seconds": 0},
+        {"user": "Johnny", "start": {"date": "2020-11-20"}, "end": {"date": "2020-11-20"}, "seconds": 0},
+        {"user": "John", "start": {"date": "2020-12-05"}, "end": {"date": "2020-12-06"}, "seconds": 0},
+    ]
+    index = VacationIndex(vacations, "2020-11-16", "2020-12-01")
+
+    # Vacations are matched by the prefixes of the names and limited to the range.
+    assert sorted(index.get_days("John Doe")) == [
+        ("2020-11-16", 0),
+        ("2020-11-17", 0),
+        ("2020-11-30", 3600),
+        ("2020-12-01", 3600),
+    ]
+    assert list(index.get_days("Jane Doe")) == [("2020-11-20", 0)]
+    assert list(index.get_days("Jack Doe")) == []
+    assert list(index.get_days("")) == []
+
+
+def test_dashboard_inputs_are_retrieved_once():
+    inputs = DashboardInputs(['user1', 'user2'])
+    retrieve = Mock(return_value=['vacation'])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: inputs.get(('vacations', '2019-01-01'), retrieve), range(8)))
+
+    assert results == [['vacation']] * 8
+    retrieve.assert_called_once()
+    assert inputs.members == ['user1', 'user2']
+
+
+@patch("sprints.dashboard.models.Dashboard")
+@patch("sprints.dashboard.models.Topology")
+def test_get_dashboards(mock_topology: Mock, mock_dashboard: Mock):
+    mock_topology.return_value.cells = [Mock(board_id=1), Mock(board_id=2)]
+    mock_topology.return_value.membership = {'user1': 'T1', 'user2': 'T2'}
+    mock_dashboard.side_effect = lambda board_id, *_args: f'dashboard{board_id}'
+    conn = Mock()
+
+    assert get_dashboards(conn) == {1: 'dashboard1', 2: 'dashboard2'}
+    # All dashboards share the topology and the inputs.
+    topologies = {call.args[2] for call in mock_dashboard.call_args_list}
+    inputs = {call.args[3] for call in mock_dashboard.call_args_list}
+    assert topologies == {mock_topology.return_value}
+    assert len(inputs) == 1
+    assert inputs.pop().members == ['user1', 'user2']
+
+
+@override_settings(JIRA_SAVED_FILTERS=True, JIRA_INCREMENTAL_DASHBOARD=True)
+def test_get_issues_with_saved_filter():
+    cache.clear()
+    conn = Mock()
+    conn.favourite_filters.return_value = []
+    conn.create_filter.return_value = Mock(id='10')
+    conn.search_raw_issues_iter.return_value = iter([])
+
+    def get_issues() -> None:
+        dashboard = Dashboard.__new__(Dashboard)
+        dashboard.jira_connection = conn
+        dashboard.inputs = DashboardInputs()
+        dashboard.active_sprints = [Mock(id=1)]
+        dashboard.future_sprints = [Mock(id=2)]
+        dashboard.issue_fields = {'Summary': 'summary'}
+        dashboard.get_issues()
+        assert dashboard.issues == []
+
+    get_issues()
+    assert conn.create_filter.call_args.kwargs['jql'].startswith('(Sprint IN (1,2) AND status IN')
+    conn.search_raw_issues_iter.assert_called_once_with('filter = 10', ['summary'])
+
+    # The filter has been deleted in Jira, so the original query is used (with its own snapshot of the issues).
+    conn.search_raw_issues_iter.side_effect = [JIRAError("The filter does not exist."), iter([])]
+    get_issues()
+    assert conn.search_raw_issues_iter.call_args.args[0].startswith('(Sprint IN (1,2) AND status IN')
+
+
+def test_aggregate_rows():
+    def get_issue(assignee, reviewer, **kwargs):
+        attributes = {
+            'assignee': assignee,
+            'reviewer_1': reviewer,
+            'is_epic': False,
+            'status': settings.SPRINT_STATUS_IN_PROGRESS,
+            'time_estimate': 3600,
+            'current_sprint': False,
+            'is_flagged': False,
+            'assignee_time': 100,
+            'review_time': 10,
+            'recurring_time': 1000,
+            'epic_management_time': 10000,
+        }
+        attributes.update(kwargs)
+        return Mock(**attributes)
+
+    issues = [
+        get_issue('user1', 'user2', current_sprint=True),
+        get_issue('user1', 'user2', current_sprint=True, status=settings.SPRINT_STATUS_EXTERNAL_REVIEW),
+        get_issue('user2', 'user3', is_flagged=True, time_estimate=0),
+        get_issue('user3', 'user1', status=settings.SPRINT_STATUS_RECURRING),
+        get_issue('user3', 'user1', is_epic=True),
+    ]
+    # noinspection PyTypeChecker
+    rows = Dashboard._aggregate_rows(Mock(), issues)
+
+    assert list(rows) == ['user1', 'user2', 'user3']
+    assert {user: [getattr(row, column) for column in row.TIME_COLUMNS] for user, row in rows.items()} == {
+        'user1': [100, 0, 100, 0, 10, 0, 0],
+        'user2': [0, 10, 0, 100, 0, 0, 100],
+        'user3': [0, 0, 0, 1000, 10, 10000, 10],
+    }
+    assert rows['user2'].future_unestimated == [issues[2]]
+    assert rows['user1'].current_unestimated == []
+
+
 @pytest.mark.parametrize(
     "story_points, expected_hours",
     [
@@ -0,0 +1,95 @@
+import time
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+
+from sprints.dashboard.sprint_calendar import (
+    get_current_sprint_end_date,
+    get_current_sprint_start_date,
+    get_sprint_calendar,
+    invalidate_sprint_calendar,
+    refresh_sprint_calendar,
+)
+from sprints.dashboard.tests.test_utils import (
+    MockItem,
+    MockJiraConnection,
+)
+
+DATES = {'active': ('2019-01-01', '2019-01-14')}
+
+
+@pytest.fixture(autouse=True)
+def clear_calendar():
+    cache.clear()
+    invalidate_sprint_calendar()
+    yield
+    invalidate_sprint_calendar()
+
+
+def test_refresh_sprint_calendar():
+    # noinspection PyTypeChecker
+    entry = refresh_sprint_calendar(MockJiraConnection())
+    assert entry['dates'] == {
+        'active': ('2019-01-01', '2019-01-14'),
+        'future': ('2019-01-01', '2019-01-14'),
+        'cell1': ('2019-01-01', '2019-01-14'),
+        'cell2': ('2019-01-01', '2019-01-14'),
+    }
+    assert cache.get(settings.CACHE_SPRINT_CALENDAR_KEY) == entry
+    assert get_current_sprint_start_date('cell', '2') == '2019-01-01'
+    assert get_current_sprint_end_date('future') == '2019-01-14'
+
+
+@patch("sprints.dashboard.sprint_calendar.get_cells")
+@patch("sprints.dashboard.sprint_calendar.get_all_sprints")
+def test_refresh_sprint_calendar_without_future_sprints(mock_get_all_sprints: Mock, mock_get_cells: Mock):
+    mock_get_cells.return_value = []
+    mock_get_all_sprints.return_value = {
+        'active': [MockItem(id=1, name='T1.123 (2019-01-01)', state='active')],
+        'future': [],
+        'all': [],
+    }
+
+    # noinspection PyTypeChecker
+    entry = refresh_sprint_calendar(Mock())
+    assert entry['dates'] == {'active': ('2019-01-01', '2019-01-14')}
+
+
+@patch("sprints.dashboard.sprint_calendar.refresh_sprint_calendar")
+def test_get_sprint_calendar_served_from_memory(mock_refresh: Mock):
+    mock_refresh.return_value = {'dates': DATES, 'refresh_at': time.time() + 60}
+
+    with patch.object(cache, 'get', wraps=cache.get) as mock_get:
+        assert get_sprint_calendar() == DATES
+        assert get_sprint_calendar() == DATES
+        assert mock_get.call_count == 1
+    mock_refresh.assert_called_once()
+    assert cache.get(settings.CACHE_SPRINT_CALENDAR_LOCK) is None
+
+
+@patch("sprints.dashboard.sprint_calendar.refresh_sprint_calendar")
+@patch("sprints.dashboard.sprint_calendar.time.sleep")
+def test_get_sprint_calendar_waits_for_other_process(mock_sleep: Mock, mock_refresh: Mock):
+    cache.set(settings.CACHE_SPRINT_CALENDAR_LOCK, True)
+    # The other process stores the calendar while this one is waiting.
+    mock_sleep.side_effect = lambda _seconds: cache.set(
+        settings.CACHE_SPRINT_CALENDAR_KEY, {'dates': DATES, 'refresh_at': time.time() + 60}
+    )
+
+    assert get_sprint_calendar() == DATES
+    mock_sleep.assert_called_once()
+    mock_refresh.assert_not_called()
+
+
+@patch("sprints.dashboard.libs.background.threading.Thread")
+def test_get_sprint_calendar_refreshes_stale_dates_in_background(mock_thread: Mock):
+    cache.set(settings.CACHE_SPRINT_CALENDAR_KEY, {'dates': DATES, 'refresh_at': time.time() - 1})
+
+    assert get_sprint_calendar() == DATES
+    mock_thread.return_value.start.assert_called_once()
+    assert cache.get(settings.CACHE_SPRINT_CALENDAR_LOCK)
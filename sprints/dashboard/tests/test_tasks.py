@@ -0,0 +1,51 @@
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+from django.test import override_settings
+from jira import JIRAError
+
+from sprints.dashboard.tasks import (
+    add_spillover_reminder_comment_task,
+    add_spillover_reminder_comments_task,
+)
+
+
+@override_settings(SPILLOVER_REMINDER_MESSAGE='reminder', SPILLOVER_CLEAN_HINTS_MESSAGE='hints')
+@patch("sprints.dashboard.tasks.logger")
+@patch("sprints.dashboard.tasks.connect_to_jira")
+def test_add_spillover_reminder_comments_task(mock_connect_to_jira: Mock, mock_logger: Mock):
+    conn = mock_connect_to_jira.return_value.__enter__.return_value
+    conn.add_comment.side_effect = lambda issue_key, _body: _raise_for(issue_key, 'TEST-3')
+    reminders = [
+        ['TEST-1', 'john', False],
+        ['TEST-1', 'john', False],
+        ['TEST-2', 'jane', True],
+        ['TEST-3', 'jack', False],
+    ]
+
+    add_spillover_reminder_comments_task(reminders)
+
+    mock_connect_to_jira.assert_called_once()
+    assert conn.add_comment.call_count == 3
+    conn.add_comment.assert_any_call('TEST-1', '[~john], reminder')
+    conn.add_comment.assert_any_call('TEST-2', '[~jane], hints')
+    failed = mock_logger.warning.call_args.args[2]
+    assert list(failed) == ['TEST-3:jack']
+    assert 'Not found.' in failed['TEST-3:jack']
+
+
+@override_settings(SPILLOVER_REMINDER_MESSAGE='reminder', SPILLOVER_CLEAN_HINTS_MESSAGE='hints')
+@patch("sprints.dashboard.tasks.connect_to_jira")
+def test_add_spillover_reminder_comment_task(mock_connect_to_jira: Mock):
+    conn = mock_connect_to_jira.return_value.__enter__.return_value
+
+    add_spillover_reminder_comment_task('TEST-1', 'john', clean_sprint=True)
+
+    conn.add_comment.assert_called_once_with('TEST-1', '[~john], hints')
+
+
+def _raise_for(issue_key: str, failing_key: str) -> None:
+    if issue_key == failing_key:
+        raise JIRAError(text="Not found.")
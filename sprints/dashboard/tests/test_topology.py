@@ -0,0 +1,145 @@
+import contextvars
+import threading
+from multiprocessing.pool import ThreadPool
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from jira.resources import Sprint
+
+from sprints.dashboard.libs.scope import memoization_scope
+from sprints.dashboard.tests.helpers import does_not_raise
+from sprints.dashboard.tests.test_utils import MockItem
+from sprints.dashboard.topology import (
+    Topology,
+    invalidate_topology,
+)
+from sprints.dashboard.utils import forget_sprints
+
+OPTIONS = {'server': 'https://jira.example.com', 'agile_rest_path': 'agile', 'agile_rest_api_version': '1.0'}
+
+
+def get_mock_connection() -> Mock:
+    conn = Mock(_options=OPTIONS, _session=None)
+    conn.boards.return_value = [
+        MockItem(id=1, name=f'{settings.JIRA_SPRINT_BOARD_PREFIX}Test1'),
+        MockItem(id=2, name=f'{settings.JIRA_SPRINT_BOARD_PREFIX}Test2'),
+    ]
+    conn.projects.return_value = [MockItem(name='Test1', key='T1'), MockItem(name='Test2', key='T2')]
+    conn.quickfilters.side_effect = lambda board_id: [
+        MockItem(query=f'assignee = user{board_id} or reviewer_1 = user{board_id} or reviewer_2 = user{board_id}'),
+        MockItem(query='labels = Test'),
+    ]
+    conn.sprints.side_effect = lambda board_id, **_kwargs: {
+        1: [
+            Sprint(OPTIONS, None, {'id': 1, 'name': 'T1.123 (2019-01-01)', 'state': 'active'}),
+            Sprint(OPTIONS, None, {'id': 3, 'name': 'T1.124 (2019-01-15)', 'state': 'future'}),
+        ],
+        2: [
+            Sprint(OPTIONS, None, {'id': 2, 'name': 'T2.123 (2019-01-01)', 'state': 'active'}),
+            Sprint(OPTIONS, None, {'id': 4, 'name': 'T2.124 (2019-01-15)', 'state': 'future'}),
+        ],
+    }[board_id]
+    return conn
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.mark.parametrize(
+    "field, value, expected, raises",
+    [
+        ('board_id', 1, 'T1', does_not_raise()),
+        ('board_id', 2, 'T2', does_not_raise()),
+        ('board_id', 3, None, pytest.raises(ValueError)),
+        ('key', 'T2', 'T2', does_not_raise()),
+        ('key', 'T3', None, pytest.raises(ValueError)),
+        ('name', 'Test1', 'T1', does_not_raise()),
+        ('name', 'Test3', None, pytest.raises(ValueError)),
+    ],
+)
+def test_topology_get_cell(field, value, expected, raises):
+    topology = Topology(get_mock_connection())
+    getter = {
+        'board_id': topology.get_cell,
+        'key': topology.get_cell_by_key,
+        'name': topology.get_cell_by_name,
+    }[field]
+    with raises:
+        assert getter(value).key == expected
+
+
+def test_topology_members_and_sprints():
+    topology = Topology(get_mock_connection())
+
+    assert [cell.name for cell in topology.cells] == ['Test1', 'Test2']
+    assert topology.get_members(2) == ['user2']
+    assert topology.membership == {'user1': 'Test1', 'user2': 'Test2'}
+    assert [sprint.id for sprint in topology.get_sprints(1)] == [1, 3]
+
+    sprints = topology.get_all_sprints(1)
+    assert [sprint.id for sprint in sprints['active']] == [1, 2]
+    assert [sprint.id for sprint in sprints['future']] == [3, 4]
+    assert [sprint.id for sprint in sprints['cell']] == [1, 3]
+
+
+def test_topology_sprints_are_retrieved_once():
+    conn = get_mock_connection()
+    topology = Topology(conn)
+
+    with memoization_scope():
+        topology.get_all_sprints(1)
+        topology.get_sprints(2)
+        assert conn.sprints.call_count == 2
+
+        # The dashboards of the cells retrieve the sprints concurrently, but only one of them calls Jira. Its requests
+        # for both boards are sent in parallel, so they pass the barrier.
+        barrier = threading.Barrier(2)
+        get_sprints = conn.sprints.side_effect
+
+        def sprints(board_id, **kwargs):
+            barrier.wait(timeout=5)
+            return get_sprints(board_id, **kwargs)
+
+        conn.sprints.side_effect = sprints
+        forget_sprints()
+        with ThreadPool(processes=2) as pool:
+            contexts = [contextvars.copy_context() for _ in range(2)]
+            pool.map(lambda context: context.run(topology.get_all_sprints), contexts)
+    assert conn.sprints.call_count == 4
+
+
+def test_topology_is_shared_via_cache():
+    conn = get_mock_connection()
+    Topology(conn).get_cell(1)
+    Topology(conn).get_cell(2)
+    assert conn.boards.call_count == 1
+    assert conn.quickfilters.call_count == 2
+
+    invalidate_topology()
+    topology = Topology(conn)
+    assert topology.get_cell(1).key == 'T1'
+    assert conn.boards.call_count == 2
+
+    # The instance keeps its data, so the lookups within a single request are consistent.
+    invalidate_topology()
+    assert topology.get_cell(2).key == 'T2'
+    assert conn.boards.call_count == 2
+
+
+def test_topology_refresh_interrupted_by_invalidation():
+    conn = get_mock_connection()
+    topology = Topology(conn)
+
+    with patch('sprints.dashboard.topology.get_cells', side_effect=lambda conn_: invalidate_topology() or []):
+        topology.refresh()
+    assert topology.cells == []
+
+    # The data retrieved before the invalidation has not been stored as the current version.
+    assert [cell.key for cell in Topology(conn).cells] == ['T1', 'T2']
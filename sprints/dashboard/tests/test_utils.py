@@ -1,5 +1,6 @@
 import inspect
 import re
+import time
 from collections import defaultdict
 from typing import Optional
 from unittest import TestCase
@@ -10,14 +11,20 @@ from unittest.mock import (
 )
 
 import pytest
+import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.test import override_settings
 from jira import User as JiraUser
 from jira.resources import Sprint, Issue
 
+from sprints.dashboard.libs.jira import parse_issue_records
+from sprints.dashboard.libs.scope import memoization_scope
 from sprints.dashboard.tests.helpers import does_not_raise
 from sprints.dashboard.utils import (
     NoRolesFoundException,
+    ParsedSprint,
+    SprintIndex,
     _column_number_to_excel,
     _extract_sprint_start_date_from_sprint_name,
     _get_sprint_meeting_day_division_for_member,
@@ -25,19 +32,22 @@ from sprints.dashboard.utils import (
     create_next_sprint,
     extract_sprint_id_from_str,
     extract_sprint_name_from_str,
+    forget_sprints,
     get_all_sprints,
-    get_cell,
     get_cell_member_roles,
     get_cell_members,
     get_cells,
     get_issue_fields,
+    get_next_cell_sprint,
     get_next_sprint,
     get_projects_dict,
     get_rotations_roles_for_member,
     get_spillover_reason,
     get_sprint_end_date,
+    get_sprint_index,
     get_sprint_number,
     get_sprint_start_date,
+    get_sprints,
     prepare_jql_query,
     prepare_jql_query_active_sprint_tickets,
     prepare_spillover_rows,
@@ -156,19 +166,6 @@ def test_get_cells():
     assert cells[1].key == 'T2'
 
 
-@pytest.mark.parametrize(
-    "test_input, expected, raises", [
-        (1, 'T1', does_not_raise()),
-        (2, 'T2', does_not_raise()),
-        (3, 'T3', pytest.raises(ValueError)),
-    ],
-)
-def test_get_cell_key(test_input, expected, raises):
-    with raises:
-        # noinspection PyTypeChecker
-        assert get_cell(MockJiraConnection(), test_input).key == expected
-
-
 def test_get_cell_members():
     quickfilters = [
         MockItem(query='assignee = Test1 or reviewer_1 = Test1 or reviewer_2 = Test1'),
@@ -203,6 +200,55 @@ def test_get_next_sprint():
     assert get_next_sprint(sprints, sprints[0]) is None  # Next sprint not found
 
 
+def test_parsed_sprint():
+    # noinspection PyTypeChecker
+    parsed = ParsedSprint(MockItem(name='T1.123 (2019-01-01)'))
+    assert (parsed.cell_key, parsed.number, parsed.start_date, parsed.end_date) == (
+        'T1', 123, '2019-01-01', '2019-01-14'
+    )
+
+    with pytest.raises(AttributeError):
+        # noinspection PyTypeChecker
+        ParsedSprint(MockItem(name='Stretch Goals'))
+
+
+def test_sprint_index():
+    sprints = [
+        MockItem(name='T1.123 (2019-01-01)'),
+        MockItem(name='T2.124 (2019-01-15)'),
+        MockItem(name='Stretch Goals'),
+        MockItem(name='T1.124 (2019-01-15)'),
+    ]
+    # noinspection PyTypeChecker
+    index = SprintIndex(sprints)
+
+    assert index.get('T1', 124) == sprints[3]
+    assert index.get('T3', 124) is None
+    # noinspection PyTypeChecker
+    assert index.get_next(sprints[0]) == sprints[1]
+    # noinspection PyTypeChecker
+    assert index.get_all_next(sprints[0]) == [sprints[1], sprints[3]]
+    # noinspection PyTypeChecker
+    assert index.get_all_next(sprints[1]) == []
+
+
+def test_get_sprint_index_memoized():
+    conn = MockJiraConnection()
+    with patch.object(MockJiraConnection, 'sprints', wraps=conn.sprints) as mock_sprints:
+        with memoization_scope():
+            # noinspection PyTypeChecker
+            index = get_sprint_index(conn, 1)
+            # noinspection PyTypeChecker
+            assert get_sprint_index(conn, 1) is index
+            # noinspection PyTypeChecker
+            assert get_next_cell_sprint(conn, 1, MockItem(name='T1.124 (2019-01-01)')).id == 4
+            mock_sprints.assert_called_once()
+
+            forget_sprints()
+            # noinspection PyTypeChecker
+            assert get_sprint_index(conn, 1) is not index
+
+
 def test_get_all_sprints():
     # noinspection PyTypeChecker
     sprints = get_all_sprints(MockJiraConnection())
@@ -224,6 +270,29 @@ def test_get_all_sprints():
     assert sprints == expected
 
 
+def test_get_all_sprints_memoized():
+    conn = MockJiraConnection()
+    with patch.object(MockJiraConnection, 'sprints', wraps=conn.sprints) as mock_sprints:
+        with memoization_scope():
+            # noinspection PyTypeChecker
+            first = get_all_sprints(conn)
+            # noinspection PyTypeChecker
+            assert get_all_sprints(conn, 1)['all'] == first['all']
+            # noinspection PyTypeChecker
+            assert get_sprints(conn, 2) == conn.sprints(2)
+            assert mock_sprints.call_count == 3  # Two boards, and the direct call above.
+
+            forget_sprints()
+            # noinspection PyTypeChecker
+            get_all_sprints(conn)
+            assert mock_sprints.call_count == 5
+
+        # Nothing is memoized outside of the scope.
+        # noinspection PyTypeChecker
+        get_all_sprints(conn)
+        assert mock_sprints.call_count == 7
+
+
 @patch("sprints.dashboard.utils._extract_sprint_start_date_from_sprint_name")
 def test_get_sprint_start_date(mock: MagicMock):
     # noinspection PyTypeChecker
@@ -241,7 +310,7 @@ def test_sprint_end_date():
 def test_prepare_jql_query():
     expected_fields = ['id', 'sprint']
     expected_result = {
-        'jql_str': r'^\(Sprint IN \(245,246\) AND status IN \(.*?\) OR \(issuetype = Epic AND Status IN \(.*?\)\)$',
+        'jql_str': r'^\(Sprint IN \(245,246\) AND status IN \(.*?\)\) OR \(issuetype = "Epic" AND status IN \(.*?\)\)$',
         'fields': expected_fields,
     }
     result = prepare_jql_query(
@@ -262,7 +331,7 @@ def test_extract_sprint_id_from_str():
 def test_prepare_jql_query_active_sprint_tickets():
     expected_fields = ['id']
     expected_result = {
-        'jql_str': 'Sprint IN openSprints() AND status IN ("Backlog","In progress","Need Review","Merged")',
+        'jql_str': 'Sprint IN openSprints() AND status IN ("Backlog","In progress","Merged","Need Review")',
         'fields': expected_fields,
     }
     result = prepare_jql_query_active_sprint_tickets(
@@ -287,7 +356,7 @@ def test_extract_sprint_start_date_from_sprint_name(test_input, expected, raises
 def test_prepare_jql_query_active_sprint_tickets_for_project():
     expected_fields = ['id']
     expected_result = {
-        'jql_str': 'project = TEST AND Sprint IN openSprints() AND status IN ("Backlog","In progress")',
+        'jql_str': 'project = "TEST" AND Sprint IN openSprints() AND status IN ("Backlog","In progress")',
         'fields': expected_fields,
     }
     result = prepare_jql_query_active_sprint_tickets(
@@ -460,6 +529,21 @@ def test_get_spillover_reason(_mock_get_sprint_start_date: MagicMock, issue: Iss
     assert get_spillover_reason(issue, issue_fields, sprint, assignee.displayName) == expected
 
 
+@patch("sprints.dashboard.utils.get_sprint_start_date", return_value="2019-01-01")
+def test_get_spillover_reason_with_lazy_comments(_mock_get_sprint_start_date: MagicMock):
+    conn = Mock()
+    conn.comments_since.return_value = iter([
+        MockItem(body="<spillover>Other user.</spillover>", author=MockUser.JACK),
+        MockItem(body="[~crafty]: <spillover>Test spillover.</spillover>", author=MockUser.JANE),
+    ])
+    issue = MockItem(key='TEST-1', fields=MockItem())
+
+    # noinspection PyTypeChecker
+    reason = get_spillover_reason(issue, {'Comment': 'comment'}, None, MockUser.JANE.displayName, conn)
+    assert reason == "Test spillover."
+    conn.comments_since.assert_called_once_with('TEST-1', '2019-01-01')
+
+
 @override_settings(JIRA_SERVER='https://example.com', SPILLOVER_REQUIRED_FIELDS=('Story Points', 'Original Estimate'))
 def test_prepare_spillover_rows():
     test_issues = [
@@ -484,6 +568,42 @@ def test_prepare_spillover_rows():
     assert prepare_spillover_rows(test_issues, issue_fields, {}) == expected_result
 
 
+@override_settings(JIRA_SERVER='https://example.com', SPILLOVER_REQUIRED_FIELDS=('Assignee', 'Status', 'Reviewer 1'))
+def test_prepare_spillover_rows_from_issue_records():
+    issue_fields = {'Assignee': 'assignee', 'Status': 'status', 'Reviewer 1': 'customfield_1'}
+    raw_issue = {
+        'id': '1',
+        'key': 'TEST-1',
+        'fields': {
+            'assignee': {'name': 'jdoe', 'key': 'jdoe', 'displayName': 'John Doe'},
+            'status': {'id': '3', 'name': 'In progress'},
+            'customfield_1': None,
+        },
+    }
+    issues = parse_issue_records([raw_issue], list(issue_fields.values()))
+
+    assert prepare_spillover_rows(issues, issue_fields, {}) == [
+        ['=HYPERLINK("https://example.com/browse/TEST-1","TEST-1")', 'John Doe', 'In progress', 'None'],
+    ]
+
+
+@override_settings(SPILLOVER_REQUIRED_FIELDS=('Assignee', 'Comment'))
+@patch("sprints.dashboard.utils.get_spillover_reason")
+def test_prepare_spillover_rows_collects_reminders(mock_get_spillover_reason: Mock):
+    mock_get_spillover_reason.side_effect = lambda issue, *_args: '' if issue.key == 'TEST-1' else 'Reason.'
+    test_issues = [
+        MockItem(key='TEST-1', fields=MockItem(assignee=MockItem(displayName='John Doe', name='john'), comment=None)),
+        MockItem(key='TEST-2', fields=MockItem(assignee=MockItem(displayName='Jane Doe', name='jane'), comment=None)),
+    ]
+    issue_fields = {'Assignee': 'assignee', 'Comment': 'comment'}
+    reminders = []
+
+    # noinspection PyTypeChecker
+    rows = prepare_spillover_rows(test_issues, issue_fields, {}, reminders)
+    assert [row[-1] for row in rows] == ['', 'Reason.']
+    assert reminders == [('TEST-1', 'john', False)]
+
+
 @pytest.mark.parametrize(
     "test_input, expected", [
         (1, 'A'),
@@ -521,8 +641,9 @@ def test_get_sprint_meeting_day_division_for_member(hours, expected):
 
 @patch("requests.get")
 def test_get_cell_member_roles(mock_get):
+    cache.clear()
     with open("sprints/dashboard/tests/data/handbook/dummy_cells.html", 'r') as f:
-        mock_get.return_value = Mock(text=f.read())
+        mock_get.return_value = Mock(text=f.read(), status_code=200, headers={})
         output = dict(get_cell_member_roles())
         expected_output = {
             "Member Six": ["Recruitment manager"],
@@ -538,12 +659,69 @@ def test_get_cell_member_roles(mock_get):
 
 @patch("requests.get")
 def test_get_cell_member_roles_corrupted(mock_get):
+    cache.clear()
     with open("sprints/dashboard/tests/data/handbook/dummy_cells_corrupted.html", 'r') as f:
-        mock_get.return_value = Mock(text=f.read())
+        mock_get.return_value = Mock(text=f.read(), status_code=200, headers={})
         with TestCase().assertRaises(NoRolesFoundException):
             get_cell_member_roles()
 
 
+@patch("sprints.dashboard.libs.background.threading.Thread")
+@patch("requests.get")
+def test_get_cell_member_roles_cached(mock_get, mock_thread):
+    cache.clear()
+    mock_thread.side_effect = lambda target, **_kwargs: Mock(start=target)
+    with open("sprints/dashboard/tests/data/handbook/dummy_cells.html", 'r') as f:
+        mock_get.return_value = Mock(text=f.read(), status_code=200, headers={'ETag': '"v1"'})
+    expected_output = dict(get_cell_member_roles())
+
+    # The roles are served from the cache.
+    assert dict(get_cell_member_roles()) == expected_output
+    mock_get.assert_called_once_with(
+        settings.HANDBOOK_ROLES_PAGE, headers={}, timeout=settings.HANDBOOK_ROLES_PAGE_TIMEOUT
+    )
+
+    # The outdated roles are revalidated with a conditional request.
+    entry = cache.get(settings.CACHE_HANDBOOK_ROLES_KEY)
+    cache.set(settings.CACHE_HANDBOOK_ROLES_KEY, {**entry, 'revalidate_at': 0})
+    with override_settings(CACHE_HANDBOOK_ROLES_REVALIDATE_SECONDS=-1):
+        mock_get.return_value = Mock(status_code=304, headers={'ETag': '"v1"'})
+        assert dict(get_cell_member_roles()) == expected_output
+        mock_get.assert_called_with(
+            settings.HANDBOOK_ROLES_PAGE,
+            headers={'If-None-Match': '"v1"'},
+            timeout=settings.HANDBOOK_ROLES_PAGE_TIMEOUT,
+        )
+
+        # The last known roles are used when the handbook is unavailable.
+        mock_get.side_effect = requests.Timeout
+        assert dict(get_cell_member_roles()) == expected_output
+        assert dict(get_cell_member_roles()) == expected_output
+    assert mock_get.call_count == 4
+    assert cache.get(settings.CACHE_HANDBOOK_ROLES_LOCK) is None
+
+
+@patch("sprints.dashboard.libs.background.threading.Thread")
+@patch("requests.get")
+def test_get_cell_member_roles_keeps_expiry_when_handbook_is_unavailable(mock_get, mock_thread):
+    cache.clear()
+    mock_thread.side_effect = lambda target, **_kwargs: Mock(start=target)
+    mock_get.side_effect = requests.Timeout
+    entry = {'roles': {'John Doe': ['Sprint manager']}, 'revalidate_at': 0, 'expires_at': time.time() + 100}
+    cache.set(settings.CACHE_HANDBOOK_ROLES_KEY, entry)
+
+    with patch.object(cache, 'set') as mock_set:
+        assert dict(get_cell_member_roles()) == {'John Doe': ['Sprint manager']}
+    timeout = mock_set.call_args.args[2]
+    assert 0 < timeout <= 100
+
+    # The expired roles are not stored again.
+    cache.set(settings.CACHE_HANDBOOK_ROLES_KEY, {**entry, 'expires_at': time.time() - 1})
+    with patch.object(cache, 'set') as mock_set:
+        get_cell_member_roles()
+    mock_set.assert_not_called()
+
+
 def test_get_rotations_roles_for_member():
     # When the member is on FF duty
     output = get_rotations_roles_for_member('John Doe', {'FF': ['Jake Doe', 'John Doe'], 'DD': ['Jane Doe', 'James Doe']})
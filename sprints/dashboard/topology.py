@@ -0,0 +1,153 @@
+"""Materialized topology of the cells - their boards and members."""
+import time
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+from jira.resources import Sprint
+
+from sprints.dashboard.libs.jira import (
+    AsyncCustomJira,
+    CustomJira,
+)
+from sprints.dashboard.utils import (
+    Cell,
+    get_all_sprints,
+    get_cell_members,
+    get_cells,
+    get_sprints,
+)
+
+# Bump this when changing the structure of the cached topology, so the entries stored by the previous version of the
+# code are not used.
+TOPOLOGY_SCHEMA_VERSION = 2
+
+
+class Topology:
+    """
+    Cells with their sprint boards and members, with O(1) lookups by the board ID, cell key and cell name.
+
+    The topology is built once and stored in the cache, so it is shared between the processes. It is refreshed
+    periodically by `refresh_topology_task` and invalidated (with `invalidate_topology`) when the sprints are completed,
+    as the cell members are usually modified between the sprints.
+
+    The sprints change more often, so they are not stored in the topology. They are retrieved with `utils.get_sprints`
+    and `utils.get_all_sprints`, which memoize them within the current task or request.
+    """
+
+    def __init__(self, conn: CustomJira) -> None:
+        self.conn = conn
+        self._cells: List[Cell] = []
+        self._members: Dict[int, List[str]] = {}
+        self._indexes: Dict[str, Dict] = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        """Load the topology from the cache, or from Jira if it has not been cached yet."""
+        if self._loaded:
+            return
+        data = cache.get(_get_cache_key())
+        if data is None:
+            self.refresh()
+        else:
+            self._set_data(data)
+
+    @property
+    def cells(self) -> List[Cell]:
+        """All cells."""
+        self._load()
+        return self._cells
+
+    @property
+    def membership(self) -> Dict[str, str]:
+        """Users and the names of their cells, with `user: cell_name` entries."""
+        self._load()
+        return {member: cell.name for cell in self._cells for member in self._members[cell.board_id]}
+
+    def get_cell(self, board_id: int) -> Cell:
+        """
+        Retrieve the cell owning the sprint board.
+
+        :raises ValueError if the cell was not found (this can happen when the board is not a sprint board)
+        """
+        return self._get_by('board_id', board_id)
+
+    def get_cell_by_key(self, key: str) -> Cell:
+        """
+        Retrieve the cell by its project key.
+
+        :raises ValueError if the cell was not found
+        """
+        return self._get_by('key', key)
+
+    def get_cell_by_name(self, name: str) -> Cell:
+        """
+        Retrieve the cell by its name.
+
+        :raises ValueError if the cell was not found
+        """
+        return self._get_by('name', name)
+
+    def get_members(self, board_id: int) -> List[str]:
+        """Retrieve usernames of the cell members."""
+        return self._members[self.get_cell(board_id).board_id]
+
+    def get_sprints(self, board_id: int) -> List[Sprint]:
+        """Retrieve the active and future sprints of the sprint board. See `utils.get_sprints`."""
+        return get_sprints(self.conn, self.get_cell(board_id).board_id)
+
+    def get_all_sprints(self, board_id: Optional[int] = None) -> Dict[str, List[Sprint]]:
+        """Retrieve the sprints of all cells. See `utils.get_all_sprints`."""
+        return get_all_sprints(self.conn, board_id, self.cells)
+
+    def refresh(self) -> None:
+        """Rebuild the topology from Jira and store it in the cache."""
+        # The key is retrieved first, so the topology is not stored as the new version if it is invalidated meanwhile.
+        cache_key = _get_cache_key()
+        cells = get_cells(self.conn)
+        async_conn = AsyncCustomJira(self.conn)
+        quickfilters = async_conn.gather(*(async_conn.quickfilters(cell.board_id) for cell in cells))
+
+        data = {
+            'cells': cells,
+            'members': {
+                cell.board_id: get_cell_members(cell_filters) for cell, cell_filters in zip(cells, quickfilters)
+            },
+        }
+        cache.set(cache_key, data, settings.CACHE_TOPOLOGY_TIMEOUT)
+        self._set_data(data)
+
+    def _set_data(self, data: Dict) -> None:
+        self._cells = data['cells']
+        self._members = data['members']
+        self._indexes = {
+            field: {getattr(cell, field): cell for cell in self._cells} for field in ('board_id', 'key', 'name')
+        }
+        self._loaded = True
+
+    def _get_by(self, field: str, value) -> Cell:
+        self._load()
+        try:
+            return self._indexes[field][value]
+        except KeyError:
+            raise ValueError("Cell not found.")
+
+
+def _get_cache_key() -> str:
+    """Get the cache key of the current version of the topology."""
+    version = cache.get_or_set(settings.CACHE_TOPOLOGY_VERSION_KEY, time.time_ns, None)
+    return f'{settings.CACHE_TOPOLOGY_PREFIX}{TOPOLOGY_SCHEMA_VERSION}-{version}'
+
+
+def invalidate_topology() -> None:
+    """
+    Invalidate the cached topology.
+
+    A new version is set instead of deleting the entry, so the processes that are rebuilding the previous version
+    at the same time do not overwrite the current one with stale data. The stale entries expire on their own.
+    """
+    cache.set(settings.CACHE_TOPOLOGY_VERSION_KEY, time.time_ns(), None)
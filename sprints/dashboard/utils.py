@@ -1,18 +1,21 @@
+import functools
+import itertools
+import logging
 import re
 import string
+import time
 import requests
 from collections import defaultdict
-from datetime import (
-    datetime,
-    timedelta,
-)
+from datetime import timedelta
+from multiprocessing.pool import ThreadPool
 from typing import (
     DefaultDict,
     Dict,
-    Generator,
     Iterable,
+    Iterator,
     List,
     Optional,
+    Pattern,
     Tuple,
     Union,
 )
@@ -40,12 +43,29 @@ from jira.resources import (
 )
 
 from config.settings.base import SECONDS_IN_HOUR
+from sprints.dashboard.libs import jql
+from sprints.dashboard.libs.background import run_in_background_once
 from sprints.dashboard.libs.google import get_availability_spreadsheet
 from sprints.dashboard.libs.jira import (
     CustomJira,
+    IssueRecord,
     QuickFilter,
-    connect_to_jira,
+    RecordUser,
+)
+from sprints.dashboard.libs.scope import (
+    clear_memo,
+    get_memo,
+    in_current_context,
+    memo_lock,
 )
+from sprints.dashboard.libs.user_directory import UserDirectory
+
+
+logger = logging.getLogger(__name__)
+
+# Name of the memoized sprints of the boards.
+SPRINTS_MEMO = 'sprints'
+SPRINT_INDEXES_MEMO = 'sprint_indexes'
 
 
 class NoRolesFoundException(Exception):
@@ -82,18 +102,6 @@ def get_projects_dict(conn: CustomJira) -> Dict[str, Project]:
     return {p.name: p for p in projects}
 
 
-def get_cell(conn: CustomJira, board_id: int) -> Cell:
-    """
-    Retrieves the cell owning the sprint board.
-
-    :raises ValueError if the cell was not found (this can happen when the board is not a sprint board)
-    """
-    for cell in get_cells(conn):
-        if cell.board_id == board_id:
-            return cell
-    raise ValueError("Cell not found.")
-
-
 def get_cell_members(quickfilters: List[QuickFilter]) -> List[str]:
     """Extracts the cell members' usernames from quickfilters."""
     members = []
@@ -105,28 +113,10 @@ def get_cell_members(quickfilters: List[QuickFilter]) -> List[str]:
     return members
 
 
-def get_cell_membership(conn: CustomJira) -> dict[str, str]:
-    """
-    Get a dict with users and their cell membership for querying it by user.
-
-    :param conn: Jira connection.
-    :return: Dict with `user: cell_name` entries.
-    """
-    cells = get_cells(conn)
-    cell_membership = {}
-
-    for cell in cells:
-        quickfilters = conn.quickfilters(cell.board_id)
-        members = get_cell_members(quickfilters)
-        for member in members:
-            cell_membership[member] = cell.name
-
-    return cell_membership
-
-
 def get_cell_member_names(conn: CustomJira, members: Iterable[str]) -> Dict[str, str]:
     """Returns cell members with their names."""
-    return {conn.user(member).displayName: member for member in members}
+    directory = UserDirectory(conn)
+    return {directory[member].displayName: member for member in members}
 
 
 def get_cell_member_roles() -> DefaultDict[str, List[str]]:
@@ -140,6 +130,9 @@ def get_cell_member_roles() -> DefaultDict[str, List[str]]:
         2. Rotations spreadsheet (sprint roles - e.g. "Firefighter", "Discovery Duty")
         3. Jira (matching users with their email addresses).
     Therefore we should ensure that users' names don't contain any typos, as this will provide inaccurate results.
+
+    The roles are cached and revalidated in the background, so this waits for the handbook only when the roles have not
+    been retrieved yet. If the handbook is unavailable, then the last known roles are returned.
     """
 
     if settings.FEATURE_CELL_ROLES:
@@ -150,25 +143,84 @@ def get_cell_member_roles() -> DefaultDict[str, List[str]]:
                 f"Handbook roles page ({settings.HANDBOOK_ROLES_PAGE}) specified is not a valid url"
             )
 
-    r = requests.get(settings.HANDBOOK_ROLES_PAGE)
+    entry = cache.get(settings.CACHE_HANDBOOK_ROLES_KEY)
+    if entry is None:
+        entry = _fetch_cell_member_roles()
+    elif time.time() >= entry['revalidate_at']:
+        _revalidate_cell_member_roles_in_background(entry)
+
+    return defaultdict(list, {member: list(roles) for member, roles in entry['roles'].items()})
+
+
+def _fetch_cell_member_roles(entry: Optional[Dict] = None) -> Dict:
+    """
+    Retrieve the roles from the handbook and store them in the cache.
+
+    If the previous `entry` is specified, then the page is retrieved only if it has been modified since then.
+    :raises NoRolesFoundException if the page does not contain any roles
+    :raises requests.RequestException if the page could not be retrieved
+    """
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    r = requests.get(settings.HANDBOOK_ROLES_PAGE, headers=headers, timeout=settings.HANDBOOK_ROLES_PAGE_TIMEOUT)
+    if entry and r.status_code == 304:
+        roles_dict = entry['roles']
+    else:
+        r.raise_for_status()
+
+        # roles = [('Recruitment manager', 'John Doe'),('Sprint Planning Manager', 'John Doe'),...]
+        roles = re.findall(settings.ROLES_REGEX, r.text)
+
+        # roles_dict = {'John Doe': ['Recruitment Manager', 'Sprint Planning Manager',...],...}
+        roles_dict = defaultdict(list)
+        for role, member in roles:
+            roles_dict[member].append(role)
+
+        # If we haven't read any roles, then something must have went wrong.
+        if len(roles_dict) == 0:
+            raise NoRolesFoundException(f"No roles were found at the handbook page: {settings.HANDBOOK_ROLES_PAGE}")
+
+    now = time.time()
+    new_entry = {
+        'roles': dict(roles_dict),
+        'etag': r.headers.get('ETag'),
+        'last_modified': r.headers.get('Last-Modified'),
+        'revalidate_at': now + settings.CACHE_HANDBOOK_ROLES_REVALIDATE_SECONDS,
+        'expires_at': now + settings.CACHE_HANDBOOK_ROLES_TIMEOUT,
+    }
+    # The roles are kept after the revalidation interval, so they can be used when the handbook is unavailable.
+    cache.set(settings.CACHE_HANDBOOK_ROLES_KEY, new_entry, settings.CACHE_HANDBOOK_ROLES_TIMEOUT)
+    return new_entry
+
 
-    # roles = [('Recruitment manager', 'John Doe'),('Sprint Planning Manager', 'John Doe'),...]
-    roles = re.findall(settings.ROLES_REGEX, r.text)
+def _revalidate_cell_member_roles_in_background(entry: Dict) -> None:
+    """
+    Revalidate the cached roles in a separate thread, unless another process is already doing this.
 
-    # roles_dict = {'John Doe': ['Recruitment Manager', 'Sprint Planning Manager',...],...}
-    roles_dict = defaultdict(list)
-    for role, member in roles:
-        roles_dict[member].append(role)
+    If the handbook is unavailable (or its format has changed), then the last known roles are kept until the next
+    revalidation, but not after they expire.
+    """
 
-    # If we haven't read any roles, then something must have went wrong.
-    if len(roles_dict) == 0:
-        raise NoRolesFoundException(f"No roles were found at the handbook page: {settings.HANDBOOK_ROLES_PAGE}")
+    def revalidate() -> None:
+        try:
+            _fetch_cell_member_roles(entry)
+        except (requests.RequestException, NoRolesFoundException):
+            logger.exception("Could not revalidate the handbook roles. Using the last known roles.")
+            now = time.time()
+            if (timeout := entry['expires_at'] - now) > 0:
+                entry['revalidate_at'] = now + settings.CACHE_HANDBOOK_ROLES_REVALIDATE_SECONDS
+                cache.set(settings.CACHE_HANDBOOK_ROLES_KEY, entry, int(timeout))
 
-    return roles_dict
+    run_in_background_once(settings.CACHE_HANDBOOK_ROLES_LOCK, settings.HANDBOOK_ROLES_PAGE_TIMEOUT * 2, revalidate)
 
 
 def compile_participants_roles(
-    members: List[User],
+    members: List[Union[User, RecordUser]],
     rotations: Dict[str, List[str]],
     cell_member_roles: DefaultDict[str, List[str]]
 ) -> DefaultDict[str, List[str]]:
@@ -199,13 +251,46 @@ def get_rotations_roles_for_member(member_name: str, rotations: Dict[str, List[s
     return roles
 
 
-def get_all_sprints(conn: CustomJira, board_id: Optional[int] = None) -> Dict[str, List[Sprint]]:
-    """Retrieves all sprints (used for handling cross-cell tickets)."""
-    cells = get_cells(conn)
-    sprints = {}
+def get_all_sprints(
+    conn: CustomJira,
+    board_id: Optional[int] = None,
+    cells: Optional[List[Cell]] = None,
+) -> Dict[str, List[Sprint]]:
+    """
+    Retrieves all sprints (used for handling cross-cell tickets).
+
+    The sprints of the boards are retrieved in parallel. Within a task or request, they are retrieved only once.
+    :param cells: all cells, if they have already been retrieved
+    """
+    if cells is None:
+        cells = get_cells(conn)
+    board_ids = [cell.board_id for cell in cells]
+
+    with memo_lock(SPRINTS_MEMO):
+        memo = get_memo(SPRINTS_MEMO)
+        if memo is None:
+            memo = {}
+        if missing_board_ids := [board_id_ for board_id_ in board_ids if board_id_ not in memo]:
+            with ThreadPool(processes=min(len(missing_board_ids), settings.MULTIPROCESSING_POOL_SIZE)) as pool:
+                board_sprints = pool.map(in_current_context(functools.partial(_fetch_sprints, conn)), missing_board_ids)
+            memo.update(zip(missing_board_ids, board_sprints))
+
+    return group_sprints(cells, {board_id_: memo[board_id_] for board_id_ in board_ids}, board_id)
+
+
+def group_sprints(
+    cells: List[Cell],
+    sprints: Dict[int, List[Sprint]],
+    board_id: Optional[int] = None,
+) -> Dict[str, List[Sprint]]:
+    """
+    Group the sprints of all cells into `active`, `future` and `all` ones.
+    :param cells: all cells
+    :param sprints: a `Dict` of board IDs as keys with lists of the boards' active and future sprints as their values
+    :param board_id: if specified, the sprints of this board are additionally returned as `cell`
+    """
     cell_key: Optional[str] = None
     for cell in cells:
-        sprints[cell.board_id] = get_sprints(conn, cell.board_id)
         if cell.board_id == board_id:
             cell_key = cell.key
 
@@ -236,75 +321,144 @@ def get_all_sprints(conn: CustomJira, board_id: Optional[int] = None) -> Dict[st
 
 
 def get_sprints(conn: CustomJira, board_id: int) -> List[Sprint]:
-    """Return the filtered list of the active and future sprints for the chosen board."""
+    """
+    Return the filtered list of the active and future sprints for the chosen board.
+
+    Within a task or request, the sprints are retrieved only once, unless they are modified with `forget_sprints`.
+    """
+    with memo_lock(SPRINTS_MEMO):
+        memo = get_memo(SPRINTS_MEMO)
+        if memo is None:
+            return _fetch_sprints(conn, board_id)
+        if board_id not in memo:
+            memo[board_id] = _fetch_sprints(conn, board_id)
+        return memo[board_id]
+
+
+def _fetch_sprints(conn: CustomJira, board_id: int) -> List[Sprint]:
     return conn.sprints(board_id, state='active, future')
 
 
+def forget_sprints() -> None:
+    """Forget the sprints memoized within the current task or request. This should be called after modifying them."""
+    clear_memo(SPRINTS_MEMO)
+    clear_memo(SPRINT_INDEXES_MEMO)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_sprint_name(sprint_name: str, regex: str) -> Optional[Tuple[str, int, str]]:
+    """Extract the cell key, number and start date from the sprint's name. The results are cached, as names repeat."""
+    search = re.search(regex, sprint_name)
+    if search:
+        return search.group(1), int(search.group(2)), search.group(3)
+    return None
+
+
+class ParsedSprint:
+    """
+    Sprint with the details extracted from its name.
+    :raises AttributeError if the format of the name is invalid
+    """
+    __slots__ = ('sprint', 'cell_key', 'number', 'start_date', 'end_date')
+
+    def __init__(self, sprint: Sprint) -> None:
+        parsed = _parse_sprint_name(sprint.name, settings.SPRINT_REGEX)
+        if not parsed:
+            raise AttributeError(
+                f'The sprint name ("{sprint.name}") does not match the "{settings.SPRINT_REGEX}" regex.'
+            )
+        self.sprint = sprint
+        self.cell_key, self.number, self.start_date = parsed
+        self.end_date = _get_sprint_end_date(self.start_date)
+
+
+class SprintIndex:
+    """
+    Index of the sprints with constant-time lookups by the cell key and sprint number.
+    Sprints with names that do not match `settings.SPRINT_REGEX` (e.g. the stretch goals sprint) are not indexed.
+    """
+
+    def __init__(self, sprints: Iterable[Sprint]) -> None:
+        self._by_number: DefaultDict[int, List[Sprint]] = defaultdict(list)
+        self._by_cell: Dict[Tuple[str, int], Sprint] = {}
+        for sprint in sprints:
+            try:
+                parsed = ParsedSprint(sprint)
+            except AttributeError:
+                continue
+            self._by_number[parsed.number].append(sprint)
+            self._by_cell.setdefault((parsed.cell_key, parsed.number), sprint)
+
+    def get(self, cell_key: str, number: int) -> Optional[Sprint]:
+        """Find the cell's sprint by its number."""
+        return self._by_cell.get((cell_key, number))
+
+    def get_next(self, previous_sprint: Sprint) -> Optional[Sprint]:
+        """
+        Find the consecutive sprint by its number.
+        :returns the first indexed `Sprint` with the next number or `None` if the sprint does not exist
+        """
+        next_sprints = self.get_all_next(previous_sprint)
+        return next_sprints[0] if next_sprints else None
+
+    def get_all_next(self, previous_sprint: Sprint) -> List[Sprint]:
+        """Find all cells' consecutive sprints by the previous sprint's number."""
+        return self._by_number.get(get_sprint_number(previous_sprint) + 1, [])
+
+
 def get_sprint_number(sprint: Sprint) -> int:
     """
     Retrieves sprint number with regex and returns it as `int`.
     :raises AttributeError if the format is invalid
     """
-    sprint_number_search = re.search(settings.SPRINT_REGEX, sprint.name)
-    if sprint_number_search:
-        return int(sprint_number_search.group(2))
+    parsed = _parse_sprint_name(sprint.name, settings.SPRINT_REGEX)
+    if parsed:
+        return parsed[1]
     else:
         raise AttributeError(f'The sprint name ("{sprint.name}") does not match the "{settings.SPRINT_REGEX}" regex.')
 
 
-def get_next_sprint(sprints: List[Sprint], previous_sprint: Sprint) -> Sprint:
+def get_sprint_index(conn: CustomJira, board_id: int) -> SprintIndex:
+    """
+    Return the index of the active and future sprints of the chosen board.
+
+    Within a task or request, the index is built only once, unless the sprints are modified with `forget_sprints`.
     """
-    Find the consecutive sprint by its number.
+    with memo_lock(SPRINT_INDEXES_MEMO):
+        memo = get_memo(SPRINT_INDEXES_MEMO)
+        if memo is None:
+            return SprintIndex(get_sprints(conn, board_id))
+        if board_id not in memo:
+            memo[board_id] = SprintIndex(get_sprints(conn, board_id))
+        return memo[board_id]
+
+
+def get_next_sprint(sprints: List[Sprint], previous_sprint: Sprint) -> Optional[Sprint]:
+    """
+    Find the consecutive sprint by its number. Use `SprintIndex` directly for multiple lookups in the same list.
     :param sprints: a list of sprints
     :param previous_sprint: previous `Sprint`
     :returns next `Sprint` or `None` if the sprint does not exist
     """
-    previous_sprint_number = get_sprint_number(previous_sprint)
-    return _get_next_sprint(sprints, previous_sprint_number)
+    return SprintIndex(sprints).get_next(previous_sprint)
 
 
-def get_next_sprints(sprints: Dict[str, List[Sprint]], previous_sprint: Sprint) -> List[Sprint]:
+def get_next_sprints(sprints: Dict[int, List[Sprint]], previous_sprint: Sprint) -> List[Sprint]:
     """
     Find all cells' consecutive sprints by the previous sprint's number.
-    :param sprints: a `Dict` of cells as keys with lists of sprints as their values
+    :param sprints: a `Dict` of board IDs as keys with lists of sprints as their values
     :param previous_sprint: previous `Sprint `
     :returns list of next sprints or empty list if no next sprint exists
     """
-    previous_sprint_number = get_sprint_number(previous_sprint)
-    result: List[Sprint] = []
-    for cell_sprints in sprints.values():
-        next_sprints = _get_next_sprint(cell_sprints, previous_sprint_number, many=True)
-        result.extend(next_sprints)
-    return result
+    return SprintIndex(itertools.chain.from_iterable(sprints.values())).get_all_next(previous_sprint)
 
 
-def get_next_cell_sprint(conn: CustomJira, board_id: int, previous_sprint: Sprint) -> Sprint:
+def get_next_cell_sprint(conn: CustomJira, board_id: int, previous_sprint: Sprint) -> Optional[Sprint]:
     """
     Find the consecutive sprint in the cell by its number. It differs from `get_next_sprint`, because it retrieves the
-    sprints via the API, so the list of the sprints does not need to be cached.
-    """
-    previous_sprint_number = get_sprint_number(previous_sprint)
-    sprints = get_sprints(conn, board_id)
-    return _get_next_sprint(sprints, previous_sprint_number)
-
-
-def _get_next_sprint(sprints: List[Sprint], previous_sprint_number: int, many=False) -> Union[Sprint, List[Sprint]]:
+    sprints via the API, so the list of the sprints does not need to be cached. See `get_sprint_index`.
     """
-    Find the consecutive sprint by its number.
-    :param many: if `True`, return `list` of next sprints (with the same number)
-    """
-    result: List[Sprint] = []
-
-    for sprint in sprints:
-        sprint_number_search = re.search(settings.SPRINT_REGEX, sprint.name)
-        if sprint_number_search:
-            sprint_number = int(sprint_number_search.group(2))
-            if previous_sprint_number + 1 == sprint_number:
-                if not many:
-                    return sprint
-                result.append(sprint)
-
-    return result if many else None
+    return get_sprint_index(conn, board_id).get_next(previous_sprint)
 
 
 def get_sprint_start_date(sprint: Sprint) -> str:
@@ -320,33 +474,13 @@ def get_sprint_end_date(sprint: Sprint) -> str:
 
 def _get_sprint_end_date(date_str: str) -> str:
     """Get the last day of the sprint, given the sprint start date."""
-    end_date = (parse(date_str) + timedelta(days=settings.SPRINT_DURATION_DAYS - 1))
-    return end_date.strftime(settings.JIRA_API_DATE_FORMAT)
-
-
-def get_current_sprint_start_date(sprint_type='active', board_id: str = '') -> str:
-    """Get the cached start of sprint date for speeding up more frequent requests."""
-    if not (result := cache.get(f"{settings.CACHE_SPRINT_START_DATE_PREFIX}{sprint_type}{board_id}")):
-        result = cache.get_or_set(
-            f"{settings.CACHE_SPRINT_START_DATE_PREFIX}{sprint_type}{board_id}",
-            get_sprint_start_date(_get_current_sprint(sprint_type, int(board_id) if board_id else None)),
-            settings.CACHE_SPRINT_DATES_TIMEOUT_SECONDS
-        )
-    return result
-
-
-def get_current_sprint_end_date(sprint_type='active', board_id: str = '') -> str:
-    """Get the cached end of sprint date for speeding up more frequent requests."""
-    start_str = get_current_sprint_start_date(sprint_type, board_id)
-    return _get_sprint_end_date(start_str)
-
+    return _shift_date(date_str, settings.SPRINT_DURATION_DAYS - 1, settings.JIRA_API_DATE_FORMAT)
 
-def _get_current_sprint(type_: str, board_id: int = None) -> Sprint:
-    """Get the current sprint. `type_` can be set to `active` or `future`."""
-    with connect_to_jira() as conn:
-        sprints = get_all_sprints(conn, board_id)[type_]
 
-    return sprints[0]
+@functools.lru_cache(maxsize=1024)
+def _shift_date(date_str: str, days: int, date_format: str) -> str:
+    """Add days to the date. The results are cached, as parsing the dates is relatively slow."""
+    return (parse(date_str) + timedelta(days=days)).strftime(date_format)
 
 
 def filter_sprints_by_cell(sprints: List[Sprint], key: str) -> List[Sprint]:
@@ -377,13 +511,19 @@ def prepare_jql_query(
     user: Optional[str] = None
 ) -> Dict[str, Union[str, List[str]]]:
     """Prepare JQL query for retrieving stories and epics for the selected cell for the current and upcoming sprint."""
-    unfinished_status = '"' + '","'.join(settings.SPRINT_STATUS_ACTIVE) + '"'
-    epic_in_progress = '"' + '","'.join(settings.SPRINT_STATUS_EPIC_IN_PROGRESS) + '"'
-    sprints_str = ','.join(sprints)
-    user_str = f'(assignee = "{user}" OR "Reviewer 1" = "{user}") AND ' if user else ''
-
-    query = f'({user_str}Sprint IN ({sprints_str}) AND ' \
-            f'status IN ({unfinished_status})) OR ({user_str}issuetype = Epic AND Status IN ({epic_in_progress}))'
+    user_clause = jql.or_(jql.eq('assignee', user), jql.eq('Reviewer 1', user)) if user else ''
+    query = jql.or_(
+        jql.and_(
+            user_clause,
+            jql.in_('Sprint', [int(sprint) for sprint in sprints]),
+            jql.in_('status', settings.SPRINT_STATUS_ACTIVE),
+        ),
+        jql.and_(
+            user_clause,
+            jql.eq('issuetype', 'Epic'),
+            jql.in_('status', settings.SPRINT_STATUS_EPIC_IN_PROGRESS),
+        ),
+    )
 
     return {
         'jql_str': query,
@@ -398,11 +538,12 @@ def prepare_jql_query_active_sprint_tickets(
     summary='',
 ) -> Dict[str, Union[str, List[str]]]:
     """Prepare JQL query for retrieving stories that spilled over before ending the sprint."""
-    required_project = f'project = {project} AND ' if project else ''
-    required_status = '"' + '","'.join(status) + '"'
-    required_summary = f" AND summary ~ {summary}" if summary else ''
-
-    query = f'{required_project}Sprint IN openSprints() AND status IN ({required_status}){required_summary}'
+    query = jql.and_(
+        jql.eq('project', project) if project else '',
+        jql.in_('Sprint', jql.Function('openSprints()')),
+        jql.in_('status', status),
+        jql.contains('summary', summary) if summary else '',
+    )
 
     return {
         'jql_str': query,
@@ -412,8 +553,12 @@ def prepare_jql_query_active_sprint_tickets(
 
 def prepare_jql_query_cell_role_epic(fields: List[str], project: str) -> Dict[str, Union[str, List[str]]]:
     """Prepare JQL query for retrieving epic for the cell role tickets."""
-    query = f'summary ~ {settings.JIRA_CELL_ROLE_EPIC_NAME} AND project = {project} AND ' \
-            f'status = {settings.SPRINT_STATUS_RECURRING} AND issuetype = Epic'
+    query = jql.and_(
+        jql.contains('summary', settings.JIRA_CELL_ROLE_EPIC_NAME),
+        jql.eq('project', project),
+        jql.eq('status', settings.SPRINT_STATUS_RECURRING),
+        jql.eq('issuetype', 'Epic'),
+    )
 
     return {
         'jql_str': query,
@@ -441,34 +586,30 @@ def extract_sprint_name_from_str(sprint_str: str) -> str:
 
 def _extract_sprint_start_date_from_sprint_name(sprint_name: str) -> str:
     """Extract sprint start date from sprint's name."""
-    search = re.search(settings.SPRINT_REGEX, sprint_name)
-    if search:
-        return search.group(3)
+    parsed = _parse_sprint_name(sprint_name, settings.SPRINT_REGEX)
+    if parsed:
+        return parsed[2]
     raise AttributeError(f"Invalid sprint name, {settings.SPRINT_REGEX} not found.")
 
 
-def daterange(start: str, end: str) -> Generator[str, None, None]:
-    """Generates days from `start_date` to `end_date` (both inclusive)."""
-    start_date = datetime.strptime(start, settings.JIRA_API_DATE_FORMAT)
-    end_date = datetime.strptime(end, settings.JIRA_API_DATE_FORMAT)
-    for n in range(int((end_date - start_date).days + 1)):
-        yield (start_date + timedelta(n)).strftime(settings.JIRA_API_DATE_FORMAT)
-
-
 def get_issue_fields(conn: CustomJira, required_fields: Iterable[str]) -> Dict[str, str]:
     """Filter Jira issue fields by their names."""
     return {field: conn.issue_fields[field] for field in required_fields}
 
 
-def get_spillover_issues(conn: CustomJira, issue_fields: Dict[str, str], project: str = '') -> List[Issue]:
-    """Retrieves all stories and epics for the current dashboard."""
-    return conn.search_issues(
+def get_spillover_issues(conn: CustomJira, issue_fields: Dict[str, str], project: str = '') -> Iterator[IssueRecord]:
+    """
+    Retrieves all stories and epics for the current dashboard.
+
+    The issues are streamed, so they need to be consumed while the connection is still checked out. Their comments are
+    not retrieved, so they need to be passed to `get_spillover_reason` along with `conn`.
+    """
+    return conn.search_issue_records_iter(
         **prepare_jql_query_active_sprint_tickets(
-            list(issue_fields.values()),
+            _get_fields_without_comments(issue_fields),
             settings.SPRINT_STATUS_SPILLOVER,
             project=project,
         ),
-        maxResults=0,
     )
 
 
@@ -477,15 +618,16 @@ def get_meetings_issue(conn: CustomJira, project: str, issue_fields: Dict[str, s
     Retrieves the Jira issue used for logging the meetings. We're using this for collecting hints for achieving
     clean sprints. It is a workaround for JQL inability to do exact match.
     https://community.atlassian.com/t5/Jira-Core-questions/How-to-query-Summary-for-EXACT-match/qaq-p/588482
+
+    The comments are not retrieved, as with `get_spillover_issues`.
     """
-    issues = conn.search_issues(
+    issues = conn.search_issues_iter(
         **prepare_jql_query_active_sprint_tickets(
-            list(issue_fields.values()) + ['summary'],
+            _get_fields_without_comments(issue_fields) + ['summary'],
             (settings.SPRINT_STATUS_RECURRING,),
             project=project,
             summary=settings.SPRINT_MEETINGS_TICKET,
         ),
-        maxResults=0,
     )
 
     for issue in issues:
@@ -493,6 +635,11 @@ def get_meetings_issue(conn: CustomJira, project: str, issue_fields: Dict[str, s
             return issue
 
 
+def _get_fields_without_comments(issue_fields: Dict[str, str]) -> List[str]:
+    """Get IDs of the issue fields, except the comments, which are retrieved lazily by `get_spillover_reason`."""
+    return [field_id for field, field_id in issue_fields.items() if field != settings.JIRA_FIELDS_COMMENT]
+
+
 def create_next_sprint(conn: CustomJira, sprints: List[Sprint], cell_key: str, board_id: int) -> Sprint:
     """Creates next sprint for the desired cell."""
     sprints = filter_sprints_by_cell(sprints, cell_key)
@@ -504,43 +651,67 @@ def create_next_sprint(conn: CustomJira, sprints: List[Sprint], cell_key: str, b
 
     sprint_number = get_sprint_number(last_sprint) + 1
 
-    return conn.create_sprint(
+    next_sprint = conn.create_sprint(
         name=f'{cell_key}.{sprint_number} ({start_date_str})',
         board_id=board_id,
         startDate=start_date_str,
         endDate=end_date_str,
     )
+    forget_sprints()
+    return next_sprint
 
 
-def get_spillover_reason(issue: Issue, issue_fields: Dict[str, str], sprint: Sprint, assignee: str) -> str:
-    """Retrieve the spillover reason from the comment matching the `settings.SPILLOVER_REASON_DIRECTIVE` regexp."""
-    # For issues spilling over more than once we need to ensure that the comment has been added in the current sprint.
-    sprint_start_date = parse(get_sprint_start_date(sprint))
+def get_spillover_reason(
+    issue: Union[Issue, IssueRecord],
+    issue_fields: Dict[str, str],
+    sprint: Sprint,
+    assignee: str,
+    conn: Optional[CustomJira] = None,
+) -> str:
+    """
+    Retrieve the spillover reason from the comment matching the `settings.SPILLOVER_REASON_DIRECTIVE` regexp.
 
-    # Check each comment created after starting the current sprint.
-    comments = getattr(issue.fields, issue_fields['Comment']).comments
-    for comment in reversed(comments):  # type: Comment
-        if assignee != comment.author.displayName:
-            continue
+    If `conn` is specified, only the comments created in the current sprint are retrieved from Jira. Otherwise, they are
+    taken from the `Comment` field of the issue.
+    """
+    # For issues spilling over more than once we need to ensure that the comment has been added in the current sprint.
+    # Jira timestamps use the ISO 8601 format, so they can be compared with the start date as strings.
+    sprint_start_date = get_sprint_start_date(sprint)
 
-        created_date = parse(comment.created)
-        if created_date < sprint_start_date:
-            break
+    # Check each comment created after starting the current sprint, starting from the newest one.
+    if conn:
+        comments: Iterable[Comment] = conn.comments_since(issue.key, sprint_start_date)
+    else:
+        comments = itertools.takewhile(
+            lambda comment: comment.created >= sprint_start_date,
+            reversed(getattr(issue.fields, issue_fields[settings.JIRA_FIELDS_COMMENT]).comments),
+        )
 
-        search = re.search(settings.SPILLOVER_REASON_DIRECTIVE, comment.body)
-        if search:
+    directive = _compile_regex(settings.SPILLOVER_REASON_DIRECTIVE)
+    for comment in comments:
+        if assignee == comment.author.displayName and (search := directive.search(comment.body)):
             return search.group(1)
 
     return ''
 
 
+@functools.lru_cache()
+def _compile_regex(pattern: str) -> Pattern:
+    return re.compile(pattern)
+
+
 def prepare_spillover_rows(
-    issues: List[Issue],
+    issues: Iterable[Union[Issue, IssueRecord]],
     issue_fields: Dict[str, str],
-    sprints: Dict[int, Sprint]
+    sprints: Dict[int, Sprint],
+    reminders: Optional[List[Tuple[str, str, bool]]] = None,
+    conn: Optional[CustomJira] = None,
 ) -> List[List[str]]:
     """
     Prepares the Google spreadsheet row in the specified format.
+    If the spillover reason hasn't been posted, the `(issue_key, assignee_key, clean_sprint)` reminder is appended to
+    `reminders`, so all of them can be posted at once with `add_spillover_reminder_comments_task`.
+    If `conn` is specified, the comments are retrieved lazily (see `get_spillover_reason`).
     Assumptions:
         - the first column contains the ID of the issue with the hyperlink to the issue,
         - the next fields are defined in `settings.SPILLOVER_REQUIRED_FIELDS`
@@ -589,17 +760,13 @@ def prepare_spillover_rows(
                         issue,
                         issue_fields,
                         current_sprint,
-                        getattr(issue.fields, issue_fields['Assignee']).displayName
+                        getattr(issue.fields, issue_fields['Assignee']).displayName,
+                        conn,
                     )
 
-                    # If the reason hasn't been posted, add comment with the reminder to the issue.
-                    if not cell_value and not settings.DEBUG:  # We don't want to ping people via the dev environment.
-                        # Avoid circular import.
-                        from sprints.dashboard.tasks import add_spillover_reminder_comment_task
-                        add_spillover_reminder_comment_task.delay(
-                            issue.key,
-                            getattr(issue.fields, issue_fields['Assignee']).name,
-                        )
+                    # If the reason hasn't been posted, remind the assignee about it.
+                    if not cell_value and reminders is not None:
+                        reminders.append((issue.key, getattr(issue.fields, issue_fields['Assignee']).name, False))
                 except AttributeError:
                     cell_value = 'Unassigned'
 
@@ -615,8 +782,13 @@ def prepare_clean_sprint_rows(
     meetings: Issue,
     issue_fields: Dict[str, str],
     sprints: Dict[int, Sprint],
+    reminders: Optional[List[Tuple[str, str, bool]]] = None,
+    conn: Optional[CustomJira] = None,
 ) -> None:
-    """Adds the Google spreadsheet row in the specified format for users who achieved clean sprint."""
+    """
+    Adds the Google spreadsheet row in the specified format for users who achieved clean sprint.
+    The reminders and comments are handled in the same way as in `prepare_spillover_rows`.
+    """
     # +1 for the issue's key
     status_index = settings.SPILLOVER_REQUIRED_FIELDS.index("Status") + 1
     sprint_index = settings.SPILLOVER_REQUIRED_FIELDS.index("Sprint") + 1
@@ -643,12 +815,11 @@ def prepare_clean_sprint_rows(
         row[status_index] = "Done"
         row[sprint_index] = extract_sprint_name_from_str(sprint)
         row[assignee_index] = member
-        row[-1] = get_spillover_reason(meetings, issue_fields, current_sprint, member)
+        row[-1] = get_spillover_reason(meetings, issue_fields, current_sprint, member, conn)
 
-        # If the reason hasn't been posted, add comment with the reminder to the issue.
-        if not row[-1] and not settings.DEBUG:  # We don't want to ping people via the dev environment.
-            from sprints.dashboard.tasks import add_spillover_reminder_comment_task  # Avoid circular import.
-            add_spillover_reminder_comment_task.delay(meetings.key, members[member], clean_sprint=True)
+        # If the reason hasn't been posted, remind the member about it.
+        if not row[-1] and reminders is not None:
+            reminders.append((meetings.key, members[member], True))
 
         rows.append(row)
 
@@ -1,3 +1,4 @@
+import hmac
 import http
 from datetime import datetime
 from typing import (
@@ -7,6 +8,10 @@ from typing import (
 from dateutil.parser import parse
 from django.conf import settings
 from django.core.cache import cache
+from django.http import (
+    HttpResponse,
+    HttpResponseForbidden,
+)
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import (
@@ -17,18 +22,19 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
 from sprints.dashboard.libs.jira import connect_to_jira
+from sprints.dashboard.libs.metrics import generate_metrics
 from sprints.dashboard.models import Dashboard
 from sprints.dashboard.serializers import (
     CellSerializer,
     DashboardSerializer,
 )
+from sprints.dashboard.sprint_calendar import get_current_sprint_end_date
 from sprints.dashboard.tasks import (
     complete_sprint_task,
     create_next_sprint_task,
 )
+from sprints.dashboard.topology import Topology
 from sprints.dashboard.utils import (
-    get_cells,
-    get_current_sprint_end_date,
     get_cell_member_roles,
     NoRolesFoundException,
 )
@@ -54,7 +60,7 @@ class DashboardViewSet(viewsets.ViewSet):
     def list(self, _request):
         """Lists all available cells."""
         with connect_to_jira() as conn:
-            cells = get_cells(conn)
+            cells = Topology(conn).cells
         serializer = CellSerializer(cells, many=True)
         return Response(serializer.data)
 
@@ -133,3 +139,17 @@ class CompleteSprintViewSet(viewsets.ViewSet):
 
         complete_sprint_task.delay(int(pk))
         return Response(data='', status=http.HTTPStatus.OK)
+
+
+def metrics_view(request):
+    """
+    Exposes the metrics of the Jira requests in the Prometheus format.
+
+    The `PROMETHEUS_METRICS_TOKEN` needs to be provided as a bearer token. If it is not set, the metrics are disabled.
+    """
+    token = settings.PROMETHEUS_METRICS_TOKEN
+    if not token or not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+
+    metrics, content_type = generate_metrics()
+    return HttpResponse(metrics, content_type=content_type)
@@ -19,7 +19,8 @@ from jira.resources import PropertyHolder
 from more_itertools import pairwise
 
 from sprints.dashboard.libs.jira import connect_to_jira
-from sprints.dashboard.utils import get_current_sprint_end_date
+from sprints.dashboard.libs.scope import in_current_context
+from sprints.dashboard.sprint_calendar import get_current_sprint_end_date
 from sprints.sustainability.utils import (
     cache_worklogs_and_issues,
     diff_month,
@@ -239,7 +240,7 @@ class SustainabilityDashboard:
         """
         with ThreadPool(processes=settings.MULTIPROCESSING_POOL_SIZE) as pool:
             results = [pool.apply_async(
-                self.fetch_accounts_chunk,
+                in_current_context(self.fetch_accounts_chunk),
                 args + (settings.CACHE_WORKLOG_TIMEOUT_ONE_TIME,),
                 error_callback=on_error,
             )
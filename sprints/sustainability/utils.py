@@ -13,14 +13,10 @@ from dateutil.parser import parse
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core.cache import cache
-from jira import (
-    JIRAError,
-    Worklog,
-)
 
+from sprints.dashboard.libs import jql
 from sprints.dashboard.libs.jira import (
     Account,
-    chunks,
     connect_to_jira,
 )
 
@@ -91,9 +87,9 @@ def cache_worklogs_and_issues(required_worklogs: Set[str], long_term: bool) -> D
 
     if missing_worklogs := required_worklogs - worklogs.keys():
         with connect_to_jira() as conn:
-            retrieved_worklogs: List[Worklog] = conn.worklog_list(list(missing_worklogs))  # type: ignore
+            retrieved_worklogs: List[Dict[str, str]] = conn.worklog_list(list(missing_worklogs))  # type: ignore
             for worklog in retrieved_worklogs:
-                required_issues.add(worklog.issueId)
+                required_issues.add(worklog['issueId'])
 
         # Check if worklogs are missing from cache.
         issues: Dict[str, Dict[str, str]] = _get_cached_dicts_from_keys(
@@ -103,21 +99,14 @@ def cache_worklogs_and_issues(required_worklogs: Set[str], long_term: bool) -> D
 
         if missing_issues := required_issues - issues.keys():
             with connect_to_jira() as conn:
-                try:
-                    retrieved_issues = conn.search_issues(
-                        f'id in ({",".join(missing_issues)})',
-                        fields='project', maxResults=0
-                    )
-                except JIRAError:
-                    # We can notice this for long-term cache, as Jira has limits for the header size.
-                    retrieved_issues = []
-                    for chunk in chunks(list(missing_issues), 12):
-                        retrieved_issues = conn.search_issues(f'id in ({",".join(chunk)})',
-                                                              fields='project', maxResults=0)
+                # The query is split, as Jira has limits for the header size (we can notice this for long-term cache).
+                retrieved_issues: List = []
+                for query in jql.in_chunks('id', [int(issue_id) for issue_id in missing_issues]):
+                    retrieved_issues += conn.search_issues(query, fields='project', maxResults=0)
             new_issues = {issue.id: {'key': issue.key, 'project': issue.fields.project.name}
                           for issue in retrieved_issues}
 
-        new_worklogs = {worklog.id: issues.get(worklog.issueId, new_issues.get(worklog.issueId))
+        new_worklogs = {worklog['id']: issues.get(worklog['issueId'], new_issues.get(worklog['issueId']))
                         for worklog in retrieved_worklogs}
 
         # We retrieve cache second time to avoid race conditions.